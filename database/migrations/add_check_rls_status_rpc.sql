@@ -0,0 +1,26 @@
+-- Migration: Add check_rls_status RPC
+-- Date: 2026-10-16
+-- Purpose: Report RLS state of several public tables in one PostgREST call
+--          (read from the catalog instead of probing each table)
+
+CREATE OR REPLACE FUNCTION check_rls_status(tables TEXT[])
+RETURNS TABLE (table_name TEXT, rls_enabled BOOLEAN, policy_count INT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        c.relname::TEXT,
+        c.relrowsecurity,
+        (
+            SELECT COUNT(*)::INT FROM pg_policies p
+            WHERE p.schemaname = 'public' AND p.tablename = c.relname
+        )
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public'
+      AND c.relkind = 'r'
+      AND c.relname = ANY(tables)
+    ORDER BY c.relname;
+$$;
+
+COMMENT ON FUNCTION check_rls_status(TEXT[]) IS 'RLS enabled flag and policy count for the given public tables (tables that do not exist are omitted)';
@@ -0,0 +1,36 @@
+-- Migration: Add insert_llm_analysis_rows RPC
+-- Date: 2026-10-16
+-- Purpose: Insert a batch of llm_analysis_log rows with one set-based INSERT
+--          (one PostgREST call for any number of rows)
+
+CREATE OR REPLACE FUNCTION insert_llm_analysis_rows(rows JSONB)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    WITH inserted AS (
+        INSERT INTO llm_analysis_log (
+            ticker, action, sentiment_score, confidence, impact, reasoning,
+            signal_generated, signal_approved, created_at
+        )
+        SELECT
+            r.ticker, r.action, r.sentiment_score, r.confidence, r.impact, r.reasoning,
+            COALESCE(r.signal_generated, FALSE),
+            COALESCE(r.signal_approved, FALSE),
+            COALESCE(r.created_at, NOW())
+        FROM jsonb_to_recordset(rows) AS r(
+            ticker VARCHAR(10),
+            action VARCHAR(10),
+            sentiment_score DECIMAL(4,2),
+            confidence DECIMAL(3,2),
+            impact VARCHAR(10),
+            reasoning TEXT,
+            signal_generated BOOLEAN,
+            signal_approved BOOLEAN,
+            created_at TIMESTAMPTZ
+        )
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INT FROM inserted;
+$$;
+
+COMMENT ON FUNCTION insert_llm_analysis_rows(JSONB) IS 'Bulk insert llm_analysis_log rows from a JSON array; returns the inserted row count';
@@ -0,0 +1,34 @@
+-- Migration: Add latest_dashboard RPC
+-- Date: 2026-10-16
+-- Purpose: Return the newest rows of the dashboard tables in one PostgREST call
+--          (one round-trip instead of one per table)
+
+CREATE OR REPLACE FUNCTION latest_dashboard(lim INT DEFAULT 5, trade_lim INT DEFAULT 10)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'trades', (
+            SELECT COALESCE(jsonb_agg(t ORDER BY t.date DESC), '[]'::jsonb)
+            FROM (
+                SELECT date, action, quantity, ticker, entry_price, strategy
+                FROM trades ORDER BY date DESC LIMIT trade_lim
+            ) t
+        ),
+        'daily_performance', (
+            SELECT COALESCE(jsonb_agg(p ORDER BY p.date DESC), '[]'::jsonb)
+            FROM (SELECT * FROM daily_performance ORDER BY date DESC LIMIT lim) p
+        ),
+        'strategy_metrics', (
+            SELECT COALESCE(jsonb_agg(s ORDER BY s.date DESC), '[]'::jsonb)
+            FROM (SELECT * FROM strategy_metrics ORDER BY date DESC LIMIT lim) s
+        ),
+        'signals', (
+            SELECT COALESCE(jsonb_agg(g ORDER BY g.date DESC), '[]'::jsonb)
+            FROM (SELECT * FROM signals ORDER BY date DESC LIMIT lim) g
+        )
+    );
+$$;
+
+COMMENT ON FUNCTION latest_dashboard(INT, INT) IS 'Newest trades, daily_performance, strategy_metrics and signals rows as one JSONB object';
@@ -11,9 +11,11 @@ Design Philosophy:
 5. Type Safe - Clear interfaces with Pydantic models
 """
 
+import asyncio
+from calendar import monthrange
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, AsyncIterator
 
 from alpaca.trading.client import TradingClient
 from alpaca.trading.enums import QueryOrderStatus
@@ -78,8 +80,9 @@ class MarketDataAdapter:
                 print("Market is open!")
         """
         try:
-            # Try to get clock from Alpaca
-            clock_data = self.client.get_clock()
+            # Try to get clock from Alpaca (sync SDK call, run in executor)
+            loop = asyncio.get_running_loop()
+            clock_data = await loop.run_in_executor(None, self.client.get_clock)
 
             # Normalize response to our model
             market_clock = MarketClock(
@@ -173,7 +176,10 @@ class MarketDataAdapter:
 
             # Get calendar from Alpaca using request object
             calendar_request = GetCalendarRequest(start=start_date, end=end_date)
-            calendar_data = self.client.get_calendar(filters=calendar_request)
+            loop = asyncio.get_running_loop()
+            calendar_data = await loop.run_in_executor(
+                None, lambda: self.client.get_calendar(filters=calendar_request)
+            )
 
             # Normalize to our model
             market_days = [
@@ -278,7 +284,10 @@ class MarketDataAdapter:
         try:
             # Get portfolio history from Alpaca using request object
             history_request = GetPortfolioHistoryRequest(period=period, timeframe=timeframe)
-            history_data = self.client.get_portfolio_history(history_filter=history_request)
+            loop = asyncio.get_running_loop()
+            history_data = await loop.run_in_executor(
+                None, lambda: self.client.get_portfolio_history(history_filter=history_request)
+            )
 
             # Normalize to our model
             portfolio_history = PortfolioHistory(
@@ -357,8 +366,11 @@ class MarketDataAdapter:
                 nested=nested,
             )
 
-            # Fetch orders from Alpaca
-            orders_data = self.client.get_orders(filter=order_request)
+            # Fetch orders from Alpaca (sync SDK call, run in executor)
+            loop = asyncio.get_running_loop()
+            orders_data = await loop.run_in_executor(
+                None, lambda: self.client.get_orders(filter=order_request)
+            )
 
             # Normalize to our model
             order_history = []
@@ -405,6 +417,56 @@ class MarketDataAdapter:
             logger.error(f"Failed to get orders history: {e}")
             return []
 
+    async def iter_orders_history(
+        self,
+        status: str = "all",
+        limit: int = 100,
+        page_size: int = 50,
+        nested: bool = True,
+    ) -> AsyncIterator[OrderHistory]:
+        """Stream historical orders page by page, newest first.
+
+        Alpaca pages orders by submission time, so each follow-up request
+        asks for orders submitted up to the oldest one already seen. Only
+        one page is held in memory at a time.
+
+        Args:
+            status: Order status filter ('open', 'closed', 'all')
+            limit: Maximum number of orders to yield in total
+            page_size: Orders fetched per request
+            nested: Include child orders (bracket orders)
+
+        Yields:
+            OrderHistory objects
+
+        Example:
+            async for order in adapter.iter_orders_history(status="closed", limit=500):
+                total_qty += order.quantity
+        """
+        remaining = limit
+        until: datetime | None = None
+        seen_at_boundary: set[str] = set()
+
+        while remaining > 0:
+            # Over-fetch by the boundary orders we will drop as already seen
+            requested = min(page_size, remaining) + len(seen_at_boundary)
+            page = await self.get_orders_history(
+                status=status, limit=requested, until=until, nested=nested
+            )
+
+            fresh = [order for order in page if order.order_id not in seen_at_boundary]
+            for order in fresh[:remaining]:
+                yield order
+            remaining -= len(fresh)
+
+            # Short page (or nothing new) means history is exhausted
+            if len(page) < requested or not fresh:
+                return
+
+            # `until` is inclusive: remember orders on the boundary timestamp
+            until = page[-1].created_at
+            seen_at_boundary = {o.order_id for o in page if o.created_at == until}
+
     async def is_market_open(self) -> bool:
         """Check if market is currently open.
 
@@ -440,7 +502,7 @@ class MarketDataAdapter:
 
         # Get month's calendar
         month_start = check_date.replace(day=1)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        month_end = check_date.replace(day=monthrange(check_date.year, check_date.month)[1])
 
         calendar = await self.get_market_calendar(start_date=month_start, end_date=month_end)
 
@@ -6,7 +6,7 @@ import pandas as pd
 import yfinance as yf
 
 from src.models.portfolio import Portfolio, Position
-from src.strategies.momentum_trading import scan_for_signals, check_exit_conditions
+from src.strategies.momentum_trading import scan_for_signals, check_exit_conditions_batch
 from src.core.risk_manager import filter_signals_by_risk, validate_signal_risk, calculate_position_size
 from src.utils.logger import logger
 
@@ -85,10 +85,7 @@ class BacktestEngine:
                 quote = await mock_client.get_latest_quote(pos.symbol)
                 price = Decimal(str(quote["price"]))
                 if price > 0:
-                    pos.current_price = price
-                    pos.market_value = price * pos.quantity
-                    pos.unrealized_pnl = (price - pos.avg_entry_price) * pos.quantity
-                    pos.unrealized_pnl_pct = (price - pos.avg_entry_price) / pos.avg_entry_price
+                    pos.current_price = price  # market_value/unrealized_pnl follow
                     total_value += pos.market_value
             
             self.portfolio.portfolio_value = total_value
@@ -98,8 +95,8 @@ class BacktestEngine:
 
             # 2. Check Exits
             active_positions = []
-            for pos in self.positions:
-                should_exit, reason = await check_exit_conditions(pos, mock_client)
+            exit_checks = await check_exit_conditions_batch(self.positions, mock_client)
+            for pos, (should_exit, reason) in zip(self.positions, exit_checks):
                 if should_exit:
                     # Execute Sell
                     proceeds = pos.quantity * pos.current_price
@@ -189,9 +186,6 @@ class BacktestEngine:
                                 quantity=shares,
                                 avg_entry_price=signal.entry_price,
                                 current_price=signal.entry_price,
-                                market_value=cost,
-                                unrealized_pnl=Decimal(0),
-                                unrealized_pnl_pct=Decimal(0)
                             )
                             self.positions.append(new_pos)
                             
@@ -13,9 +13,17 @@ from decimal import Decimal
 import aiohttp
 import pandas as pd
 
+from ..mcp_clients.data_client import TTLCache
 from ..utils.config import config
 from ..utils.logger import logger
 
+# Daily bars are reused for this long, e.g. across exit checks in one tick
+BARS_CACHE_TTL = 60  # seconds
+BARS_CACHE_MAX_ENTRIES = 256
+
+# Shared by all client instances (callers create a client per use)
+_bars_cache = TTLCache(maxsize=BARS_CACHE_MAX_ENTRIES, ttl=BARS_CACHE_TTL)
+
 
 class AlphaVantageClient:
     """Alpha Vantage API client for market data."""
@@ -29,6 +37,9 @@ class AlphaVantageClient:
     async def get_bars(self, symbol: str, days: int = 30) -> pd.DataFrame:
         """Get historical bars (OHLCV) for a symbol.
 
+        Non-empty results are cached for BARS_CACHE_TTL seconds; a cache hit
+        skips the API call and its rate-limit delay.
+
         Args:
             symbol: Stock symbol (e.g., 'AAPL')
             days: Number of days of history (default: 30)
@@ -39,6 +50,12 @@ class AlphaVantageClient:
         Raises:
             Exception: If API call fails
         """
+        cache_key = f"{symbol}_{days}"
+        cached = _bars_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Cache hit for {symbol} bars ({days}d)")
+            return cached.copy()
+
         logger.debug(f"Fetching {days} days of bars for {symbol} from Alpha Vantage")
 
         # Rate limit
@@ -96,12 +113,17 @@ class AlphaVantageClient:
 
             logger.debug(f"Retrieved {len(df)} bars for {symbol}")
 
-            return df
+            _bars_cache[cache_key] = df
+            return df.copy()
 
         except Exception as e:
             logger.error(f"Failed to get bars for {symbol}: {e}")
             raise
 
+    def clear_cache(self) -> None:
+        """Clear cached bars (shared by all clients) to force fresh fetches."""
+        _bars_cache.clear()
+
     async def get_rsi(self, symbol: str, period: int = 14) -> pd.DataFrame:
         """Get RSI indicator directly from Alpha Vantage.
 
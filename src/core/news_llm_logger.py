@@ -32,27 +32,30 @@ class NewsLLMLogger:
         try:
             client = await SupabaseClient.get_instance()
 
-            # Convert to dict format
-            records = []
-            for article in articles:
-                records.append({
+            # One fetch timestamp for the whole batch
+            fetched_at = datetime.now(timezone.utc).isoformat()
+
+            # Convert to dict format, keyed by URL: Postgres rejects a single
+            # upsert statement that hits the same conflict key twice
+            records = {
+                article.url: {
                     "ticker": article.ticker,
                     "title": article.title,
                     "summary": article.summary,
                     "source": article.source,
                     "url": article.url,
                     "published_at": article.published_at.isoformat(),
-                    "fetched_at": datetime.now(timezone.utc).isoformat(),
-                })
+                    "fetched_at": fetched_at,
+                }
+                for article in articles
+            }
 
-            # Bulk insert (upsert on conflict)
-            response = await client.table("news_articles").upsert(
-                records, on_conflict="url"
+            # Bulk insert in a single request (upsert on conflict)
+            await client.table("news_articles").upsert(
+                list(records.values()), on_conflict="url"
             ).execute()
 
-            logger.debug(
-                f"Logged {len(articles)} news articles for {articles[0].ticker if articles else 'unknown'}"
-            )
+            logger.debug(f"Logged {len(records)} news articles for {articles[0].ticker}")
 
         except Exception as e:
             # Don't fail trading if logging fails
@@ -6,6 +6,9 @@ No machine learning - just clear if/then rules for strategy improvement.
 
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import Any, NamedTuple
+
+import numpy as np
 
 from ..database.supabase_client import SupabaseClient
 from ..models.performance import DailyPerformance, ParameterChange, StrategyMetrics, WeeklyReport
@@ -13,6 +16,43 @@ from ..strategies.momentum_trading import get_current_parameters, update_strateg
 from ..utils.logger import logger
 
 
+class PnLSummary(NamedTuple):
+    """Win/loss breakdown of a set of trades."""
+
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    total_pnl: float
+    avg_win: float
+    avg_loss: float
+
+
+def summarize_pnl(trades: list[dict[str, Any]]) -> PnLSummary:
+    """Summarize trade P&L with vectorized NumPy reductions.
+
+    Trades with a missing (None) pnl count toward the total but are neither
+    wins nor losses.
+
+    Args:
+        trades: Trade rows with an optional "pnl" value
+
+    Returns:
+        PnLSummary with counts, total and average win/loss
+    """
+    pnl = np.fromiter(((t.get("pnl") or 0) for t in trades), dtype=np.float64, count=len(trades))
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+
+    return PnLSummary(
+        total_trades=pnl.size,
+        winning_trades=wins.size,
+        losing_trades=losses.size,
+        total_pnl=float(pnl.sum()),
+        avg_win=float(wins.mean()) if wins.size else 0.0,
+        avg_loss=float(losses.mean()) if losses.size else 0.0,
+    )
+
+
 async def analyze_daily_performance() -> None:
     """Analyze today's trading performance and store metrics.
 
@@ -36,20 +76,15 @@ async def analyze_daily_performance() -> None:
         logger.info("No trades today - skipping analysis")
         return
 
-    # Calculate daily metrics (filter out None values)
-    total_trades = len(trades)
-    winning_trades = [t for t in trades if (t.get("pnl") or 0) > 0]
-    losing_trades = [t for t in trades if (t.get("pnl") or 0) < 0]
+    # Calculate daily metrics (None P&L counts as 0)
+    summary = summarize_pnl(trades)
+    total_trades = summary.total_trades
 
-    win_rate = Decimal(len(winning_trades) / total_trades if total_trades > 0 else 0)
+    win_rate = Decimal(summary.winning_trades / total_trades if total_trades > 0 else 0)
 
-    total_pnl = Decimal(sum(t.get("pnl") or 0 for t in trades))
-    avg_win = Decimal(
-        sum(t.get("pnl") or 0 for t in winning_trades) / len(winning_trades) if winning_trades else 0
-    )
-    avg_loss = Decimal(
-        sum(t.get("pnl") or 0 for t in losing_trades) / len(losing_trades) if losing_trades else 0
-    )
+    total_pnl = Decimal(summary.total_pnl)
+    avg_win = Decimal(summary.avg_win)
+    avg_loss = Decimal(summary.avg_loss)
 
     profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else Decimal(0)
 
@@ -65,36 +100,26 @@ async def analyze_daily_performance() -> None:
         if history:
             # Calculate Sharpe Ratio (assuming risk-free rate = 0 for simplicity)
             # We need daily returns, but we only have PnL. We'll use PnL as a proxy for return magnitude.
-            pnls = [float(d["daily_pnl"]) for d in history]
-            pnls.append(float(total_pnl)) # Add today
-            
-            import numpy as np
-            if len(pnls) > 5:
-                mean_pnl = np.mean(pnls)
-                std_pnl = np.std(pnls)
+            # History is newest first; put it oldest to newest and add today
+            pnls = np.fromiter(
+                (float(d["daily_pnl"]) for d in reversed(history)), np.float64, len(history)
+            )
+            pnls = np.append(pnls, float(total_pnl))
+
+            if pnls.size > 5:
+                mean_pnl = pnls.mean()
+                std_pnl = pnls.std()
                 if std_pnl != 0:
-                    sharpe_ratio = Decimal(str(mean_pnl / std_pnl * np.sqrt(252))) # Annualized
-            
-            # Calculate Max Drawdown
-            # We need cumulative PnL to simulate equity curve
-            cumulative = 0
-            peak = -float('inf')
-            max_dd = 0
-            
-            # Reconstruct equity curve from history (reverse order: oldest to newest)
-            for day in reversed(history):
-                cumulative += float(day["daily_pnl"])
-                peak = max(peak, cumulative)
-                dd = (peak - cumulative) / peak if peak > 0 else 0
-                max_dd = max(max_dd, dd)
-            
-            # Add today
-            cumulative += float(total_pnl)
-            peak = max(peak, cumulative)
-            dd = (peak - cumulative) / peak if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-            
-            max_drawdown = Decimal(str(max_dd))
+                    annualized = float(mean_pnl / std_pnl * np.sqrt(252))
+                    sharpe_ratio = Decimal(str(annualized))
+
+            # Calculate Max Drawdown on the cumulative-PnL equity curve
+            # (drawdown only counts once the running peak is positive)
+            equity = np.cumsum(pnls)
+            peak = np.maximum.accumulate(equity)
+            drawdowns = np.divide(peak - equity, peak, out=np.zeros_like(equity), where=peak > 0)
+
+            max_drawdown = Decimal(str(float(drawdowns.max())))
 
     except Exception as e:
         logger.warning(f"Failed to calculate advanced metrics: {e}")
@@ -110,8 +135,8 @@ async def analyze_daily_performance() -> None:
     daily_perf = DailyPerformance(
         date=today,
         total_trades=total_trades,
-        winning_trades=len(winning_trades),
-        losing_trades=len(losing_trades),
+        winning_trades=summary.winning_trades,
+        losing_trades=summary.losing_trades,
         win_rate=win_rate,
         daily_pnl=total_pnl,
         profit_factor=profit_factor,
@@ -127,10 +152,10 @@ async def analyze_daily_performance() -> None:
     for strategy in ["defensive", "momentum"]:
         strategy_trades = [t for t in trades if t["strategy"] == strategy]
         if strategy_trades:
-            strategy_pnl = Decimal(sum(t.get("pnl") or 0 for t in strategy_trades))
-            strategy_winners = [t for t in strategy_trades if (t.get("pnl") or 0) > 0]
+            strategy_summary = summarize_pnl(strategy_trades)
+            strategy_pnl = Decimal(strategy_summary.total_pnl)
             strategy_win_rate = Decimal(
-                len(strategy_winners) / len(strategy_trades) if strategy_trades else 0
+                strategy_summary.winning_trades / strategy_summary.total_trades
             )
 
             metrics = StrategyMetrics(
@@ -185,9 +210,9 @@ async def adjust_parameters_if_needed() -> None:
         logger.warning(f"Low win rate: {avg_win_rate:.2%}. Tightening entry criteria.")
 
         new_params = {
-            "rsi_min": 55,  # More conservative
-            "rsi_max": 65,
-            "min_volume_ratio": 1.2,
+            "rsi_lower": 55,  # More conservative
+            "rsi_upper": 65,
+            "volume_ratio": 1.2,
         }
 
         update_strategy_parameters(new_params)
@@ -208,8 +233,8 @@ async def adjust_parameters_if_needed() -> None:
         logger.info(f"High win rate: {avg_win_rate:.2%}. Loosening entry criteria.")
 
         new_params = {
-            "rsi_min": 45,
-            "rsi_max": 75,
+            "rsi_lower": 45,
+            "rsi_upper": 75,
         }
 
         update_strategy_parameters(new_params)
@@ -249,10 +274,10 @@ async def generate_weekly_report() -> None:
         return
 
     # Calculate metrics (filter out None values for P&L)
-    total_pnl = Decimal(sum(t.get("pnl") or 0 for t in weekly_trades))
-    total_trades = len(weekly_trades)
-    winning_trades = [t for t in weekly_trades if (t.get("pnl") or 0) > 0]
-    win_rate = Decimal(len(winning_trades) / total_trades if total_trades > 0 else 0)
+    summary = summarize_pnl(weekly_trades)
+    total_pnl = Decimal(summary.total_pnl)
+    total_trades = summary.total_trades
+    win_rate = Decimal(summary.winning_trades / total_trades if total_trades > 0 else 0)
 
     # Best and worst performers (only include trades with P&L)
     trades_with_pnl = [t for t in weekly_trades if t.get("pnl") is not None]
@@ -233,10 +233,11 @@ def calculate_portfolio_risk_metrics(
         - largest_position_pct: Largest position as % of portfolio
         - num_positions: Number of open positions
     """
-    total_exposure = sum(p.market_value for p in positions)
+    market_values = [p.market_value for p in positions]
+    total_exposure = sum(market_values, Decimal("0"))
     exposure_pct = total_exposure / portfolio_value if portfolio_value > 0 else Decimal("0")
 
-    largest_position = max((p.market_value for p in positions), default=Decimal("0"))
+    largest_position = max(market_values, default=Decimal("0"))
     largest_position_pct = (
         largest_position / portfolio_value if portfolio_value > 0 else Decimal("0")
     )
@@ -65,21 +65,10 @@ class SupabaseClient:
         Raises:
             Exception: If database insert fails
         """
-        from decimal import Decimal
-
         client = await cls.get_instance()
 
-        # Convert Pydantic model to dict for database insertion
-        trade_data = trade.model_dump(exclude_none=True, exclude={"id"})
-
-        # Convert datetime to ISO string for Supabase
-        if "date" in trade_data:
-            trade_data["date"] = trade_data["date"].isoformat()
-
-        # Convert Decimal to string for JSON serialization
-        for key, value in trade_data.items():
-            if isinstance(value, Decimal):
-                trade_data[key] = str(value)
+        # JSON-mode dump: Decimal -> string, datetime -> ISO string for Supabase
+        trade_data = trade.model_dump(mode="json", exclude_none=True, exclude={"id"})
 
         try:
             response = await client.table("trades").insert(trade_data).execute()
@@ -144,18 +133,10 @@ class SupabaseClient:
         Raises:
             Exception: If database insert fails
         """
-        from decimal import Decimal
-
         client = await cls.get_instance()
 
-        perf_data = performance.model_dump()
-        # Convert date to string
-        perf_data["date"] = perf_data["date"].isoformat()
-
-        # Convert Decimal to string for JSON serialization
-        for key, value in perf_data.items():
-            if isinstance(value, Decimal):
-                perf_data[key] = str(value)
+        # JSON-mode dump: Decimal -> string, date -> ISO string
+        perf_data = performance.model_dump(mode="json")
 
         try:
             response = await client.table("daily_performance").insert(perf_data).execute()
@@ -178,17 +159,10 @@ class SupabaseClient:
         Raises:
             Exception: If database insert fails
         """
-        from decimal import Decimal
-
         client = await cls.get_instance()
 
-        metrics_data = metrics.model_dump()
-        metrics_data["date"] = metrics_data["date"].isoformat()
-
-        # Convert Decimal to string for JSON serialization
-        for key, value in metrics_data.items():
-            if isinstance(value, Decimal):
-                metrics_data[key] = str(value)
+        # JSON-mode dump: Decimal -> string, date -> ISO string
+        metrics_data = metrics.model_dump(mode="json")
 
         try:
             response = await client.table("strategy_metrics").insert(metrics_data).execute()
@@ -213,8 +187,7 @@ class SupabaseClient:
         """
         client = await cls.get_instance()
 
-        change_data = change.model_dump()
-        change_data["date"] = change_data["date"].isoformat()
+        change_data = change.model_dump(mode="json")
 
         try:
             response = await client.table("parameter_changes").insert(change_data).execute()
@@ -237,17 +210,10 @@ class SupabaseClient:
         Raises:
             Exception: If database insert fails
         """
-        from decimal import Decimal
-
         client = await cls.get_instance()
 
-        report_data = report.model_dump()
-        report_data["week_ending"] = report_data["week_ending"].isoformat()
-
-        # Convert Decimal to string for JSON serialization
-        for key, value in report_data.items():
-            if isinstance(value, Decimal):
-                report_data[key] = str(value)
+        # JSON-mode dump: Decimal -> string, date -> ISO string, tuples -> lists
+        report_data = report.model_dump(mode="json")
 
         try:
             response = await client.table("weekly_reports").insert(report_data).execute()
@@ -441,21 +407,10 @@ class SupabaseClient:
         Raises:
             Exception: If database update fails
         """
-        from decimal import Decimal
-
         client = await cls.get_instance()
 
-        # Convert label to dict
-        label_dict = label.model_dump(exclude_none=True)
-
-        # Convert datetime to ISO string
-        if "label_timestamp" in label_dict:
-            label_dict["label_timestamp"] = label_dict["label_timestamp"].isoformat()
-
-        # Convert Decimal to string
-        for key, value in label_dict.items():
-            if isinstance(value, Decimal):
-                label_dict[key] = str(value)
+        # JSON-mode dump: Decimal -> string, datetime -> ISO string
+        label_dict = label.model_dump(mode="json", exclude_none=True)
 
         # Mark as labeled
         label_dict["is_labeled"] = True
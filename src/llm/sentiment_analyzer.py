@@ -1,5 +1,6 @@
 """Sentiment Analyzer using LLM to analyze news for trading signals."""
 
+import asyncio
 import json
 from datetime import datetime, timedelta
 
@@ -58,12 +59,17 @@ class SentimentAnalyzer:
             # Get news from last 24 hours
             from_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
             
-            news = self.news_api.get_everything(
-                q=ticker,
-                from_param=from_date,
-                language="en",
-                sort_by="relevancy",
-                page_size=10,
+            # Synchronous NewsAPI call, run in executor so concurrent analyses overlap
+            loop = asyncio.get_running_loop()
+            news = await loop.run_in_executor(
+                None,
+                lambda: self.news_api.get_everything(
+                    q=ticker,
+                    from_param=from_date,
+                    language="en",
+                    sort_by="relevancy",
+                    page_size=10,
+                ),
             )
 
             if not news["articles"]:
@@ -123,3 +129,19 @@ class SentimentAnalyzer:
                 "summary": f"Error: {str(e)}",
                 "article_count": 0,
             }
+
+
+# Global singleton
+_sentiment_analyzer = None
+
+
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    """Get or create the SentimentAnalyzer singleton.
+
+    Returns:
+        SentimentAnalyzer instance
+    """
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        _sentiment_analyzer = SentimentAnalyzer()
+    return _sentiment_analyzer
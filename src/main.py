@@ -23,7 +23,11 @@ from .models.trade import Trade
 from .risk.position_sizer import initialize_position_sizer
 from .strategies.defensive_core import calculate_rebalancing_orders, should_rebalance
 from .strategies.defensive_core import calculate_rebalancing_orders, should_rebalance
-from .strategies.momentum_trading import check_exit_conditions, scan_for_signals
+from .strategies.momentum_trading import (
+    check_exit_conditions,
+    check_exit_conditions_batch,
+    scan_for_signals,
+)
 from .strategies.news_strategy import NewsStrategy
 from .strategies.news_driven import NewsSentimentStrategy
 from .utils.config import config
@@ -240,14 +244,23 @@ async def daily_trading_loop(allow_premarket: bool = False) -> dict[str, any]:
         # 6. Check exit conditions for momentum positions
         defensive_symbols = {"VTI", "VGK", "GLD"}
 
-        for position in positions:
-            # Skip defensive core positions
-            if position.symbol in defensive_symbols:
-                continue
+        # Skip defensive core positions
+        momentum_positions = [p for p in positions if p.symbol not in defensive_symbols]
+        try:
+            exit_checks = await check_exit_conditions_batch(momentum_positions, alpaca)
+        except Exception as e:
+            # Fall back to one guarded check per position
+            logger.error(f"Batched exit check failed, checking positions one by one: {e}")
+            exit_checks = []
+            for position in momentum_positions:
+                try:
+                    exit_checks.append(await check_exit_conditions(position, alpaca))
+                except Exception as check_error:
+                    logger.error(f"Failed to check exit for {position.symbol}: {check_error}")
+                    exit_checks.append((False, None))
 
+        for position, (should_exit, reason) in zip(momentum_positions, exit_checks):
             try:
-                should_exit, reason = await check_exit_conditions(position, alpaca)
-
                 if should_exit:
                     logger.info(f"Exiting {position.symbol}: {reason}")
 
@@ -277,7 +290,7 @@ async def daily_trading_loop(allow_premarket: bool = False) -> dict[str, any]:
                     )
 
             except Exception as e:
-                logger.error(f"Failed to check exit for {position.symbol}: {e}")
+                logger.error(f"Failed to close position {position.symbol}: {e}")
                 continue
 
         # 7. Daily Performance Analysis
@@ -4,10 +4,11 @@ Uses alpaca-py SDK for all trading operations.
 Implements rate limiting and error handling for robust trading.
 """
 
+import asyncio
 from decimal import Decimal
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
-import pandas as pd
+import numpy as np
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import (
     ClosePositionRequest,
@@ -18,12 +19,79 @@ from alpaca.trading.enums import OrderSide, TimeInForce, OrderClass
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
+from requests.adapters import HTTPAdapter
 
 from ..models.portfolio import Portfolio, Position
 from ..utils.config import config
 from ..utils.logger import logger
 from .data_client import ALPACA_LIMITER
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Max concurrent bar requests in get_bars_batch
+BARS_BATCH_CONCURRENCY = 16
+
+
+class Bars(NamedTuple):
+    """OHLCV bars for one symbol as parallel NumPy arrays.
+
+    Attributes:
+        timestamp: Bar start times (UTC, datetime64[ns])
+        open: Open prices
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Traded volume
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_bars(cls, rows: list[Any]) -> "Bars":
+        """Build arrays from alpaca-py Bar objects.
+
+        Args:
+            rows: Bars as returned in a BarSet for one symbol
+
+        Returns:
+            Bars with one element per row (empty arrays if no rows)
+        """
+        n = len(rows)
+        return cls(
+            # Alpaca timestamps are UTC; drop tzinfo so NumPy can store them
+            timestamp=np.array(
+                [b.timestamp.replace(tzinfo=None) for b in rows], dtype="datetime64[ns]"
+            ),
+            open=np.fromiter((b.open for b in rows), np.float64, n),
+            high=np.fromiter((b.high for b in rows), np.float64, n),
+            low=np.fromiter((b.low for b in rows), np.float64, n),
+            close=np.fromiter((b.close for b in rows), np.float64, n),
+            volume=np.fromiter((b.volume for b in rows), np.float64, n),
+        )
+
+    @property
+    def empty(self) -> bool:
+        """True if there are no bars."""
+        return self.close.size == 0
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """Convert to a DataFrame for indicator code.
+
+        Returns:
+            DataFrame with columns: timestamp (UTC), open, high, low, close, volume
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self._asdict())
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        return df
+
 
 class AlpacaMCPClient:
     """Wrapper for Alpaca SDK (Paper Trading).
@@ -56,6 +124,14 @@ class AlpacaMCPClient:
             secret_key=config.ALPACA_SECRET_KEY,
         )
 
+        # The SDK clients already keep one requests.Session (keep-alive) each;
+        # size the data client's pool so concurrent get_bars_batch fetches
+        # reuse their connections instead of discarding them past 10
+        session = getattr(self.data_client, "_session", None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BARS_BATCH_CONCURRENCY)
+            session.mount("https://", adapter)
+
         logger.info("Alpaca SDK clients initialized (Paper Trading)")
 
     async def get_account(self) -> Portfolio:
@@ -118,9 +194,6 @@ class AlpacaMCPClient:
                     quantity=Decimal(str(pos.qty)),
                     avg_entry_price=Decimal(str(pos.avg_entry_price)),
                     current_price=Decimal(str(pos.current_price)),
-                    market_value=Decimal(str(pos.market_value)),
-                    unrealized_pnl=Decimal(str(pos.unrealized_pl)),
-                    unrealized_pnl_pct=Decimal(str(pos.unrealized_plpc)),
                 )
                 positions.append(position)
 
@@ -232,7 +305,7 @@ class AlpacaMCPClient:
             logger.error(f"Failed to close position for {symbol}: {e}")
             raise
 
-    async def get_bars(self, symbol: str, days: int = 30, timeframe: str = "1Day") -> pd.DataFrame:
+    async def get_bars(self, symbol: str, days: int = 30, timeframe: str = "1Day") -> Bars:
         """Get historical OHLCV bars for a symbol.
 
         Args:
@@ -241,7 +314,8 @@ class AlpacaMCPClient:
             timeframe: Bar timeframe (1Day, 1Hour, etc.)
 
         Returns:
-            DataFrame with columns: timestamp, open, high, low, close, volume
+            Bars arrays (empty if the symbol has no data); use
+            Bars.to_pandas() where a DataFrame is needed
 
         Raises:
             Exception: If bars fetch fails
@@ -266,23 +340,43 @@ class AlpacaMCPClient:
                 end=end,
             )
 
-            # Fetch bars from Alpaca
-            bars = self.data_client.get_stock_bars(request_params)
+            # Fetch bars from Alpaca (sync SDK call, run in executor so
+            # concurrent get_bars calls overlap)
+            loop = asyncio.get_running_loop()
+            bars = await loop.run_in_executor(None, self.data_client.get_stock_bars, request_params)
 
-            # Convert to DataFrame
-            if symbol in bars:
-                df = bars[symbol].df
-                # Reset index to make timestamp a column
-                df = df.reset_index()
-                return df
-            else:
-                # Return empty DataFrame with correct schema
-                return pd.DataFrame(columns=["timestamp", "open", "high", "low", "close", "volume"])
+            return Bars.from_bars(bars[symbol] if symbol in bars else [])
 
         except Exception as e:
             logger.error(f"Failed to get bars for {symbol}: {e}")
             raise
 
+    async def get_bars_batch(
+        self, symbols: list[str], days: int = 30, timeframe: str = "1Day"
+    ) -> dict[str, Bars | Exception]:
+        """Get historical OHLCV bars for several symbols concurrently.
+
+        Each fetch still takes an ALPACA_LIMITER token (inside get_bars); at
+        most BARS_BATCH_CONCURRENCY requests are in flight at once.
+
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days of history
+            timeframe: Bar timeframe (1Day, 1Hour, etc.)
+
+        Returns:
+            Dictionary mapping each symbol to its Bars, or to the
+            exception raised while fetching it
+        """
+        semaphore = asyncio.Semaphore(BARS_BATCH_CONCURRENCY)
+
+        async def fetch(symbol: str) -> Bars:
+            async with semaphore:
+                return await self.get_bars(symbol, days=days, timeframe=timeframe)
+
+        results = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+        return dict(zip(symbols, results))
+
     async def get_latest_quote(self, symbol: str) -> dict[str, Any]:
         """Get latest quote for a symbol.
 
@@ -5,7 +5,10 @@ Priority: Alpaca MCP (most generous) > TwelveData > Alpha Vantage
 """
 
 import asyncio
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
 from typing import Any
 
 from ..utils.logger import logger
@@ -14,7 +17,9 @@ from ..utils.logger import logger
 class RateLimiter:
     """Generic rate limiter for API calls.
 
-    Implements a sliding window rate limiter to prevent exceeding API limits.
+    Implements a sliding window: at most ``max_calls`` calls are admitted in
+    any ``period_seconds`` window. The admission times of the last
+    ``max_calls`` calls are kept in a bounded deque, so admission is O(1).
 
     Example:
         limiter = RateLimiter(max_calls=200, period_seconds=60)
@@ -22,44 +27,52 @@ class RateLimiter:
         result = await make_api_call()
     """
 
-    def __init__(self, max_calls: int, period_seconds: int):
+    def __init__(
+        self,
+        max_calls: int,
+        period_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
         """Initialize rate limiter.
 
         Args:
             max_calls: Maximum number of calls allowed in the period
             period_seconds: Time period in seconds
+            timer: Clock returning seconds (injectable for tests)
+
+        Raises:
+            ValueError: If max_calls or period_seconds is not positive
         """
+        if max_calls <= 0 or period_seconds <= 0:
+            raise ValueError("max_calls and period_seconds must be positive")
+
         self.max_calls = max_calls
-        self.period = timedelta(seconds=period_seconds)
-        self.calls: list[datetime] = []
+        self.period = float(period_seconds)
+        self.timer = timer
+        # Admission times of the most recent max_calls calls (oldest first)
+        self.calls: deque[float] = deque(maxlen=max_calls)
 
     async def acquire(self) -> None:
         """Wait if necessary to respect rate limit.
 
-        Blocks the caller until it's safe to make another API call.
+        Blocks the caller until it's safe to make another API call. The
+        admission slot is reserved before sleeping (it may lie in the future),
+        so concurrent callers queue up behind each other without a lock.
         """
-        now = datetime.now()
-
-        # Remove calls outside the time window
-        self.calls = [t for t in self.calls if now - t < self.period]
-
-        if len(self.calls) >= self.max_calls:
-            # Calculate how long to wait
-            oldest_call = self.calls[0]
-            sleep_time = (oldest_call + self.period - now).total_seconds()
-
-            if sleep_time > 0:
-                logger.debug(
-                    f"Rate limit reached, waiting {sleep_time:.2f}s "
-                    f"({len(self.calls)}/{self.max_calls} calls)"
-                )
-                await asyncio.sleep(sleep_time)
-
-            # Remove oldest call after waiting
-            self.calls = self.calls[1:]
-
-        # Record this call
-        self.calls.append(datetime.now())
+        now = self.timer()
+        slot = now
+        if len(self.calls) == self.max_calls:
+            # The call max_calls back must have left the window
+            slot = max(now, self.calls[0] + self.period)
+        self.calls.append(slot)
+
+        sleep_time = slot - now
+        if sleep_time > 0:
+            logger.debug(
+                f"Rate limit reached, waiting {sleep_time:.2f}s "
+                f"({self.max_calls} calls per {self.period:g}s)"
+            )
+            await asyncio.sleep(sleep_time)
 
 
 # Rate limiters for each service
@@ -69,6 +82,132 @@ TWELVEDATA_LIMITER = RateLimiter(max_calls=8, period_seconds=60)  # 8/min (free
 ALPHAVANTAGE_LIMITER = RateLimiter(max_calls=5, period_seconds=60)  # 5/min (free tier)
 
 
+# Bar cache: entries expire after CACHE_TIMEOUT seconds (unless stored with
+# their own TTL) and the least recently used entry is evicted past
+# CACHE_MAX_ENTRIES, so long-running processes don't grow without bound
+CACHE_TIMEOUT = 300  # 5 minutes
+CACHE_MAX_ENTRIES = 1024
+
+
+class TTLCache:
+    """Bounded key-value cache with per-entry expiry.
+
+    Entries expire ``ttl`` seconds after they are stored (measured on the
+    monotonic clock by default); expired entries behave as missing on reads
+    but stay stored (see ``peek``) until replaced, purged by ``expire``, or
+    evicted. Past ``maxsize`` entries the least recently used one is evicted.
+    Access is guarded by a lock so executor threads can share it.
+
+    Example:
+        cache = TTLCache(maxsize=1024, ttl=300)
+        cache["AAPL_bars_30d"] = bars
+        bars = cache.get("AAPL_bars_30d")  # None once expired
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default entry lifetime in seconds
+            timer: Clock returning seconds (injectable for tests)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value, optionally with its own lifetime.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Lifetime in seconds (defaults to the cache's ttl)
+        """
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            value, expires_at = self._data[key]
+            if self.timer() >= expires_at:
+                # Not dropped: stale-while-revalidate readers may still peek it
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def peek(self, key: str) -> tuple[Any, bool] | None:
+        """Return a stored value and whether it is still fresh.
+
+        Unlike ``get``, expired entries are returned, so callers can serve
+        stale data while a refresh is in flight.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, is_fresh) tuple, or None if the key is not stored
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            return value, self.timer() < expires_at
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(key)  # type: ignore[call-overload]
+            return entry is not None and self.timer() < entry[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> list[str]:
+        """Return the keys of all stored (not yet purged) entries."""
+        with self._lock:
+            return list(self._data)
+
+    def values(self) -> list[Any]:
+        """Return the values of all stored (not yet purged) entries."""
+        with self._lock:
+            return [value for value, _ in self._data.values()]
+
+    def expire(self) -> None:
+        """Drop every expired entry."""
+        now = self.timer()
+        with self._lock:
+            for key in [k for k, (_, expires_at) in self._data.items() if now >= expires_at]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
 class DataClient:
     """Handles market data fetching with automatic rate limiting.
 
@@ -79,8 +218,52 @@ class DataClient:
     """
 
     def __init__(self) -> None:
-        """Initialize data client with empty cache."""
-        self._cache: dict[str, dict[str, Any]] = {}
+        """Initialize data client with its own bar cache."""
+        self._cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TIMEOUT)
+        # In-flight Alpaca bar fetches by cache key
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Background refreshes of stale entries by cache key
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get_bars_cached(self, symbol: str, days: int = 30) -> list[dict[str, Any]]:
+        """Get daily bars, serving stale cache entries while refreshing them.
+
+        Fresh entries are returned directly. An expired entry is returned
+        immediately and a single background refresh is scheduled for its key;
+        only a missing entry makes the caller wait for Alpaca.
+
+        Args:
+            symbol: Stock ticker symbol
+            days: Number of days of history
+
+        Returns:
+            List of bar dictionaries with OHLCV data
+        """
+        cache_key = f"alpaca_{symbol}_{days}_1D"
+        entry = self._cache.peek(cache_key)
+        if entry is None:
+            return await self.get_bars_alpaca(symbol, days)
+
+        bars, is_fresh = entry
+        if not is_fresh and cache_key not in self._refreshing:
+            logger.debug(f"Serving stale bars for {symbol}, refreshing in background")
+            task = asyncio.create_task(self._refresh_bars(symbol, days))
+            self._refreshing[cache_key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(cache_key, None))
+
+        return bars
+
+    async def _refresh_bars(self, symbol: str, days: int) -> None:
+        """Re-fetch bars into the cache, logging (not raising) failures.
+
+        Fetches without reading the cache, so the stale entry stays in place
+        (and keeps being served) until the new bars replace it.
+        """
+        cache_key = f"alpaca_{symbol}_{days}_1D"
+        try:
+            await self._fetch_bars_single_flight(symbol, days, "1D", cache_key)
+        except Exception as e:
+            logger.warning(f"Background refresh of {symbol} bars failed: {e}")
 
     async def get_bars_alpaca(
         self, symbol: str, days: int = 30, timeframe: str = "1D"
@@ -102,12 +285,32 @@ class DataClient:
         """
         # Check cache first
         cache_key = f"alpaca_{symbol}_{days}_{timeframe}"
-        if cache_key in self._cache:
-            cache_age = (datetime.now() - self._cache[cache_key]["timestamp"]).seconds
-            if cache_age < 300:  # Cache for 5 minutes
-                logger.debug(f"Using cached data for {symbol}")
-                return self._cache[cache_key]["data"]
+        cached = self._cache.get(cache_key)  # Cached for CACHE_TIMEOUT (5 minutes)
+        if cached is not None:
+            logger.debug(f"Using cached data for {symbol}")
+            return cached
 
+        return await self._fetch_bars_single_flight(symbol, days, timeframe, cache_key)
+
+    async def _fetch_bars_single_flight(
+        self, symbol: str, days: int, timeframe: str, cache_key: str
+    ) -> list[dict[str, Any]]:
+        """Fetch bars, sharing one in-flight request per cache key."""
+        fetch = self._inflight.get(cache_key)
+        if fetch is None:
+            fetch = asyncio.create_task(
+                self._fetch_bars_alpaca(symbol, days, timeframe, cache_key)
+            )
+            self._inflight[cache_key] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shielded so one cancelled waiter doesn't cancel the fetch for the rest
+        return await asyncio.shield(fetch)
+
+    async def _fetch_bars_alpaca(
+        self, symbol: str, days: int, timeframe: str, cache_key: str
+    ) -> list[dict[str, Any]]:
+        """Fetch bars from Alpaca MCP and cache them (see get_bars_alpaca)."""
         # Apply rate limiting
         await ALPACA_LIMITER.acquire()
 
@@ -120,8 +323,8 @@ class DataClient:
             bars = []
             # bars = await alpaca_mcp.get_bars(symbol=symbol, days=days, timeframe=timeframe)
 
-            # Cache the result
-            self._cache[cache_key] = {"data": bars, "timestamp": datetime.now()}
+            # Cache the result (replaces any stale entry)
+            self._cache.set(cache_key, bars)
 
             return bars
 
@@ -147,11 +350,10 @@ class DataClient:
         """
         # Check cache first (cache longer for strict rate limits)
         cache_key = f"twelvedata_{symbol}_{days}"
-        if cache_key in self._cache:
-            cache_age = (datetime.now() - self._cache[cache_key]["timestamp"]).seconds
-            if cache_age < 3600:  # Cache for 1 hour
-                logger.debug(f"Using cached TwelveData for {symbol}")
-                return self._cache[cache_key]["data"]
+        cached = self._cache.get(cache_key)  # Cached for 1 hour
+        if cached is not None:
+            logger.debug(f"Using cached TwelveData for {symbol}")
+            return cached
 
         # Apply STRICT rate limiting
         await TWELVEDATA_LIMITER.acquire()
@@ -164,7 +366,7 @@ class DataClient:
             # Implement actual API call here
 
             # Cache the result (longer duration for strict limits)
-            self._cache[cache_key] = {"data": bars, "timestamp": datetime.now()}
+            self._cache.set(cache_key, bars, ttl=3600)
 
             return bars
 
@@ -215,6 +417,7 @@ class DataClient:
         Returns:
             Dictionary with cache size and age info
         """
+        self._cache.expire()
         total_entries = len(self._cache)
         total_size = sum(len(str(v)) for v in self._cache.values())
 
@@ -6,8 +6,8 @@ These models provide a stable interface independent of Alpaca API changes.
 from datetime import date, datetime, time
 from decimal import Decimal
 from math import sqrt
-from statistics import stdev
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -66,6 +66,14 @@ class Calendar(BaseModel):
         """
         return [day.trading_date for day in self.days]
 
+    def trading_day_count(self) -> int:
+        """Get number of trading days without building the date list.
+
+        Returns:
+            Number of trading days in the calendar
+        """
+        return len(self.days)
+
     def is_trading_day(self, check_date: date) -> bool:
         """Check if date is a trading day.
 
@@ -75,7 +83,7 @@ class Calendar(BaseModel):
         Returns:
             True if trading day
         """
-        return check_date in self.get_trading_days()
+        return any(day.trading_date == check_date for day in self.days)
 
 
 class PortfolioHistory(BaseModel):
@@ -114,6 +122,10 @@ class PortfolioHistory(BaseModel):
 
         return returns
 
+    def _equity_array(self) -> np.ndarray:
+        """Get equity values as a float64 array for vectorized analytics."""
+        return np.fromiter((float(v) for v in self.equity), dtype=np.float64, count=len(self.equity))
+
     def calculate_sharpe_ratio(self, risk_free_rate: Decimal = Decimal("0.04")) -> Decimal:
         """Calculate Sharpe Ratio (annualized).
 
@@ -126,31 +138,36 @@ class PortfolioHistory(BaseModel):
         Formula:
             Sharpe = (Mean Return - Risk Free Rate) / Std Dev of Returns * sqrt(252)
         """
-        returns = self.calculate_returns()
-
-        if not returns or len(returns) < 2:
+        if len(self.equity) < 3:
             return Decimal("0")
 
-        # Convert to float for statistics
-        returns_float = [float(r) for r in returns]
+        equity = self._equity_array()
+        previous = equity[:-1]
+
+        # Same rule as calculate_returns(): skip periods starting from zero equity
+        valid = previous > 0
+        returns = np.diff(equity)[valid] / previous[valid]
 
-        avg_return = sum(returns_float) / len(returns_float)
-        std_return = stdev(returns_float)
+        if returns.size < 2:
+            return Decimal("0")
+
+        std_return = returns.std(ddof=1)
 
         if std_return == 0:
             return Decimal("0")
 
         # Annualize (252 trading days per year)
         daily_rf_rate = float(risk_free_rate) / 252
-        sharpe_ratio = (avg_return - daily_rf_rate) / std_return * sqrt(252)
+        sharpe_ratio = (returns.mean() - daily_rf_rate) / std_return * sqrt(252)
 
-        return Decimal(str(sharpe_ratio))
+        return Decimal(str(float(sharpe_ratio)))
 
     def calculate_max_drawdown(self) -> tuple[Decimal, datetime | None, datetime | None]:
         """Calculate maximum drawdown.
 
         Returns:
-            Tuple of (max_drawdown_pct, peak_date, trough_date)
+            Tuple of (max_drawdown_pct, peak_date, trough_date). peak_date is the
+            high preceding the trough; trough_date is None if there is no drawdown.
 
         Example:
             max_dd, peak, trough = history.calculate_max_drawdown()
@@ -159,26 +176,22 @@ class PortfolioHistory(BaseModel):
         if len(self.equity) < 2:
             return (Decimal("0"), None, None)
 
-        max_drawdown = Decimal("0")
-        peak_value = self.equity[0]
-        peak_date = self.timestamps[0]
-        trough_date = None
+        equity = self._equity_array()
+        running_peak = np.maximum.accumulate(equity)
+
+        # Drawdown from the running peak (undefined while the peak is not positive)
+        drawdowns = np.zeros_like(equity)
+        np.divide(running_peak - equity, running_peak, out=drawdowns, where=running_peak > 0)
 
-        for i, value in enumerate(self.equity):
-            # Update peak
-            if value > peak_value:
-                peak_value = value
-                peak_date = self.timestamps[i]
+        trough = int(drawdowns.argmax())
+        max_drawdown = drawdowns[trough]
 
-            # Calculate drawdown from peak
-            if peak_value > 0:
-                drawdown = (peak_value - value) / peak_value
+        if max_drawdown <= 0:
+            return (Decimal("0"), self.timestamps[int(equity.argmax())], None)
 
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-                    trough_date = self.timestamps[i]
+        peak = int(equity[: trough + 1].argmax())
 
-        return (max_drawdown, peak_date, trough_date)
+        return (Decimal(str(float(max_drawdown))), self.timestamps[peak], self.timestamps[trough])
 
     def calculate_calmar_ratio(self, risk_free_rate: Decimal = Decimal("0.04")) -> Decimal:
         """Calculate Calmar Ratio.
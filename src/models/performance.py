@@ -1,9 +1,14 @@
 """Pydantic models for performance tracking and metrics."""
 
+import sys
 from datetime import date as DateType
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Performance records are written once and logged; freezing them rejects
+# accidental mutation and unknown fields (typos) at construction
+_RECORD_CONFIG = ConfigDict(frozen=True, extra="forbid")
 
 
 class DailyPerformance(BaseModel):
@@ -21,6 +26,8 @@ class DailyPerformance(BaseModel):
         avg_loss: Average loss per losing trade
     """
 
+    model_config = _RECORD_CONFIG
+
     date: DateType = Field(description="Trading date")
     total_trades: int = Field(description="Total number of trades", ge=0)
     winning_trades: int = Field(description="Number of winning trades", ge=0)
@@ -45,6 +52,8 @@ class StrategyMetrics(BaseModel):
         total_pnl: Total P&L for this strategy
     """
 
+    model_config = _RECORD_CONFIG
+
     strategy: str = Field(description="Strategy name")
     date: DateType = Field(description="Metrics date")
     total_trades: int = Field(description="Total trades", ge=0)
@@ -60,16 +69,24 @@ class WeeklyReport(BaseModel):
         total_trades: Total trades in the week
         win_rate: Weekly win rate
         total_pnl: Total P&L for the week
-        best_performers: List of best performing tickers
-        worst_performers: List of worst performing tickers
+        best_performers: Best performing tickers
+        worst_performers: Worst performing tickers
     """
 
+    model_config = _RECORD_CONFIG
+
     week_ending: DateType = Field(description="End date of the week")
     total_trades: int = Field(description="Total trades in the week", ge=0)
     win_rate: Decimal = Field(description="Weekly win rate", ge=0, le=1)
     total_pnl: Decimal = Field(description="Total P&L for the week")
-    best_performers: list[str] = Field(description="Best performing tickers")
-    worst_performers: list[str] = Field(description="Worst performing tickers")
+    best_performers: tuple[str, ...] = Field(description="Best performing tickers")
+    worst_performers: tuple[str, ...] = Field(description="Worst performing tickers")
+
+    @field_validator("best_performers", "worst_performers")
+    @classmethod
+    def _intern_tickers(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        """Intern ticker symbols so repeated tickers share one string."""
+        return tuple(sys.intern(ticker) for ticker in v)
 
 
 class ParameterChange(BaseModel):
@@ -82,6 +99,8 @@ class ParameterChange(BaseModel):
         new_params: New parameter values
     """
 
+    model_config = _RECORD_CONFIG
+
     date: DateType = Field(description="Date of parameter change")
     reason: str = Field(description="Reason for adjustment")
     old_params: dict[str, float] = Field(description="Previous parameter values")
@@ -2,7 +2,7 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class Position(BaseModel):
@@ -13,18 +13,33 @@ class Position(BaseModel):
         quantity: Number of shares held
         avg_entry_price: Average entry price per share
         current_price: Current market price
-        market_value: Current position value (quantity * current_price)
-        unrealized_pnl: Unrealized profit/loss
-        unrealized_pnl_pct: Unrealized P&L percentage
+        market_value: Current position value (quantity * current_price, computed)
+        unrealized_pnl: Unrealized profit/loss (computed)
+        unrealized_pnl_pct: Unrealized P&L percentage (computed)
     """
 
     symbol: str = Field(description="Stock/ETF ticker symbol")
     quantity: Decimal = Field(description="Number of shares held", ge=0)
     avg_entry_price: Decimal = Field(description="Average entry price per share", gt=0)
     current_price: Decimal = Field(description="Current market price", gt=0)
-    market_value: Decimal = Field(description="Current position value")
-    unrealized_pnl: Decimal = Field(description="Unrealized profit/loss")
-    unrealized_pnl_pct: Decimal = Field(description="Unrealized P&L percentage")
+
+    # Derived values are computed from quantity and prices so they can never
+    # disagree with them; model_dump() still includes them
+
+    @computed_field(description="Current position value")
+    @property
+    def market_value(self) -> Decimal:
+        return self.quantity * self.current_price
+
+    @computed_field(description="Unrealized profit/loss")
+    @property
+    def unrealized_pnl(self) -> Decimal:
+        return (self.current_price - self.avg_entry_price) * self.quantity
+
+    @computed_field(description="Unrealized P&L percentage")
+    @property
+    def unrealized_pnl_pct(self) -> Decimal:
+        return (self.current_price - self.avg_entry_price) / self.avg_entry_price
 
 
 class Portfolio(BaseModel):
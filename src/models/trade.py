@@ -1,8 +1,9 @@
 """Pydantic models for trading signals and executed trades."""
 
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from decimal import Decimal
-from typing import Literal
+from typing import Any, Literal, Self
 
 from pydantic import BaseModel, Field
 
@@ -43,6 +44,25 @@ class Signal(BaseModel):
     target_value: Decimal | None = Field(default=None, description="Target dollar value for position")
     current_value: Decimal | None = Field(default=None, description="Current dollar value of position")
 
+    @classmethod
+    def model_validate_many(cls, rows: Sequence[Mapping[str, Any]]) -> list[Self]:
+        """Validate many signal rows with the compiled validator.
+
+        Equivalent to ``[Signal(**row) for row in rows]`` without the per-row
+        keyword unpacking and ``__init__`` dispatch.
+
+        Args:
+            rows: Signal field mappings (one per signal)
+
+        Returns:
+            Validated signals in input order
+
+        Raises:
+            ValidationError: If any row is invalid
+        """
+        validate = cls.__pydantic_validator__.validate_python
+        return [validate(row) for row in rows]
+
 
 class Trade(BaseModel):
     """Executed trade record for database storage.
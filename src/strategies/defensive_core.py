@@ -6,6 +6,7 @@ Allocates 50% of portfolio to stable ETFs (VTI, VGK, GLD).
 
 from datetime import date
 from decimal import Decimal
+from functools import lru_cache
 
 from ..adapters.market_data_adapter import get_market_data_adapter
 from ..models.portfolio import Portfolio, Position
@@ -27,6 +28,9 @@ TARGET_ALLOCATIONS = {
 # Rebalancing threshold (portfolio drift)
 REBALANCE_DRIFT_THRESHOLD = Decimal("0.05")  # 5% drift triggers rebalancing
 
+# Latest day-of-month a first trading day can fall on (weekend + holiday is day 4)
+FIRST_TRADING_DAY_MAX_DOM = 7
+
 
 async def should_rebalance(today: date, positions: list[Position], portfolio: Portfolio) -> bool:
     """Check if portfolio rebalancing is needed.
@@ -43,16 +47,19 @@ async def should_rebalance(today: date, positions: list[Position], portfolio: Po
     Returns:
         True if rebalancing is needed, False otherwise
     """
-    # Trigger 1: First trading day of month (using market calendar)
-    adapter = await get_market_data_adapter()
-    if await adapter.is_first_trading_day_of_month(today):
-        logger.info("Rebalancing triggered: First trading day of month")
-        return True
+    # Trigger 1: First trading day of month (using market calendar).
+    # Only the first week can qualify, so skip the calendar request otherwise.
+    if today.day <= FIRST_TRADING_DAY_MAX_DOM:
+        adapter = await get_market_data_adapter()
+        if await adapter.is_first_trading_day_of_month(today):
+            logger.info("Rebalancing triggered: First trading day of month")
+            return True
 
     # Trigger 2: Check for portfolio drift
+    positions_by_symbol = {p.symbol: p for p in positions}
     for symbol, target_pct in TARGET_ALLOCATIONS.items():
         # Find current position
-        position = next((p for p in positions if p.symbol == symbol), None)
+        position = positions_by_symbol.get(symbol)
 
         if position is None:
             current_pct = Decimal("0")
@@ -91,13 +98,14 @@ async def calculate_rebalancing_orders(
         List of trading signals to execute rebalancing
     """
     signals = []
+    positions_by_symbol = {p.symbol: p for p in positions}
 
     for symbol, target_pct in TARGET_ALLOCATIONS.items():
         # Calculate target value
         target_value = portfolio.portfolio_value * target_pct
 
         # Find current position
-        position = next((p for p in positions if p.symbol == symbol), None)
+        position = positions_by_symbol.get(symbol)
 
         if position is None:
             current_value = Decimal("0")
@@ -148,15 +156,18 @@ async def calculate_rebalancing_orders(
     return signals
 
 
-def get_defensive_symbols() -> set[str]:
+@lru_cache(maxsize=1)
+def get_defensive_symbols() -> frozenset[str]:
     """Get set of defensive core ticker symbols.
 
-    Used to identify which positions are part of defensive core.
+    Used to identify which positions are part of defensive core. The result is
+    cached; call ``get_defensive_symbols.cache_clear()`` after changing
+    TARGET_ALLOCATIONS.
 
     Returns:
-        Set of ticker symbols
+        Frozen set of ticker symbols
     """
-    return set(TARGET_ALLOCATIONS.keys())
+    return frozenset(TARGET_ALLOCATIONS)
 
 
 def calculate_defensive_exposure(positions: list[Position]) -> Decimal:
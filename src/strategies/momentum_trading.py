@@ -5,7 +5,13 @@ Uses technical indicators to identify entry/exit points.
 Allocates 30% of portfolio to momentum trades (max 5 positions).
 """
 
+import asyncio
+from dataclasses import asdict, dataclass, fields, replace
 from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pandas as pd
 
 from ..clients.alpha_vantage_client import AlphaVantageClient
 from ..config.strategy_params import get_strategy_parameters
@@ -54,6 +60,37 @@ DEFAULT_STRATEGY_PARAMS = {
 }
 
 
+@dataclass(slots=True, frozen=True)
+class StrategyParams:
+    """Current momentum strategy parameters (see DEFAULT_STRATEGY_PARAMS).
+
+    Immutable: updates swap in a new instance, so readers never see a
+    half-applied change.
+    """
+
+    rsi_lower: float
+    rsi_upper: float
+    stop_loss_pct: float
+    take_profit_pct: float
+    volume_ratio: float
+    macd_threshold: float
+
+
+_params = StrategyParams(**DEFAULT_STRATEGY_PARAMS)
+_PARAM_NAMES = frozenset(f.name for f in fields(StrategyParams))
+
+# Names used by older parameter adjustments (e.g. stored parameter_changes rows)
+_PARAM_ALIASES = {
+    "rsi_min": "rsi_lower",
+    "rsi_max": "rsi_upper",
+    "min_volume_ratio": "volume_ratio",
+}
+
+
+# Max tickers fetched and scanned at once in scan_for_signals
+SCAN_CONCURRENCY = 10
+
+
 async def scan_for_signals(alpaca_client: AlpacaMCPClient) -> list[Signal]:
     """Scan watchlist for momentum entry signals.
 
@@ -63,14 +100,15 @@ async def scan_for_signals(alpaca_client: AlpacaMCPClient) -> list[Signal]:
     3. Price > 50-day SMA & SMA20 > SMA50 (strong uptrend)
     4. Volume > 20% above average (institutional interest)
 
+    Tickers are scanned concurrently (at most SCAN_CONCURRENCY at once); a
+    ticker that fails is logged and skipped.
+
     Args:
         alpaca_client: Alpaca MCP client for market data (used for quotes only)
 
     Returns:
-        List of buy signals meeting all criteria
+        List of buy signals meeting all criteria, in watchlist order
     """
-    signals = []
-
     # Load dynamic parameters (optimized or defaults)
     params_manager = get_strategy_parameters()
     params = await params_manager.get_parameters("momentum")
@@ -78,104 +116,150 @@ async def scan_for_signals(alpaca_client: AlpacaMCPClient) -> list[Signal]:
     logger.debug(f"Using momentum parameters: RSI [{params['rsi_lower']}-{params['rsi_upper']}], "
                  f"MACD > {params['macd_threshold']}, Vol > {params['volume_ratio']}")
 
+    watchlist = get_dynamic_watchlist()
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+    async def scan(ticker: str) -> Signal | None:
+        async with semaphore:
+            return await _scan_ticker(ticker, params)
+
+    results = await asyncio.gather(*(scan(t) for t in watchlist), return_exceptions=True)
+
+    signals = []
+    for ticker, result in zip(watchlist, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error scanning {ticker}: {result}")
+        elif result is not None:
+            signals.append(result)
+
+    logger.info(f"Momentum scan complete: {len(signals)} signals found")
+    return signals
+
+
+def _fetch_daily_history(ticker: str) -> pd.DataFrame:
+    """Fetch 3 months of daily bars from yfinance (blocking)."""
     # Use yfinance for historical data (Unlimited & Free)
     # Alpha Vantage hit the 25 req/day limit.
     import yfinance as yf
 
-    watchlist = get_dynamic_watchlist()
+    return yf.Ticker(ticker).history(period="3mo", interval="1d")
 
-    for ticker in watchlist:
-        try:
-            # Get 60 days of historical bars from yfinance
-            # interval='1d' is standard for daily momentum
-            yf_ticker = yf.Ticker(ticker)
-            bars = yf_ticker.history(period="3mo", interval="1d")
-
-            # Skip if no data
-            if bars.empty:
-                logger.warning(f"No data available for {ticker}")
-                continue
-            
-            # Normalize columns to lowercase for our indicators
-            bars.columns = [c.lower() for c in bars.columns]
-            # yfinance returns 'Stock Splits' and 'Dividends', we don't need them
-            
-            # Calculate indicators
-            bars["rsi"] = calculate_rsi(bars)
-            macd, signal, histogram = calculate_macd(bars)
-            bars["macd"] = macd
-            bars["macd_signal"] = signal
-            bars["histogram"] = histogram
-            bars["sma20"] = calculate_sma(bars, period=20)
-            bars["sma50"] = calculate_sma(bars, period=50)
-            bars["volume_ratio"] = calculate_volume_ratio(bars)
-
-            # Remove NaN values from indicator warmup
-            bars = bars.dropna()
-
-            if bars.empty:
-                logger.warning(f"Not enough data for {ticker} after indicator calculation")
-                continue
-
-            # Get latest values
-            latest = bars.iloc[-1]
-
-            # Entry criteria (ALL must be True) - pure boolean logic
-            # Uses dynamically optimized parameters
-            entry_conditions = [
-                params["rsi_lower"] < latest["rsi"] < params["rsi_upper"],
-                latest["histogram"] > params["macd_threshold"],
-                latest["close"] > latest["sma50"],      # Price above long-term trend
-                latest["sma20"] > latest["sma50"],      # Golden Cross alignment
-                latest["volume_ratio"] > params["volume_ratio"],
-            ]
-
-            if all(entry_conditions):
-                # Calculate stop-loss and take-profit
-                entry_price = Decimal(str(latest["close"]))
-                stop_loss = entry_price * Decimal(str(1 - params["stop_loss_pct"]))
-                take_profit = entry_price * Decimal(str(1 + params["take_profit_pct"]))
-
-                # Calculate confidence (average of normalized indicators)
-                # RSI: normalized to 0-1 based on dynamic range
-                rsi_score = (latest["rsi"] - params["rsi_lower"]) / (
-                    params["rsi_upper"] - params["rsi_lower"]
-                )
-                # MACD histogram: higher is better (cap at 1.0)
-                macd_score = min(latest["histogram"] / 2, 1.0)
-                # Volume ratio: > 1.0 is good (cap at 2.0 = 1.0 score)
-                volume_score = min((latest["volume_ratio"] - 1.0) / 1.0, 1.0)
-
-                confidence = (rsi_score + macd_score + volume_score) / 3
-
-                signal = Signal(
-                    ticker=ticker,
-                    action="BUY",
-                    entry_price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    confidence=Decimal(str(confidence)),
-                    strategy="momentum",
-                    rsi=Decimal(str(latest["rsi"])),
-                    macd_histogram=Decimal(str(latest["histogram"])),
-                    volume_ratio=Decimal(str(latest["volume_ratio"])),
-                )
-
-                signals.append(signal)
-
-                logger.info(
-                    f"Momentum signal: {ticker} @ ${entry_price:.2f} "
-                    f"(RSI: {latest['rsi']:.1f}, "
-                    f"MACD: {latest['histogram']:.3f}, "
-                    f"confidence: {confidence:.2f})"
-                )
 
-        except Exception as e:
-            logger.error(f"Error scanning {ticker}: {e}")
-            continue
+def _latest_complete_row(columns: list[pd.Series]) -> list[float] | None:
+    """Get the newest row with no NaN (indicator warmup) across columns.
 
-    logger.info(f"Momentum scan complete: {len(signals)} signals found")
-    return signals
+    Args:
+        columns: Equal-length series, e.g. close price and indicators
+
+    Returns:
+        That row's values as floats in column order, or None if every row has a NaN
+    """
+    matrix = np.column_stack([c.to_numpy(dtype=np.float64) for c in columns])
+    complete_rows = np.flatnonzero(~np.isnan(matrix).any(axis=1))
+
+    if complete_rows.size == 0:
+        return None
+
+    return matrix[complete_rows[-1]].tolist()
+
+
+async def _scan_ticker(ticker: str, params: dict[str, Any]) -> Signal | None:
+    """Check one ticker against the momentum entry criteria.
+
+    Args:
+        ticker: Stock ticker symbol
+        params: Momentum strategy parameters
+
+    Returns:
+        Buy signal if all criteria are met, None otherwise
+    """
+    # Get 3 months of daily bars from yfinance (sync HTTP, run in executor
+    # so tickers overlap)
+    loop = asyncio.get_running_loop()
+    bars = await loop.run_in_executor(None, _fetch_daily_history, ticker)
+
+    # Skip if no data
+    if bars.empty:
+        logger.warning(f"No data available for {ticker}")
+        return None
+
+    # Normalize columns to lowercase for our indicators
+    bars.columns = [c.lower() for c in bars.columns]
+    # yfinance returns 'Stock Splits' and 'Dividends', we don't need them
+
+    # Calculate indicators and get latest values
+    latest = _latest_complete_row(
+        [
+            bars["close"],
+            calculate_rsi(bars),
+            calculate_macd(bars)[2],
+            calculate_sma(bars, period=20),
+            calculate_sma(bars, period=50),
+            calculate_volume_ratio(bars),
+        ]
+    )
+
+    if latest is None:
+        logger.warning(f"Not enough data for {ticker} after indicator calculation")
+        return None
+
+    close, rsi, macd_hist, sma20, sma50, volume_ratio = latest
+
+    # Entry criteria (ALL must be True) - pure boolean logic
+    # Uses dynamically optimized parameters
+    entry_conditions = [
+        params["rsi_lower"] < rsi < params["rsi_upper"],
+        macd_hist > params["macd_threshold"],
+        close > sma50,      # Price above long-term trend
+        sma20 > sma50,      # Golden Cross alignment
+        volume_ratio > params["volume_ratio"],
+    ]
+
+    if all(entry_conditions):
+        # Calculate stop-loss and take-profit
+        entry_price = Decimal(str(close))
+        stop_loss = entry_price * Decimal(str(1 - params["stop_loss_pct"]))
+        take_profit = entry_price * Decimal(str(1 + params["take_profit_pct"]))
+
+        # Calculate confidence (average of normalized indicators)
+        # RSI: normalized to 0-1 based on dynamic range
+        rsi_score = (rsi - params["rsi_lower"]) / (
+            params["rsi_upper"] - params["rsi_lower"]
+        )
+        # MACD histogram: higher is better (cap at 1.0)
+        macd_score = min(macd_hist / 2, 1.0)
+        # Volume ratio: > 1.0 is good (cap at 2.0 = 1.0 score)
+        volume_score = min((volume_ratio - 1.0) / 1.0, 1.0)
+
+        confidence = (rsi_score + macd_score + volume_score) / 3
+
+        signal = Signal(
+            ticker=ticker,
+            action="BUY",
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            confidence=Decimal(str(confidence)),
+            strategy="momentum",
+            rsi=Decimal(str(rsi)),
+            macd_histogram=Decimal(str(macd_hist)),
+            volume_ratio=Decimal(str(volume_ratio)),
+        )
+
+        logger.info(
+            f"Momentum signal: {ticker} @ ${entry_price:.2f} "
+            f"(RSI: {rsi:.1f}, "
+            f"MACD: {macd_hist:.3f}, "
+            f"confidence: {confidence:.2f})"
+        )
+
+        return signal
+
+    return None
+
+
+# Exit reason per price-exit code from check_exit_conditions_batch
+_PRICE_EXIT_REASONS = (None, "stop_loss", "take_profit")
 
 
 async def check_exit_conditions(
@@ -195,40 +279,102 @@ async def check_exit_conditions(
     Returns:
         Tuple of (should_exit, exit_reason)
     """
-    try:
-        # Get current quote from Alpaca (this works even on free tier)
-        quote = await alpaca_client.get_latest_quote(position.symbol)
-        current_price = Decimal(str(quote.get("price", quote.get("last", 0))))
+    return (await check_exit_conditions_batch([position], alpaca_client))[0]
 
-        # Check stop-loss (P&L <= -5%)
-        pnl_pct = (current_price - position.avg_entry_price) / position.avg_entry_price
 
-        if pnl_pct <= Decimal(str(-STRATEGY_PARAMS["stop_loss_pct"])):
-            logger.info(f"Stop-loss triggered for {position.symbol}: {pnl_pct:.2%}")
-            return (True, "stop_loss")
+async def check_exit_conditions_batch(
+    positions: list[Position], alpaca_client: AlpacaMCPClient
+) -> list[tuple[bool, str | None]]:
+    """Check exit conditions for several momentum positions at once.
 
-        # Check take-profit (P&L >= +15%)
-        if pnl_pct >= Decimal(str(STRATEGY_PARAMS["take_profit_pct"])):
-            logger.info(f"Take-profit triggered for {position.symbol}: {pnl_pct:.2%}")
-            return (True, "take_profit")
+    Quotes are fetched concurrently and stop-loss/take-profit are classified
+    for all positions in one vectorized pass. Positions inside the band then
+    get the technical check one at a time (Alpha Vantage is rate-limited). A
+    position whose quote fails, is missing, or is not a positive price, or
+    whose technical check fails, is logged and not exited.
 
-        # Check technical exit using Alpha Vantage
+    Args:
+        positions: Open positions to check
+        alpaca_client: Alpaca MCP client for current quotes
+
+    Returns:
+        (should_exit, exit_reason) per position, in input order
+    """
+    quotes = await asyncio.gather(
+        *(alpaca_client.get_latest_quote(p.symbol) for p in positions), return_exceptions=True
+    )
+
+    # Decimal prices in object arrays: np.where still classifies in one pass,
+    # but every comparison is exact (no float misses at the thresholds)
+    n = len(positions)
+    entry = np.array([p.avg_entry_price for p in positions], dtype=object)
+    price = entry.copy()  # Placeholder (inside the band) for invalid quotes
+    valid = np.zeros(n, dtype=bool)
+    for i, (position, quote) in enumerate(zip(positions, quotes)):
+        if isinstance(quote, Exception):
+            logger.error(f"Error checking exit for {position.symbol}: {quote}")
+            continue
+        try:
+            quote_price = Decimal(str(quote.get("price", quote.get("last", 0))))
+        except Exception as e:
+            logger.error(f"Error checking exit for {position.symbol}: bad quote {quote!r} ({e})")
+            continue
+        # get_latest_quote reports 0.0 for unknown symbols; never exit on that
+        if not quote_price.is_finite() or quote_price <= 0:
+            logger.warning(f"No valid quote for {position.symbol}, skipping exit check")
+            continue
+        price[i] = quote_price
+        valid[i] = True
+
+    params = _params
+
+    # pnl_pct <= -sl  <=>  price <= entry * (1 - sl)   (entry > 0), same for take-profit
+    stop_price = entry * (1 - Decimal(str(params.stop_loss_pct)))
+    take_price = entry * (1 + Decimal(str(params.take_profit_pct)))
+
+    # 0 = none, 1 = stop-loss, 2 = take-profit
+    codes = np.where(price <= stop_price, 1, np.where(price >= take_price, 2, 0))
+    codes[~valid] = 0
+
+    results: list[tuple[bool, str | None]] = []
+    for position, code, ok, current in zip(positions, codes.tolist(), valid, price):
+        if not ok:
+            results.append((False, None))
+        elif code:
+            pnl_pct = (current - position.avg_entry_price) / position.avg_entry_price
+            label = "Stop-loss" if code == 1 else "Take-profit"
+            logger.info(f"{label} triggered for {position.symbol}: {pnl_pct:.2%}")
+            results.append((True, _PRICE_EXIT_REASONS[code]))
+        else:
+            results.append(await _check_technical_exit(position))
+
+    return results
+
+
+async def _check_technical_exit(position: Position) -> tuple[bool, str | None]:
+    """Check RSI/MACD exit for a position using Alpha Vantage bars.
+
+    Args:
+        position: Open position to check
+
+    Returns:
+        Tuple of (should_exit, exit_reason)
+    """
+    try:
         av_client = AlphaVantageClient()
         bars = await av_client.get_bars(position.symbol, days=60)
 
         if not bars.empty:
-            bars["rsi"] = calculate_rsi(bars)
-            bars["histogram"] = calculate_macd(bars)[2]
-            bars = bars.dropna()
+            latest = _latest_complete_row([calculate_rsi(bars), calculate_macd(bars)[2]])
 
-            if not bars.empty:
-                latest = bars.iloc[-1]
+            if latest is not None:
+                rsi, macd_hist = latest
 
                 # Exit if RSI > 75 (overbought) or MACD turns negative
-                if latest["rsi"] > 75 or latest["histogram"] < 0:
+                if rsi > 75 or macd_hist < 0:
                     logger.info(
                         f"Technical exit for {position.symbol}: "
-                        f"RSI={latest['rsi']:.1f}, MACD={latest['histogram']:.3f}"
+                        f"RSI={rsi:.1f}, MACD={macd_hist:.3f}"
                     )
                     return (True, "technical_exit")
 
@@ -243,16 +389,28 @@ async def check_exit_conditions(
 def update_strategy_parameters(new_params: dict[str, float]) -> None:
     """Update strategy parameters based on performance analysis.
 
-    Called by performance analyzer to adjust parameters.
+    Called by performance analyzer to adjust parameters. The old names
+    rsi_min, rsi_max and min_volume_ratio are accepted as aliases. Unknown
+    parameter names and values that are already current are ignored.
 
     Args:
         new_params: Dictionary of parameter updates
     """
+    global _params
+
+    updates = {}
     for key, value in new_params.items():
-        if key in STRATEGY_PARAMS:
-            old_value = STRATEGY_PARAMS[key]
-            STRATEGY_PARAMS[key] = value
-            logger.info(f"Parameter updated: {key} = {value} (was {old_value})")
+        key = _PARAM_ALIASES.get(key, key)
+        if key in _PARAM_NAMES and getattr(_params, key) != value:
+            updates[key] = value
+    if not updates:
+        return
+
+    old_params = _params
+    _params = replace(old_params, **updates)
+
+    for key, value in updates.items():
+        logger.info(f"Parameter updated: {key} = {value} (was {getattr(old_params, key)})")
 
 
 def get_current_parameters() -> dict[str, float]:
@@ -261,4 +419,4 @@ def get_current_parameters() -> dict[str, float]:
     Returns:
         Dictionary of current parameter values
     """
-    return STRATEGY_PARAMS.copy()
+    return asdict(_params)
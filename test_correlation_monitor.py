@@ -31,18 +31,12 @@ async def test_correlation_monitor():
             quantity=Decimal("10"),
             avg_entry_price=Decimal("180"),
             current_price=Decimal("185"),
-            market_value=Decimal("1850"),
-            unrealized_pnl=Decimal("50"),
-            unrealized_pnl_pct=Decimal("0.0278"),
         ),
         Position(
             symbol="MSFT",
             quantity=Decimal("10"),
             avg_entry_price=Decimal("380"),
             current_price=Decimal("390"),
-            market_value=Decimal("3900"),
-            unrealized_pnl=Decimal("100"),
-            unrealized_pnl_pct=Decimal("0.0263"),
         ),
     ]
 
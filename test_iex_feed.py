@@ -17,7 +17,7 @@ async def test_iex_feed():
 
         # Test 1: Get bars for AAPL
         logger.info("Test 1: Fetching 30 days of AAPL bars from IEX...")
-        bars = await client.get_bars("AAPL", days=30)
+        bars = (await client.get_bars("AAPL", days=30)).to_pandas()
 
         if not bars.empty:
             logger.info(f"  SUCCESS: Retrieved {len(bars)} bars")
@@ -34,7 +34,7 @@ async def test_iex_feed():
         success_count = 0
 
         for ticker in tickers:
-            bars = await client.get_bars(ticker, days=10)
+            bars = (await client.get_bars(ticker, days=10)).to_pandas()
             if not bars.empty:
                 logger.info(f"  {ticker}: {len(bars)} bars retrieved")
                 success_count += 1
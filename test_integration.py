@@ -51,7 +51,7 @@ async def test_technical_indicators():
         client = AlpacaMCPClient()
 
         # Fetch bars for AAPL
-        bars = await client.get_bars("AAPL", days=60)
+        bars = (await client.get_bars("AAPL", days=60)).to_pandas()
 
         if bars.empty:
             logger.warning("[SKIP] No historical data available")
@@ -1,30 +1,58 @@
 """Test Market Data Adapter - Phase 1 & 2 Features."""
 
 import asyncio
-from datetime import date, timedelta
+import logging
+import os
+from calendar import monthrange
+from datetime import date
+from decimal import Decimal
 
 from src.adapters.market_data_adapter import get_market_data_adapter
 from src.utils.logger import logger
 
+BANNER_WIDTH = 70
+
+# Set TEST_DEBUG=1 to log full tracebacks on failure
+TEST_DEBUG = bool(os.getenv("TEST_DEBUG"))
+
+
+def banner(title: str, char: str = "=") -> None:
+    """Log a section banner as a single multi-line record."""
+    rule = char * BANNER_WIDTH
+    logger.info(f"{rule}\n{title}\n{rule}")
+
 
 async def test_phase_1():
     """Test Phase 1: Market Clock & Calendar."""
-    logger.info("=" * 70)
-    logger.info("PHASE 1 TEST: Market Clock & Calendar")
-    logger.info("=" * 70)
+    banner("PHASE 1 TEST: Market Clock & Calendar")
     logger.info("")
 
     adapter = await get_market_data_adapter()
 
+    today = date.today()
+    month_start = today.replace(day=1)
+    month_end = today.replace(day=monthrange(today.year, today.month)[1])
+
+    # All four calls are independent broker round-trips - run them concurrently
+    clock, is_open, calendar, is_first_day = await asyncio.gather(
+        adapter.get_market_clock(),
+        adapter.is_market_open(),
+        adapter.get_market_calendar(start_date=month_start, end_date=month_end),
+        adapter.is_first_trading_day_of_month(),
+        return_exceptions=True,
+    )
+
     # Test 1: Market Clock
     logger.info("1. Testing Market Clock...")
-    clock = await adapter.get_market_clock()
-
-    if clock:
-        logger.info(f"   Timestamp: {clock.timestamp}")
-        logger.info(f"   Market Status: {'OPEN' if clock.is_open else 'CLOSED'}")
-        logger.info(f"   Next Open: {clock.next_open}")
-        logger.info(f"   Next Close: {clock.next_close}")
+    if isinstance(clock, Exception):
+        logger.error(f"   Failed to get market clock: {clock}")
+    elif clock:
+        logger.info(
+            f"   Timestamp: {clock.timestamp}\n"
+            f"   Market Status: {'OPEN' if clock.is_open else 'CLOSED'}\n"
+            f"   Next Open: {clock.next_open}\n"
+            f"   Next Close: {clock.next_close}"
+        )
     else:
         logger.error("   Failed to get market clock")
 
@@ -32,24 +60,25 @@ async def test_phase_1():
 
     # Test 2: Is Market Open
     logger.info("2. Testing is_market_open()...")
-    is_open = await adapter.is_market_open()
-    logger.info(f"   Market is currently: {'OPEN' if is_open else 'CLOSED'}")
+    if isinstance(is_open, Exception):
+        logger.error(f"   Failed to check market status: {is_open}")
+    else:
+        logger.info(f"   Market is currently: {'OPEN' if is_open else 'CLOSED'}")
     logger.info("")
 
     # Test 3: Market Calendar (This Month)
     logger.info("3. Testing Market Calendar (This Month)...")
-    today = date.today()
-    month_start = today.replace(day=1)
-    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-
-    calendar = await adapter.get_market_calendar(start_date=month_start, end_date=month_end)
-
-    if calendar:
-        trading_days = calendar.get_trading_days()
-        logger.info(f"   Month: {month_start.strftime('%B %Y')}")
-        logger.info(f"   Trading Days: {len(trading_days)}")
-        logger.info(f"   First Trading Day: {trading_days[0] if trading_days else 'N/A'}")
-        logger.info(f"   Last Trading Day: {trading_days[-1] if trading_days else 'N/A'}")
+    if isinstance(calendar, Exception):
+        logger.error(f"   Failed to get market calendar: {calendar}")
+    elif calendar:
+        # Only the count and the endpoints are needed - skip building the date list
+        days = calendar.days
+        logger.info(
+            f"   Month: {month_start.strftime('%B %Y')}\n"
+            f"   Trading Days: {calendar.trading_day_count()}\n"
+            f"   First Trading Day: {days[0].trading_date if days else 'N/A'}\n"
+            f"   Last Trading Day: {days[-1].trading_date if days else 'N/A'}"
+        )
     else:
         logger.error("   Failed to get market calendar")
 
@@ -57,21 +86,19 @@ async def test_phase_1():
 
     # Test 4: First Trading Day of Month
     logger.info("4. Testing is_first_trading_day_of_month()...")
-    is_first_day = await adapter.is_first_trading_day_of_month()
-    logger.info(f"   Today ({today}) is first trading day: {is_first_day}")
+    if isinstance(is_first_day, Exception):
+        logger.error(f"   Failed to check first trading day: {is_first_day}")
+    else:
+        logger.info(f"   Today ({today}) is first trading day: {is_first_day}")
     logger.info("")
 
-    logger.info("=" * 70)
-    logger.info("PHASE 1 COMPLETED")
-    logger.info("=" * 70)
+    banner("PHASE 1 COMPLETED")
     logger.info("")
 
 
 async def test_phase_2():
     """Test Phase 2: Portfolio History & Analytics."""
-    logger.info("=" * 70)
-    logger.info("PHASE 2 TEST: Portfolio History & Analytics")
-    logger.info("=" * 70)
+    banner("PHASE 2 TEST: Portfolio History & Analytics")
     logger.info("")
 
     adapter = await get_market_data_adapter()
@@ -134,23 +161,53 @@ async def test_phase_2():
         logger.warning("   Portfolio history not available (requires live data)")
 
     logger.info("")
-    logger.info("=" * 70)
-    logger.info("PHASE 2 COMPLETED")
-    logger.info("=" * 70)
+    banner("PHASE 2 COMPLETED")
+
+
+async def _fold_filled_order_stats(adapter, limit: int) -> dict[str, Decimal | int]:
+    """Stream closed orders and accumulate slippage/fill stats in a single pass.
+
+    Sums stay in Decimal (the models' native type), so there is no per-order
+    float conversion and no rounding drift.
+    """
+    count = slippage_count = 0
+    total_slippage = total_qty = filled_qty = Decimal("0")
+
+    async for order in adapter.iter_orders_history(status="closed", limit=limit):
+        count += 1
+        total_qty += order.quantity
+        filled_qty += order.filled_quantity
+
+        if order.filled_avg_price and order.limit_price:
+            slippage = order.calculate_slippage(order.limit_price)
+            if slippage is not None:
+                total_slippage += slippage
+                slippage_count += 1
+
+    return {
+        "count": count,
+        "total_slippage": total_slippage,
+        "slippage_count": slippage_count,
+        "total_qty": total_qty,
+        "filled_qty": filled_qty,
+    }
 
 
 async def test_phase_3():
     """Test Phase 3: Orders History & Slippage Analysis."""
-    logger.info("=" * 70)
-    logger.info("PHASE 3 TEST: Orders History & Slippage Analysis")
-    logger.info("=" * 70)
+    banner("PHASE 3 TEST: Orders History & Slippage Analysis")
     logger.info("")
 
     adapter = await get_market_data_adapter()
 
+    # The all-orders fetch and the filled-orders stats fold are independent
+    all_orders, filled_stats = await asyncio.gather(
+        adapter.get_orders_history(status="all", limit=10),
+        _fold_filled_order_stats(adapter, limit=10),
+    )
+
     # Test 1: Get all orders
     logger.info("1. Testing get_orders_history (all orders)...")
-    all_orders = await adapter.get_orders_history(status="all", limit=10)
 
     if all_orders:
         logger.info(f"   Total Orders: {len(all_orders)}")
@@ -158,13 +215,16 @@ async def test_phase_3():
         # Show first order details
         if len(all_orders) > 0:
             first_order = all_orders[0]
-            logger.info(f"   First Order:")
-            logger.info(f"      Symbol: {first_order.symbol}")
-            logger.info(f"      Side: {first_order.side}")
-            logger.info(f"      Status: {first_order.status}")
-            logger.info(f"      Quantity: {first_order.quantity}")
-            logger.info(f"      Filled Qty: {first_order.filled_quantity}")
-            logger.info(f"      Order Type: {first_order.order_type}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "   First Order:\n"
+                    f"      Symbol: {first_order.symbol}\n"
+                    f"      Side: {first_order.side}\n"
+                    f"      Status: {first_order.status}\n"
+                    f"      Quantity: {first_order.quantity}\n"
+                    f"      Filled Qty: {first_order.filled_quantity}\n"
+                    f"      Order Type: {first_order.order_type}"
+                )
 
             if first_order.filled_avg_price:
                 logger.info(f"      Filled Price: ${first_order.filled_avg_price:.2f}")
@@ -185,75 +245,50 @@ async def test_phase_3():
 
     # Test 2: Get filled orders only
     logger.info("2. Testing get_orders_history (filled orders only)...")
-    filled_orders = await adapter.get_orders_history(status="closed", limit=10)
-
-    if filled_orders:
-        logger.info(f"   Filled Orders: {len(filled_orders)}")
-
-        # Calculate aggregate statistics
-        total_slippage = 0
-        slippage_count = 0
 
-        for order in filled_orders:
-            if order.filled_avg_price and order.limit_price:
-                slippage = order.calculate_slippage(order.limit_price)
-                if slippage is not None:
-                    total_slippage += float(slippage)
-                    slippage_count += 1
+    if filled_stats["count"]:
+        logger.info(f"   Filled Orders: {filled_stats['count']}")
 
-        if slippage_count > 0:
-            avg_slippage = total_slippage / slippage_count
+        if filled_stats["slippage_count"] > 0:
+            avg_slippage = filled_stats["total_slippage"] / filled_stats["slippage_count"]
             logger.info(f"   Average Slippage: ${avg_slippage:.4f}")
         else:
             logger.info("   No slippage data available (no limit orders)")
 
         # Calculate fill rate
-        total_qty = sum(float(o.quantity) for o in filled_orders)
-        filled_qty = sum(float(o.filled_quantity) for o in filled_orders)
-
-        if total_qty > 0:
-            fill_rate = (filled_qty / total_qty) * 100
+        if filled_stats["total_qty"] > 0:
+            fill_rate = (filled_stats["filled_qty"] / filled_stats["total_qty"]) * 100
             logger.info(f"   Fill Rate: {fill_rate:.2f}%")
 
     else:
         logger.info("   No filled orders found")
 
     logger.info("")
-    logger.info("=" * 70)
-    logger.info("PHASE 3 COMPLETED")
-    logger.info("=" * 70)
+    banner("PHASE 3 COMPLETED")
 
 
 async def main():
     """Run all tests."""
     logger.info("\n\n")
-    logger.info("#" * 70)
-    logger.info("# MARKET DATA ADAPTER TEST - PHASE 1, 2 & 3")
-    logger.info("#" * 70)
+    banner("# MARKET DATA ADAPTER TEST - PHASE 1, 2 & 3", char="#")
     logger.info("\n")
 
     try:
         # Phase 1: Market Clock & Calendar
         await test_phase_1()
 
-        await asyncio.sleep(1)
-
         # Phase 2: Portfolio History & Analytics
         await test_phase_2()
 
-        await asyncio.sleep(1)
-
         # Phase 3: Orders History & Slippage Analysis
         await test_phase_3()
 
     except Exception as e:
-        logger.error(f"Test failed: {e}", exc_info=True)
+        logger.error("Test failed: %s", e, exc_info=TEST_DEBUG)
         raise
 
     logger.info("\n")
-    logger.info("#" * 70)
-    logger.info("# ALL TESTS COMPLETED")
-    logger.info("#" * 70)
+    banner("# ALL TESTS COMPLETED", char="#")
 
 
 if __name__ == "__main__":
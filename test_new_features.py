@@ -4,62 +4,127 @@ Test all newly enabled API integrations and LLM features.
 """
 
 import os
+import io
+import sys
+import json
 import asyncio
+import functools
+
+import aiohttp
 from dotenv import load_dotenv
+from pydantic import BaseModel, TypeAdapter
 
 # Load environment variables
 load_dotenv()
 
-async def test_alpha_vantage():
+# Set TEST_DEBUG=1 to print full tracebacks on failure
+TEST_DEBUG = bool(os.getenv("TEST_DEBUG"))
+
+
+def buffered_output(test):
+    """Collect a test's output and write it in one go when the test finishes.
+
+    The tests run concurrently, so buffering keeps each test's output
+    contiguous and costs one stdout write per test instead of one per line.
+    """
+
+    @functools.wraps(test)
+    async def wrapper(*args):
+        out = io.StringIO()
+        try:
+            return await test(*args, out=out)
+        finally:
+            sys.stdout.write(out.getvalue())
+            sys.stdout.flush()
+
+    return wrapper
+
+
+# Bounds for every HTTP call on the shared session, so a hanging provider
+# fails its test instead of stalling the whole concurrent run
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3, sock_read=7)
+
+# Wall-clock bound for tests that go through SDK clients instead of the session
+CLIENT_TEST_TIMEOUT = 30
+
+
+# Static OpenRouter request body, encoded once at import instead of per request
+OPENROUTER_PAYLOAD = json.dumps({
+    "model": "anthropic/claude-3.5-sonnet",
+    "messages": [
+        {
+            "role": "user",
+            "content": "Analyze this stock news in 1 sentence: 'Apple announces record iPhone sales'"
+        }
+    ],
+    "max_tokens": 100
+}).encode()
+
+class FinnhubNewsItem(BaseModel):
+    """Fields of a Finnhub company-news item used by the smoke test."""
+
+    headline: str = "N/A"
+    source: str = "N/A"
+    url: str = ""
+
+
+# Decodes the raw response body straight into models (unused fields are skipped)
+FINNHUB_NEWS = TypeAdapter(list[FinnhubNewsItem])
+
+@buffered_output
+async def test_alpha_vantage(*, out: io.StringIO):
     """Test Alpha Vantage API."""
-    print("\n" + "="*80)
-    print("📊 Testing Alpha Vantage API")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("📊 Testing Alpha Vantage API", file=out)
+    print("="*80, file=out)
 
     api_key = os.getenv("ALPHAVANTAGE_API_KEY")
     if not api_key:
-        print("❌ ALPHAVANTAGE_API_KEY not set")
+        print("❌ ALPHAVANTAGE_API_KEY not set", file=out)
         return False
 
     try:
         from src.clients.alpha_vantage_client import AlphaVantageClient
 
         client = AlphaVantageClient()
-        print(f"✅ Client initialized with key: {api_key[:10]}...")
+        print(f"✅ Client initialized with key: {api_key[:10]}...", file=out)
 
         # Test getting bars for AAPL
-        print("\n🔍 Fetching AAPL bars (last 60 days)...")
-        bars = await client.get_bars("AAPL", days=60)
+        print("\n🔍 Fetching AAPL bars (last 60 days)...", file=out)
+        async with asyncio.timeout(CLIENT_TEST_TIMEOUT):
+            bars = await client.get_bars("AAPL", days=60)
 
         if bars and len(bars) > 0:
-            print(f"✅ Received {len(bars)} bars")
+            print(f"✅ Received {len(bars)} bars", file=out)
             latest = bars[-1]
-            print(f"   Latest close: ${latest['close']:.2f}")
-            print(f"   Latest volume: {latest['volume']:,}")
+            print(f"   Latest close: ${latest['close']:.2f}", file=out)
+            print(f"   Latest volume: {latest['volume']:,}", file=out)
             return True
         else:
-            print("⚠️  No data received")
+            print("⚠️  No data received", file=out)
             return False
 
+    except asyncio.TimeoutError:
+        print("❌ Timed out", file=out)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
-async def test_news_api():
+@buffered_output
+async def test_news_api(session: aiohttp.ClientSession, *, out: io.StringIO):
     """Test News API."""
-    print("\n" + "="*80)
-    print("📰 Testing News API")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("📰 Testing News API", file=out)
+    print("="*80, file=out)
 
     api_key = os.getenv("NEWS_API_KEY")
     if not api_key:
-        print("❌ NEWS_API_KEY not set")
+        print("❌ NEWS_API_KEY not set", file=out)
         return False
 
     try:
-        import aiohttp
-
-        print(f"✅ API Key configured: {api_key[:10]}...")
+        print(f"✅ API Key configured: {api_key[:10]}...", file=out)
 
         # Test fetching news
         url = "https://newsapi.org/v2/everything"
@@ -71,42 +136,43 @@ async def test_news_api():
             "pageSize": 5
         }
 
-        print("\n🔍 Fetching Apple stock news...")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    articles = data.get("articles", [])
-                    print(f"✅ Received {len(articles)} articles")
-
-                    if articles:
-                        print("\n📰 Latest headline:")
-                        print(f"   {articles[0].get('title', 'N/A')}")
-                        print(f"   Source: {articles[0].get('source', {}).get('name', 'N/A')}")
-                        return True
-                else:
-                    print(f"⚠️  API returned status {response.status}")
-                    return False
+        print("\n🔍 Fetching Apple stock news...", file=out)
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                articles = data.get("articles", [])
+                print(f"✅ Received {len(articles)} articles", file=out)
+
+                if articles:
+                    print("\n📰 Latest headline:", file=out)
+                    print(f"   {articles[0].get('title', 'N/A')}", file=out)
+                    print(f"   Source: {articles[0].get('source', {}).get('name', 'N/A')}", file=out)
+                    return True
+            else:
+                print(f"⚠️  API returned status {response.status}", file=out)
+                return False
 
+    except asyncio.TimeoutError:
+        print("❌ Timed out", file=out)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
-async def test_finnhub():
+@buffered_output
+async def test_finnhub(session: aiohttp.ClientSession, *, out: io.StringIO):
     """Test Finnhub API."""
-    print("\n" + "="*80)
-    print("📈 Testing Finnhub API")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("📈 Testing Finnhub API", file=out)
+    print("="*80, file=out)
 
     api_key = os.getenv("FINNHUB_API_KEY")
     if not api_key:
-        print("❌ FINNHUB_API_KEY not set")
+        print("❌ FINNHUB_API_KEY not set", file=out)
         return False
 
     try:
-        import aiohttp
-
-        print(f"✅ API Key configured: {api_key[:10]}...")
+        print(f"✅ API Key configured: {api_key[:10]}...", file=out)
 
         # Test fetching company news
         url = "https://finnhub.io/api/v1/company-news"
@@ -117,41 +183,42 @@ async def test_finnhub():
             "token": api_key
         }
 
-        print("\n🔍 Fetching AAPL company news...")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    news = await response.json()
-                    print(f"✅ Received {len(news)} news items")
-
-                    if news:
-                        print("\n📰 Latest news:")
-                        print(f"   {news[0].get('headline', 'N/A')}")
-                        print(f"   Source: {news[0].get('source', 'N/A')}")
-                        return True
-                else:
-                    print(f"⚠️  API returned status {response.status}")
-                    return False
+        print("\n🔍 Fetching AAPL company news...", file=out)
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                news = FINNHUB_NEWS.validate_json(await response.read())
+                print(f"✅ Received {len(news)} news items", file=out)
 
+                if news:
+                    print("\n📰 Latest news:", file=out)
+                    print(f"   {news[0].headline}", file=out)
+                    print(f"   Source: {news[0].source}", file=out)
+                    return True
+            else:
+                print(f"⚠️  API returned status {response.status}", file=out)
+                return False
+
+    except asyncio.TimeoutError:
+        print("❌ Timed out", file=out)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
-async def test_openrouter():
+@buffered_output
+async def test_openrouter(session: aiohttp.ClientSession, *, out: io.StringIO):
     """Test OpenRouter LLM API."""
-    print("\n" + "="*80)
-    print("🤖 Testing OpenRouter LLM API")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("🤖 Testing OpenRouter LLM API", file=out)
+    print("="*80, file=out)
 
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
-        print("❌ OPENROUTER_API_KEY not set")
+        print("❌ OPENROUTER_API_KEY not set", file=out)
         return False
 
     try:
-        import aiohttp
-
-        print(f"✅ API Key configured: {api_key[:15]}...")
+        print(f"✅ API Key configured: {api_key[:15]}...", file=out)
 
         # Test simple completion
         url = "https://openrouter.ai/api/v1/chat/completions"
@@ -160,69 +227,65 @@ async def test_openrouter():
             "Content-Type": "application/json"
         }
 
-        payload = {
-            "model": "anthropic/claude-3.5-sonnet",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": "Analyze this stock news in 1 sentence: 'Apple announces record iPhone sales'"
-                }
-            ],
-            "max_tokens": 100
-        }
-
-        print("\n🔍 Testing sentiment analysis...")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    print(f"✅ LLM Response received")
-                    print(f"\n💭 Analysis: {content}")
-                    return True
-                else:
-                    error = await response.text()
-                    print(f"⚠️  API returned status {response.status}")
-                    print(f"   Error: {error[:200]}")
-                    return False
-
+        print("\n🔍 Testing sentiment analysis...", file=out)
+        async with session.post(url, data=OPENROUTER_PAYLOAD, headers=headers) as response:
+            if response.status == 200:
+                data = await response.json()
+                content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+                print(f"✅ LLM Response received", file=out)
+                print(f"\n💭 Analysis: {content}", file=out)
+                return True
+            else:
+                error = await response.text()
+                print(f"⚠️  API returned status {response.status}", file=out)
+                print(f"   Error: {error[:200]}", file=out)
+                return False
+
+    except asyncio.TimeoutError:
+        print("❌ Timed out", file=out)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
-async def test_llm_integration():
+@buffered_output
+async def test_llm_integration(*, out: io.StringIO):
     """Test LLM integration in trading system."""
-    print("\n" + "="*80)
-    print("🧠 Testing LLM Integration in Trading System")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("🧠 Testing LLM Integration in Trading System", file=out)
+    print("="*80, file=out)
 
     try:
-        from src.llm.sentiment_analyzer import SentimentAnalyzer
+        from src.llm.sentiment_analyzer import get_sentiment_analyzer
 
-        print("✅ Importing SentimentAnalyzer...")
+        print("✅ Importing SentimentAnalyzer...", file=out)
 
-        analyzer = SentimentAnalyzer()
-        print("✅ SentimentAnalyzer initialized")
+        analyzer = get_sentiment_analyzer()
+        print("✅ SentimentAnalyzer initialized", file=out)
 
         # Test sentiment analysis
-        test_news = [
-            "Apple announces record-breaking iPhone sales, stock surges",
-            "Tesla faces production delays, investors concerned",
-            "Microsoft Azure reports strong cloud growth"
-        ]
-
-        print("\n🔍 Testing sentiment analysis on news...")
-        for i, headline in enumerate(test_news, 1):
-            print(f"\n   {i}. {headline}")
-            sentiment = await analyzer.analyze_sentiment(headline)
-            print(f"      → Sentiment: {sentiment}")
+        test_tickers = ["AAPL", "TSLA", "MSFT"]
+
+        # Each analysis is an independent LLM round-trip - run them concurrently
+        print("\n🔍 Testing sentiment analysis on news...", file=out)
+        async with asyncio.timeout(CLIENT_TEST_TIMEOUT):
+            sentiments = await asyncio.gather(
+                *(analyzer.analyze_ticker(ticker) for ticker in test_tickers)
+            )
+        for i, (ticker, sentiment) in enumerate(zip(test_tickers, sentiments), 1):
+            print(f"\n   {i}. {ticker}", file=out)
+            print(f"      → Sentiment: {sentiment}", file=out)
 
         return True
 
+    except asyncio.TimeoutError:
+        print("❌ Timed out", file=out)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ Error: {e}", file=out)
+        if TEST_DEBUG:
+            import traceback
+            traceback.print_exc(file=out)
         return False
 
 async def main():
@@ -232,12 +295,21 @@ async def main():
     print("Testing all newly enabled APIs and features")
     print("="*80)
 
+    # One pooled session for all HTTP tests (shared DNS cache + keep-alive + timeouts)
+    connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT) as session:
+        # Each test hits a different provider, so run them concurrently
+        tests = {
+            "Alpha Vantage": test_alpha_vantage(),
+            "News API": test_news_api(session),
+            "Finnhub": test_finnhub(session),
+            "OpenRouter": test_openrouter(session),
+            "LLM Integration": test_llm_integration()
+        }
+        values = await asyncio.gather(*tests.values(), return_exceptions=True)
     results = {
-        "Alpha Vantage": await test_alpha_vantage(),
-        "News API": await test_news_api(),
-        "Finnhub": await test_finnhub(),
-        "OpenRouter": await test_openrouter(),
-        "LLM Integration": await test_llm_integration()
+        name: False if isinstance(value, BaseException) else bool(value)
+        for name, value in zip(tests, values)
     }
 
     print("\n" + "="*80)
@@ -52,12 +52,14 @@ async def test_news_logging():
         logger.warning("   ⚠️  LLM analysis failed - cannot test further")
         return
 
-    logger.info(f"   ✅ LLM Analysis Complete:")
-    logger.info(f"      Action: {prognosis.action}")
-    logger.info(f"      Sentiment: {prognosis.sentiment_score:.2f}")
-    logger.info(f"      Confidence: {prognosis.confidence:.2f}")
-    logger.info(f"      Impact: {prognosis.impact}")
-    logger.info(f"      Reasoning: {prognosis.reasoning[:100]}...\n")
+    logger.info(
+        "   ✅ LLM Analysis Complete:\n"
+        f"      Action: {prognosis.action}\n"
+        f"      Sentiment: {prognosis.sentiment_score:.2f}\n"
+        f"      Confidence: {prognosis.confidence:.2f}\n"
+        f"      Impact: {prognosis.impact}\n"
+        f"      Reasoning: {prognosis.reasoning[:100]}...\n"
+    )
 
     # 4. Log LLM Analysis
     logger.info("4. Logging LLM analysis to database...")
@@ -81,8 +83,13 @@ async def test_news_logging():
     logger.info("5. Verifying data in database...")
     client = await SupabaseClient.get_instance()
 
+    # Both verification queries are independent - run them concurrently
+    news_result, llm_result = await asyncio.gather(
+        client.table("news_articles").select("*").eq("ticker", ticker).limit(5).execute(),
+        client.table("llm_analysis_log").select("*").eq("ticker", ticker).limit(5).execute(),
+    )
+
     # Check news_articles
-    news_result = await client.table("news_articles").select("*").eq("ticker", ticker).limit(5).execute()
     logger.info(f"   ✅ Found {len(news_result.data)} news articles in DB for {ticker}")
 
     if news_result.data:
@@ -91,7 +98,6 @@ async def test_news_logging():
         logger.info(f"      Source: {sample['source']}")
 
     # Check llm_analysis_log
-    llm_result = await client.table("llm_analysis_log").select("*").eq("ticker", ticker).limit(5).execute()
     logger.info(f"   ✅ Found {len(llm_result.data)} LLM analyses in DB for {ticker}")
 
     if llm_result.data:
@@ -101,12 +107,14 @@ async def test_news_logging():
         logger.info(f"      Signal Generated: {sample['signal_generated']}")
         logger.info(f"      Signal Approved: {sample['signal_approved']}\n")
 
-    logger.info("=== ✅ All Tests Passed! ===")
-    logger.info("\n📊 Summary:")
-    logger.info(f"   - News articles fetched: {len(articles)}")
-    logger.info(f"   - News articles in DB: {len(news_result.data)}")
-    logger.info(f"   - LLM analyses in DB: {len(llm_result.data)}")
-    logger.info(f"   - LLM recommendation: {prognosis.action} (score: {prognosis.sentiment_score:.2f})")
+    logger.info(
+        "=== ✅ All Tests Passed! ===\n"
+        "\n📊 Summary:\n"
+        f"   - News articles fetched: {len(articles)}\n"
+        f"   - News articles in DB: {len(news_result.data)}\n"
+        f"   - LLM analyses in DB: {len(llm_result.data)}\n"
+        f"   - LLM recommendation: {prognosis.action} (score: {prognosis.sentiment_score:.2f})"
+    )
 
 
 if __name__ == "__main__":
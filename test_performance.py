@@ -6,6 +6,42 @@ from src.database.supabase_client import SupabaseClient
 from src.core.performance_analyzer import analyze_daily_performance, generate_weekly_report
 from src.utils.logger import logger
 
+# Columns printed for each recent trade (fetched in this order)
+TRADE_LOG_COLUMNS = "date, action, quantity, ticker, entry_price, strategy"
+
+
+async def _fetch_latest(supabase, table: str, limit: int = 5, columns: str = "*") -> list[dict]:
+    """Fetch the most recent rows of a table, newest first."""
+    response = await supabase.table(table).select(columns).order("date", desc=True).limit(limit).execute()
+    return response.data
+
+
+async def _fetch_dashboard(supabase) -> dict[str, list[dict] | Exception]:
+    """Fetch the newest rows of every checked table.
+
+    Uses the ``latest_dashboard`` RPC (database/migrations/add_latest_dashboard_rpc.sql)
+    so all tables come back in a single round-trip. Falls back to one concurrent
+    query per table when the function is not installed.
+
+    Returns:
+        Mapping of table name to its rows, or to the exception raised fetching it
+    """
+    try:
+        response = await supabase.rpc("latest_dashboard", {"lim": 5, "trade_lim": 10}).execute()
+        return response.data
+    except Exception as e:
+        logger.warning(f"latest_dashboard RPC unavailable ({e}), querying tables individually")
+
+    tables = ("trades", "daily_performance", "strategy_metrics", "signals")
+    results = await asyncio.gather(
+        _fetch_latest(supabase, "trades", limit=10, columns=TRADE_LOG_COLUMNS),
+        _fetch_latest(supabase, "daily_performance"),
+        _fetch_latest(supabase, "strategy_metrics"),
+        _fetch_latest(supabase, "signals"),
+        return_exceptions=True,
+    )
+    return dict(zip(tables, results))
+
 
 async def test_performance_analytics():
     """Test performance analytics system."""
@@ -14,46 +50,54 @@ async def test_performance_analytics():
     # Initialize Supabase
     supabase = await SupabaseClient.get_instance()
 
-    # 1. Check recent trades
-    logger.info("\n1. Checking recent trades...")
+    # 1. Run daily performance analysis
+    logger.info("\n1. Running daily performance analysis...")
     try:
-        response = await supabase.table("trades").select("*").order("date", desc=True).limit(10).execute()
-        trades = response.data
+        await analyze_daily_performance()
+        logger.info("OK Daily performance analysis completed")
+    except Exception as e:
+        logger.error(f"Failed to run daily analysis: {e}")
+
+    # Read-only checks below are independent - fetch them in one batch
+    # (the weekly report does not write any of these tables, so they can be read now)
+    dashboard = await _fetch_dashboard(supabase)
+
+    # 2. Check recent trades
+    logger.info("\n2. Checking recent trades...")
+    try:
+        trades = dashboard["trades"]
+        if isinstance(trades, Exception):
+            raise trades
 
         if trades:
             logger.info(f"Found {len(trades)} recent trades:")
-            for trade in trades:
-                logger.info(
-                    f"  - {trade.get('date')}: {trade.get('action')} {trade.get('quantity')} "
-                    f"{trade.get('ticker')} @ ${trade.get('entry_price')} "
-                    f"(Strategy: {trade.get('strategy')})"
-                )
+            # Only the logged columns are fetched, so unpack them once per row
+            rows = (
+                (tr["date"], tr["action"], tr["quantity"], tr["ticker"], tr["entry_price"], tr["strategy"])
+                for tr in trades
+            )
+            for d, a, q, t, p, s in rows:
+                logger.info(f"  - {d}: {a} {q} {t} @ ${p} (Strategy: {s})")
         else:
             logger.warning("No trades found in database")
     except Exception as e:
         logger.error(f"Failed to fetch trades: {e}")
 
-    # 2. Run daily performance analysis
-    logger.info("\n2. Running daily performance analysis...")
-    try:
-        await analyze_daily_performance()
-        logger.info("OK Daily performance analysis completed")
-    except Exception as e:
-        logger.error(f"Failed to run daily analysis: {e}")
-
     # 3. Check daily_performance table
     logger.info("\n3. Checking daily performance metrics...")
     try:
-        response = await supabase.table("daily_performance").select("*").order("date", desc=True).limit(5).execute()
-        metrics = response.data
+        metrics = dashboard["daily_performance"]
+        if isinstance(metrics, Exception):
+            raise metrics
 
         if metrics:
             logger.info(f"Found {len(metrics)} daily performance records:")
-            for metric in metrics:
+            for m in metrics:
+                wr = float(m.get("win_rate") or 0)
+                pnl = float(m.get("daily_pnl") or 0)
                 logger.info(
-                    f"  - {metric.get('date')}: {metric.get('total_trades')} trades, "
-                    f"Win Rate: {float(metric.get('win_rate', 0)):.2%}, "
-                    f"P&L: ${float(metric.get('daily_pnl', 0)):.2f}"
+                    f"  - {m['date']}: {m.get('total_trades')} trades, "
+                    f"Win Rate: {wr:.2%}, P&L: ${pnl:.2f}"
                 )
         else:
             logger.info("No daily performance metrics found (expected if no trades with P&L yet)")
@@ -63,17 +107,19 @@ async def test_performance_analytics():
     # 4. Check strategy_metrics table
     logger.info("\n4. Checking strategy metrics...")
     try:
-        response = await supabase.table("strategy_metrics").select("*").order("date", desc=True).limit(5).execute()
-        strategy_metrics = response.data
+        strategy_metrics = dashboard["strategy_metrics"]
+        if isinstance(strategy_metrics, Exception):
+            raise strategy_metrics
 
         if strategy_metrics:
             logger.info(f"Found {len(strategy_metrics)} strategy performance records:")
             for sm in strategy_metrics:
+                wr = float(sm.get("win_rate") or 0)
+                pnl = float(sm.get("total_pnl") or 0)
                 logger.info(
-                    f"  - {sm.get('date')} ({sm.get('strategy')}): "
+                    f"  - {sm['date']} ({sm.get('strategy')}): "
                     f"{sm.get('total_trades')} trades, "
-                    f"Win Rate: {float(sm.get('win_rate', 0)):.2%}, "
-                    f"P&L: ${float(sm.get('total_pnl', 0)):.2f}"
+                    f"Win Rate: {wr:.2%}, P&L: ${pnl:.2f}"
                 )
         else:
             logger.info("No strategy metrics found (expected if no trades with P&L yet)")
@@ -91,8 +137,9 @@ async def test_performance_analytics():
     # 6. Check signals table
     logger.info("\n6. Checking logged signals...")
     try:
-        response = await supabase.table("signals").select("*").order("date", desc=True).limit(5).execute()
-        signals = response.data
+        signals = dashboard["signals"]
+        if isinstance(signals, Exception):
+            raise signals
 
         if signals:
             logger.info(f"Found {len(signals)} logged signals:")
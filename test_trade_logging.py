@@ -1,6 +1,5 @@
 """Test trade logging to Supabase database."""
 
-import asyncio
 from datetime import UTC, datetime
 from decimal import Decimal
 
@@ -8,6 +7,12 @@ from src.database.supabase_client import SupabaseClient
 from src.models.trade import Trade
 from src.utils.logger import logger
 
+# uvloop's event loop when it is installed (optional, not a dependency)
+try:
+    from uvloop import run as run_async
+except ImportError:
+    from asyncio import run as run_async
+
 
 async def test_trade_logging():
     """Test creating and logging a trade to database."""
@@ -27,14 +32,14 @@ async def test_trade_logging():
         alpaca_order_id="test_order_123",
     )
 
-    logger.info(f"Created test trade: {test_trade.action} {test_trade.quantity} {test_trade.ticker}")
+    logger.info("Created test trade: %s %s %s", test_trade.action, test_trade.quantity, test_trade.ticker)
 
     # Log to database
     try:
         result = await SupabaseClient.log_trade(test_trade)
-        logger.info(f"Trade logged successfully: {result}")
+        logger.info("Trade logged successfully: %s", result)
     except Exception as e:
-        logger.error(f"Failed to log trade: {e}")
+        logger.error("Failed to log trade: %s", e)
         raise
 
     # Verify it was saved
@@ -48,22 +53,22 @@ async def test_trade_logging():
         if trades:
             latest_trade = trades[0]
             logger.info("Found trade in database:")
-            logger.info(f"  Date: {latest_trade.get('date')}")
-            logger.info(f"  Ticker: {latest_trade.get('ticker')}")
-            logger.info(f"  Action: {latest_trade.get('action')}")
-            logger.info(f"  Quantity: {latest_trade.get('quantity')}")
-            logger.info(f"  Entry Price: ${latest_trade.get('entry_price')}")
-            logger.info(f"  Strategy: {latest_trade.get('strategy')}")
+            logger.info("  Date: %s", latest_trade.get("date"))
+            logger.info("  Ticker: %s", latest_trade.get("ticker"))
+            logger.info("  Action: %s", latest_trade.get("action"))
+            logger.info("  Quantity: %s", latest_trade.get("quantity"))
+            logger.info("  Entry Price: $%s", latest_trade.get("entry_price"))
+            logger.info("  Strategy: %s", latest_trade.get("strategy"))
             logger.info("OK Trade logging works!")
         else:
             logger.error("Trade not found in database!")
 
     except Exception as e:
-        logger.error(f"Failed to query trades: {e}")
+        logger.error("Failed to query trades: %s", e)
         raise
 
     logger.info("\n=== Trade Logging Test Completed ===")
 
 
 if __name__ == "__main__":
-    asyncio.run(test_trade_logging())
+    run_async(test_trade_logging())
@@ -4,6 +4,7 @@ Provides reusable fixtures for all test modules.
 Configures async testing and test environment.
 """
 
+import functools
 import os
 
 # Set test environment variables BEFORE any module imports
@@ -21,6 +22,7 @@ from decimal import Decimal
 from datetime import datetime, date
 from unittest.mock import AsyncMock, MagicMock
 
+from src.core.indicators import calculate_ema, calculate_macd, calculate_rsi, calculate_sma
 from src.models.portfolio import Portfolio, Position
 from src.models.trade import Signal, Trade
 from src.models.performance import DailyPerformance, StrategyMetrics
@@ -29,6 +31,22 @@ from src.models.performance import DailyPerformance, StrategyMetrics
 # Configure pytest-asyncio
 pytest_plugins = ("pytest_asyncio",)
 
+# Daily timestamps shared by every bar fixture (DatetimeIndex is immutable)
+_DATES_30D = pd.date_range(start="2024-01-01", periods=30, freq="D")
+
+# Decimal amounts shared by the fixtures below (immutable, so parsed once)
+_D5 = Decimal("5")
+_D10 = Decimal("10")
+_D50 = Decimal("50.00")
+_D150 = Decimal("150.00")
+_D200 = Decimal("200.00")
+_D300 = Decimal("300.00")
+_D500 = Decimal("500.00")
+_D1000 = Decimal("1000.00")
+_D5000 = Decimal("5000.00")
+_D10000 = Decimal("10000.00")
+_D50000 = Decimal("50000.00")
+
 
 @pytest.fixture
 def sample_portfolio():
@@ -38,10 +56,10 @@ def sample_portfolio():
         Portfolio with $10,000 total value, $5,000 cash
     """
     return Portfolio(
-        portfolio_value=Decimal("10000.00"),
-        cash=Decimal("5000.00"),
-        buying_power=Decimal("5000.00"),
-        equity=Decimal("5000.00"),
+        portfolio_value=_D10000,
+        cash=_D5000,
+        buying_power=_D5000,
+        equity=_D5000,
     )
 
 
@@ -53,10 +71,10 @@ def small_portfolio():
         Portfolio with $1,000 total value, $500 cash
     """
     return Portfolio(
-        portfolio_value=Decimal("1000.00"),
-        cash=Decimal("500.00"),
-        buying_power=Decimal("500.00"),
-        equity=Decimal("500.00"),
+        portfolio_value=_D1000,
+        cash=_D500,
+        buying_power=_D500,
+        equity=_D500,
     )
 
 
@@ -69,9 +87,9 @@ def large_portfolio():
     """
     return Portfolio(
         portfolio_value=Decimal("100000.00"),
-        cash=Decimal("50000.00"),
-        buying_power=Decimal("50000.00"),
-        equity=Decimal("50000.00"),
+        cash=_D50000,
+        buying_power=_D50000,
+        equity=_D50000,
     )
 
 
@@ -84,12 +102,9 @@ def sample_position():
     """
     return Position(
         symbol="AAPL",
-        quantity=Decimal("10"),
-        avg_entry_price=Decimal("150.00"),
+        quantity=_D10,
+        avg_entry_price=_D150,
         current_price=Decimal("155.00"),
-        market_value=Decimal("1550.00"),
-        unrealized_pnl=Decimal("50.00"),
-        unrealized_pnl_pct=Decimal("0.0333"),
     )
 
 
@@ -104,29 +119,20 @@ def defensive_positions():
         Position(
             symbol="VTI",
             quantity=Decimal("12.5"),
-            avg_entry_price=Decimal("200.00"),
-            current_price=Decimal("200.00"),
-            market_value=Decimal("2500.00"),  # 25% of $10k
-            unrealized_pnl=Decimal("0.00"),
-            unrealized_pnl_pct=Decimal("0.00"),
+            avg_entry_price=_D200,
+            current_price=_D200,  # Market value 25% of $10k
         ),
         Position(
             symbol="VGK",
             quantity=Decimal("30"),
-            avg_entry_price=Decimal("50.00"),
-            current_price=Decimal("50.00"),
-            market_value=Decimal("1500.00"),  # 15% of $10k
-            unrealized_pnl=Decimal("0.00"),
-            unrealized_pnl_pct=Decimal("0.00"),
+            avg_entry_price=_D50,
+            current_price=_D50,  # Market value 15% of $10k
         ),
         Position(
             symbol="GLD",
-            quantity=Decimal("5"),
-            avg_entry_price=Decimal("200.00"),
-            current_price=Decimal("200.00"),
-            market_value=Decimal("1000.00"),  # 10% of $10k
-            unrealized_pnl=Decimal("0.00"),
-            unrealized_pnl_pct=Decimal("0.00"),
+            quantity=_D5,
+            avg_entry_price=_D200,
+            current_price=_D200,  # Market value 10% of $10k
         ),
     ]
 
@@ -141,21 +147,15 @@ def momentum_positions():
     return [
         Position(
             symbol="NVDA",
-            quantity=Decimal("5"),
-            avg_entry_price=Decimal("500.00"),
+            quantity=_D5,
+            avg_entry_price=_D500,
             current_price=Decimal("520.00"),
-            market_value=Decimal("2600.00"),
-            unrealized_pnl=Decimal("100.00"),
-            unrealized_pnl_pct=Decimal("0.04"),
         ),
         Position(
             symbol="TSLA",
-            quantity=Decimal("10"),
-            avg_entry_price=Decimal("200.00"),
+            quantity=_D10,
+            avg_entry_price=_D200,
             current_price=Decimal("210.00"),
-            market_value=Decimal("2100.00"),
-            unrealized_pnl=Decimal("100.00"),
-            unrealized_pnl_pct=Decimal("0.05"),
         ),
     ]
 
@@ -170,7 +170,7 @@ def sample_signal():
     return Signal(
         ticker="AAPL",
         action="BUY",
-        entry_price=Decimal("150.00"),
+        entry_price=_D150,
         stop_loss=Decimal("142.50"),  # -5%
         take_profit=Decimal("172.50"),  # +15%
         confidence=Decimal("0.75"),
@@ -191,7 +191,7 @@ def high_confidence_signal():
     return Signal(
         ticker="NVDA",
         action="BUY",
-        entry_price=Decimal("500.00"),
+        entry_price=_D500,
         stop_loss=Decimal("475.00"),
         take_profit=Decimal("575.00"),
         confidence=Decimal("0.90"),
@@ -210,111 +210,234 @@ def sample_trade():
         date=datetime.now(),
         ticker="META",
         action="BUY",
-        quantity=Decimal("10"),
-        entry_price=Decimal("300.00"),
+        quantity=_D10,
+        entry_price=_D300,
         exit_price=Decimal("330.00"),
-        pnl=Decimal("300.00"),
+        pnl=_D300,
         pnl_pct=Decimal("0.10"),
         strategy="momentum",
         exit_reason="take_profit",
     )
 
 
-@pytest.fixture
-def sample_bars():
-    """Create sample OHLCV bars data.
+@functools.lru_cache(maxsize=None)
+def _random_walk_columns(
+    seed: int,
+    close_step: float,
+    open_noise: float,
+    range_noise: float,
+    volume_range: tuple[int, int],
+    periods: int,
+) -> dict[str, np.ndarray]:
+    """Generate random-walk OHLCV columns from a single noise matrix.
 
-    Returns:
-        DataFrame with 30 days of realistic price data
+    Cached per argument set, so each test module's fixture reuses the same
+    read-only arrays instead of redrawing them.
     """
-    np.random.seed(42)
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((periods, 4))
+
+    close_prices = 100 + np.cumsum(noise[:, 0] * close_step)
+    columns = {
+        "open": close_prices + noise[:, 1] * open_noise,
+        "high": close_prices + np.abs(noise[:, 2]) * range_noise,
+        "low": close_prices - np.abs(noise[:, 3]) * range_noise,
+        "close": close_prices,
+        "volume": rng.integers(*volume_range, periods),
+    }
+    for values in columns.values():
+        values.flags.writeable = False
+    return columns
+
+
+def _random_walk_bars(
+    seed: int,
+    close_step: float,
+    open_noise: float,
+    range_noise: float,
+    volume_range: tuple[int, int],
+) -> pd.DataFrame:
+    """Build random-walk OHLCV bars.
+
+    Args:
+        seed: Seed for the generator
+        close_step: Scale of the daily close-to-close move
+        open_noise: Scale of the open's offset from the close
+        range_noise: Scale of high/low distance from the close
+        volume_range: Half-open [low, high) range for daily volume
 
-    # Generate realistic price movement
-    close_prices = 100 + np.cumsum(np.random.randn(30) * 2)
+    Returns:
+        DataFrame with timestamp, open, high, low, close, volume columns
+    """
+    columns = _random_walk_columns(
+        seed, close_step, open_noise, range_noise, volume_range, len(_DATES_30D)
+    )
 
     return pd.DataFrame(
         {
-            "timestamp": dates,
-            "open": close_prices + np.random.randn(30) * 0.5,
-            "high": close_prices + np.abs(np.random.randn(30) * 1.5),
-            "low": close_prices - np.abs(np.random.randn(30) * 1.5),
-            "close": close_prices,
-            "volume": np.random.randint(1000000, 5000000, 30),
+            "timestamp": _DATES_30D,
+            **columns,
         }
     )
 
 
-@pytest.fixture
-def trending_up_bars():
-    """Create uptrending price data.
-
-    Returns:
-        DataFrame with steady uptrend (bullish)
-    """
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
-    close_prices = np.linspace(100, 130, 30)  # +30% over 30 days
+def _trend_bars(start: float, end: float, volume_range: tuple[int, int], seed: int = 0) -> pd.DataFrame:
+    """Build a straight-line trend of OHLCV bars with a $1 high/low band."""
+    rng = np.random.default_rng(seed)
+    periods = len(_DATES_30D)
+    close_prices = np.linspace(start, end, periods)
 
     return pd.DataFrame(
         {
-            "timestamp": dates,
+            "timestamp": _DATES_30D,
             "open": close_prices,
             "high": close_prices + 1,
             "low": close_prices - 1,
             "close": close_prices,
-            "volume": np.random.randint(2000000, 4000000, 30),
+            "volume": rng.integers(*volume_range, periods),
         }
     )
 
 
-@pytest.fixture
+# Bar and metrics fixtures are read-only inputs, so they are built once per
+# test module instead of per test. Copy before mutating in a test.
+@pytest.fixture(scope="module")
+def sample_bars():
+    """Create sample OHLCV bars data.
+
+    Returns:
+        DataFrame with 30 days of realistic price data
+    """
+    return _random_walk_bars(
+        seed=42, close_step=2, open_noise=0.5, range_noise=1.5, volume_range=(1000000, 5000000)
+    )
+
+
+@pytest.fixture(scope="module")
+def trending_up_bars():
+    """Create uptrending price data.
+
+    Returns:
+        DataFrame with steady uptrend (bullish)
+    """
+    return _trend_bars(100, 130, volume_range=(2000000, 4000000))  # +30% over 30 days
+
+
+@pytest.fixture(scope="module")
 def trending_down_bars():
     """Create downtrending price data.
 
     Returns:
         DataFrame with steady downtrend (bearish)
     """
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
-    close_prices = np.linspace(100, 70, 30)  # -30% over 30 days
-
-    return pd.DataFrame(
-        {
-            "timestamp": dates,
-            "open": close_prices,
-            "high": close_prices + 1,
-            "low": close_prices - 1,
-            "close": close_prices,
-            "volume": np.random.randint(1000000, 3000000, 30),
-        }
-    )
+    return _trend_bars(100, 70, volume_range=(1000000, 3000000))  # -30% over 30 days
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def volatile_bars():
     """Create highly volatile price data.
 
     Returns:
         DataFrame with high volatility
     """
-    np.random.seed(123)
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
+    return _random_walk_bars(
+        seed=123, close_step=5, open_noise=3, range_noise=8, volume_range=(5000000, 10000000)
+    )
+
 
-    # High volatility
-    close_prices = 100 + np.cumsum(np.random.randn(30) * 5)
+# Linear uptrend ending on a volume surge, the canonical momentum BUY setup
+_BULLISH_CLOSE = np.linspace(100, 120, 30)
+_BULLISH_VOLUME = np.full(30, 2_000_000, dtype=np.int64)
+_BULLISH_VOLUME[-1] = 3_000_000
+_BULLISH_CLOSE.flags.writeable = False
+_BULLISH_VOLUME.flags.writeable = False
 
+
+@pytest.fixture(scope="module")
+def bullish_bars():
+    """Create bullish momentum bars (uptrend with a last-day volume surge).
+
+    Returns:
+        DataFrame with 30 days of steadily rising prices
+    """
     return pd.DataFrame(
         {
-            "timestamp": dates,
-            "open": close_prices + np.random.randn(30) * 3,
-            "high": close_prices + np.abs(np.random.randn(30) * 8),
-            "low": close_prices - np.abs(np.random.randn(30) * 8),
-            "close": close_prices,
-            "volume": np.random.randint(5000000, 10000000, 30),
+            "timestamp": _DATES_30D,
+            "open": _BULLISH_CLOSE,
+            "high": _BULLISH_CLOSE + 1,
+            "low": _BULLISH_CLOSE - 1,
+            "close": _BULLISH_CLOSE,
+            "volume": _BULLISH_VOLUME,
         }
     )
 
 
-@pytest.fixture
+# Indicator inputs: indicators never modify the frame, so one instance serves
+# every test in the session (test_indicators and test_integration alike).
+@pytest.fixture(scope="session")
+def sample_price_data():
+    """Create sample price data for testing indicators.
+
+    Returns:
+        DataFrame with OHLCV data (30 days)
+    """
+    # Same seeded series as sample_bars, so the generated columns are shared
+    return _random_walk_bars(
+        seed=42, close_step=2, open_noise=0.5, range_noise=1.5, volume_range=(1000000, 5000000)
+    )
+
+
+@pytest.fixture(scope="session")
+def trending_up_data():
+    """Create uptrending price data for testing bullish indicators."""
+    return _trend_bars(100, 130, volume_range=(2000000, 4000000))  # Steady uptrend
+
+
+def _memoized_indicator(calculate, frames: dict[str, pd.DataFrame]):
+    """Wrap an indicator so each (frame name, parameters) result is computed once."""
+
+    @functools.lru_cache(maxsize=None)
+    def _cached(frame: str, *args):
+        return calculate(frames[frame], *args)
+
+    return _cached
+
+
+@pytest.fixture(scope="session")
+def indicator_frames(sample_price_data, trending_up_data):
+    """Name the shared indicator inputs so indicator results can be cached by key.
+
+    Returns:
+        Dict mapping "sample" and "trending_up" to their DataFrames
+    """
+    return {"sample": sample_price_data, "trending_up": trending_up_data}
+
+
+@pytest.fixture(scope="session")
+def rsi_of(indicator_frames):
+    """Cached RSI: ``rsi_of("sample", 14)``. Results are shared - do not mutate."""
+    return _memoized_indicator(calculate_rsi, indicator_frames)
+
+
+@pytest.fixture(scope="session")
+def macd_of(indicator_frames):
+    """Cached MACD: ``macd_of("sample")`` returns (macd, signal, histogram)."""
+    return _memoized_indicator(calculate_macd, indicator_frames)
+
+
+@pytest.fixture(scope="session")
+def sma_of(indicator_frames):
+    """Cached SMA: ``sma_of("sample", 20)``."""
+    return _memoized_indicator(calculate_sma, indicator_frames)
+
+
+@pytest.fixture(scope="session")
+def ema_of(indicator_frames):
+    """Cached EMA: ``ema_of("sample", 12)``."""
+    return _memoized_indicator(calculate_ema, indicator_frames)
+
+
+@pytest.fixture(scope="module")
 def sample_daily_performance():
     """Create sample daily performance metrics.
 
@@ -329,12 +452,12 @@ def sample_daily_performance():
         win_rate=Decimal("0.70"),
         daily_pnl=Decimal("250.00"),
         profit_factor=Decimal("2.5"),
-        avg_win=Decimal("50.00"),
+        avg_win=_D50,
         avg_loss=Decimal("-20.00"),
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_strategy_metrics():
     """Create sample strategy metrics.
 
@@ -346,25 +469,61 @@ def sample_strategy_metrics():
         date=date.today(),
         total_trades=5,
         win_rate=Decimal("0.60"),
-        total_pnl=Decimal("150.00"),
+        total_pnl=_D150,
     )
 
 
+# Flat bars returned by the mock Alpaca client, built once at import
+_MOCK_BARS = pd.DataFrame(
+    {
+        "timestamp": _DATES_30D,
+        "open": [100.0] * 30,
+        "high": [105.0] * 30,
+        "low": [95.0] * 30,
+        "close": [102.0] * 30,
+        "volume": [1000000] * 30,
+    }
+)
+
+
+class _AsyncReturn:
+    """Lightweight async method stub.
+
+    Awaiting a call returns ``return_value``, like ``AsyncMock``, but without
+    recording calls. Tests can still override ``return_value`` per case.
+    """
+
+    def __init__(self, return_value=None):
+        self.return_value = return_value
+
+    async def __call__(self, *args, **kwargs):
+        return self.return_value
+
+
 @pytest_asyncio.fixture
 async def mock_alpaca_client():
     """Create mock Alpaca MCP client.
 
     Returns:
-        AsyncMock Alpaca client with common methods
+        MagicMock Alpaca client whose common methods are awaitable stubs
     """
-    mock_client = AsyncMock()
+    mock_client = MagicMock()
+    for method in (
+        "get_account",
+        "get_positions",
+        "submit_market_order",
+        "close_position",
+        "get_bars",
+        "get_latest_quote",
+    ):
+        setattr(mock_client, method, _AsyncReturn())
 
     # Default return values
     mock_client.get_account.return_value = Portfolio(
-        portfolio_value=Decimal("10000.00"),
-        cash=Decimal("5000.00"),
-        buying_power=Decimal("5000.00"),
-        equity=Decimal("5000.00"),
+        portfolio_value=_D10000,
+        cash=_D5000,
+        buying_power=_D5000,
+        equity=_D5000,
     )
 
     mock_client.get_positions.return_value = []
@@ -373,16 +532,8 @@ async def mock_alpaca_client():
 
     mock_client.close_position.return_value = True
 
-    mock_client.get_bars.return_value = pd.DataFrame(
-        {
-            "timestamp": pd.date_range(start="2024-01-01", periods=30, freq="D"),
-            "open": [100.0] * 30,
-            "high": [105.0] * 30,
-            "low": [95.0] * 30,
-            "close": [102.0] * 30,
-            "volume": [1000000] * 30,
-        }
-    )
+    # Shallow copy: cheap, and copy-on-write keeps edits off the shared frame
+    mock_client.get_bars.return_value = _MOCK_BARS.copy(deep=False)
 
     mock_client.get_latest_quote.return_value = {
         "symbol": "AAPL",
@@ -419,22 +570,70 @@ async def mock_supabase_client():
     return mock_client
 
 
+def _fake_supabase_client() -> MagicMock:
+    """Build an in-memory stand-in for the Supabase client.
+
+    Every query-builder method returns the same query object, so any
+    ``table(...)....execute()`` or ``rpc(...).execute()`` chain resolves to an
+    empty result without touching the network.
+    """
+    client = MagicMock(name="supabase")
+    query = MagicMock(name="supabase_query")
+
+    for method in (
+        "select", "insert", "upsert", "update", "delete",
+        "eq", "neq", "gt", "gte", "lt", "lte", "in_",
+        "order", "limit", "range", "single",
+    ):
+        getattr(query, method).return_value = query
+    query.execute = AsyncMock(return_value=MagicMock(data=[], count=0))
+
+    client.table.return_value = query
+    client.rpc.return_value = query
+    return client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def supabase_singleton():
+    """Seed the SupabaseClient singleton with an in-memory fake for the session.
+
+    Code under test that calls ``SupabaseClient.get_instance()`` without
+    patching it gets the fake instead of creating a real client. Tests that
+    need specific responses should keep patching ``get_instance`` (e.g. with
+    ``mock_supabase_client``).
+
+    Returns:
+        Fake Supabase client shared by the whole session
+    """
+    from src.database.supabase_client import SupabaseClient
+
+    if os.environ.get("ENVIRONMENT") != "test":
+        yield None
+        return
+
+    original = SupabaseClient._instance
+    SupabaseClient._instance = _fake_supabase_client()
+
+    yield SupabaseClient._instance
+
+    SupabaseClient._instance = original
+
+
 @pytest.fixture(autouse=True)
 def reset_strategy_params():
     """Reset strategy parameters after each test.
 
     Ensures tests don't affect each other through global state.
     """
-    from src.strategies.momentum_trading import STRATEGY_PARAMS
+    from src.strategies import momentum_trading
 
-    # Store original values
-    original_params = STRATEGY_PARAMS.copy()
+    # Store original values (StrategyParams is immutable, so keeping the instance is enough)
+    original_params = momentum_trading._params
 
     yield
 
     # Restore after test
-    STRATEGY_PARAMS.clear()
-    STRATEGY_PARAMS.update(original_params)
+    momentum_trading._params = original_params
 
 
 @pytest.fixture
@@ -472,9 +671,12 @@ def pytest_configure(config):
 
 def pytest_collection_modifyitems(config, items):
     """Automatically mark tests based on their location."""
+    integration_marker = pytest.mark.integration
+    unit_marker = pytest.mark.unit
+
     for item in items:
-        # Mark integration tests
-        if "test_integration" in item.nodeid:
-            item.add_marker(pytest.mark.integration)
+        # Mark integration tests (by module file name, not a full nodeid scan)
+        if item.path.name.startswith("test_integration"):
+            item.add_marker(integration_marker)
         else:
-            item.add_marker(pytest.mark.unit)
+            item.add_marker(unit_marker)
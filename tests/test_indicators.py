@@ -13,64 +13,16 @@ from src.core.indicators import (
     calculate_rsi,
     calculate_macd,
     calculate_sma,
-    calculate_ema,
     calculate_volume_ratio,
 )
 
 
-@pytest.fixture
-def sample_price_data():
-    """Create sample price data for testing indicators.
-
-    Returns:
-        DataFrame with OHLCV data (30 days)
-    """
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
-
-    # Generate realistic price movement
-    np.random.seed(42)
-    close_prices = 100 + np.cumsum(np.random.randn(30) * 2)
-
-    df = pd.DataFrame(
-        {
-            "timestamp": dates,
-            "open": close_prices + np.random.randn(30) * 0.5,
-            "high": close_prices + np.abs(np.random.randn(30) * 1.5),
-            "low": close_prices - np.abs(np.random.randn(30) * 1.5),
-            "close": close_prices,
-            "volume": np.random.randint(1000000, 5000000, 30),
-        }
-    )
-
-    return df
-
-
-@pytest.fixture
-def trending_up_data():
-    """Create uptrending price data for testing bullish indicators."""
-    dates = pd.date_range(start="2024-01-01", periods=30, freq="D")
-    close_prices = np.linspace(100, 130, 30)  # Steady uptrend
-
-    df = pd.DataFrame(
-        {
-            "timestamp": dates,
-            "open": close_prices,
-            "high": close_prices + 1,
-            "low": close_prices - 1,
-            "close": close_prices,
-            "volume": np.random.randint(2000000, 4000000, 30),
-        }
-    )
-
-    return df
-
-
 class TestRSI:
     """Test cases for RSI (Relative Strength Index) calculation."""
 
-    def test_rsi_calculation_valid(self, sample_price_data):
+    def test_rsi_calculation_valid(self, rsi_of):
         """Test RSI calculation with valid data."""
-        rsi = calculate_rsi(sample_price_data, period=14)
+        rsi = rsi_of("sample", 14)
 
         # RSI should be between 0 and 100
         assert rsi.min() >= 0
@@ -79,25 +31,29 @@ class TestRSI:
         # RSI should have values after warmup period
         assert not rsi.iloc[-1] == np.nan
 
-    def test_rsi_trending_up(self, trending_up_data):
+    def test_rsi_trending_up(self, rsi_of):
         """Test RSI with uptrending data (should be > 50)."""
-        rsi = calculate_rsi(trending_up_data, period=14)
+        rsi = rsi_of("trending_up", 14)
 
         # Uptrend should have RSI > 50
         latest_rsi = rsi.iloc[-1]
         assert latest_rsi > 50, f"RSI for uptrend should be > 50, got {latest_rsi}"
 
-    def test_rsi_custom_period(self, sample_price_data):
+    @pytest.mark.parametrize("period,expected_min_valid", [(7, 23), (21, 9)])
+    def test_rsi_custom_period(self, rsi_of, sample_price_data, period, expected_min_valid):
         """Test RSI with custom period."""
-        rsi_7 = calculate_rsi(sample_price_data, period=7)
-        rsi_21 = calculate_rsi(sample_price_data, period=21)
+        rsi = rsi_of("sample", period)
+
+        # Should return a valid series with values once the window is filled
+        assert len(rsi) == len(sample_price_data)
+        assert rsi.count() >= expected_min_valid
 
-        # Both should return valid series
-        assert len(rsi_7) == len(sample_price_data)
-        assert len(rsi_21) == len(sample_price_data)
+    def test_rsi_shorter_period_more_values(self, rsi_of):
+        """Test that a shorter RSI period yields more non-NaN values."""
+        rsi_7 = rsi_of("sample", 7)
+        rsi_21 = rsi_of("sample", 21)
 
-        # Shorter period should have more non-NaN values
-        assert rsi_7.notna().sum() >= rsi_21.notna().sum()
+        assert rsi_7.count() >= rsi_21.count()
 
     def test_rsi_insufficient_data(self):
         """Test RSI with insufficient data (edge case)."""
@@ -108,15 +64,15 @@ class TestRSI:
 
         # Should return series with NaN values
         assert len(rsi) == 5
-        assert rsi.isna().all()  # Not enough data for 14-period RSI
+        assert rsi.count() == 0  # Not enough data for 14-period RSI
 
 
 class TestMACD:
     """Test cases for MACD (Moving Average Convergence Divergence) calculation."""
 
-    def test_macd_calculation_valid(self, sample_price_data):
+    def test_macd_calculation_valid(self, macd_of, sample_price_data):
         """Test MACD calculation with valid data."""
-        macd, signal, histogram = calculate_macd(sample_price_data)
+        macd, signal, histogram = macd_of("sample")
 
         # All should be pandas Series
         assert isinstance(macd, pd.Series)
@@ -126,23 +82,25 @@ class TestMACD:
         # Same length as input
         assert len(macd) == len(sample_price_data)
 
-    def test_macd_histogram_calculation(self, sample_price_data):
+    def test_macd_histogram_calculation(self, macd_of):
         """Test that MACD histogram = MACD - Signal."""
-        macd, signal, histogram = calculate_macd(sample_price_data)
+        macd, signal, histogram = macd_of("sample")
 
         # Remove NaN values
-        valid_idx = ~(macd.isna() | signal.isna() | histogram.isna())
+        valid_idx = pd.concat([macd, signal, histogram], axis=1).notna().all(axis=1).to_numpy()
 
         # Histogram should equal MACD - Signal
-        expected_histogram = macd[valid_idx] - signal[valid_idx]
-        actual_histogram = histogram[valid_idx]
+        expected_histogram = macd.to_numpy()[valid_idx] - signal.to_numpy()[valid_idx]
+        actual_histogram = histogram.to_numpy()[valid_idx]
 
-        # Allow small floating point differences
-        assert np.allclose(expected_histogram, actual_histogram, rtol=1e-5)
+        # Allow small floating point differences (initial=0.0 covers an empty
+        # selection, e.g. when 30 days is too short to fill the signal line)
+        max_diff = np.abs(expected_histogram - actual_histogram).max(initial=0.0)
+        assert float(max_diff) < 1e-5
 
-    def test_macd_uptrend_positive_histogram(self, trending_up_data):
+    def test_macd_uptrend_positive_histogram(self, macd_of):
         """Test MACD with uptrending data (histogram should turn positive)."""
-        macd, signal, histogram = calculate_macd(trending_up_data)
+        macd, signal, histogram = macd_of("trending_up")
 
         # MACD needs warmup period (26 + 9 = 35 days)
         # Skip test if not enough valid data
@@ -167,28 +125,38 @@ class TestMACD:
 class TestSMA:
     """Test cases for SMA (Simple Moving Average) calculation."""
 
-    def test_sma_calculation_valid(self, sample_price_data):
+    def test_sma_calculation_valid(self, sma_of, sample_price_data):
         """Test SMA calculation with valid data."""
-        sma20 = calculate_sma(sample_price_data, period=20)
+        sma20 = sma_of("sample", 20)
 
         # Should return pandas Series
         assert isinstance(sma20, pd.Series)
         assert len(sma20) == len(sample_price_data)
 
         # Should have non-NaN values after warmup
-        assert sma20.notna().sum() >= 10
+        assert sma20.count() >= 10
 
-    def test_sma_different_periods(self, sample_price_data):
+    @pytest.mark.parametrize("period,expected_min_valid", [(10, 20), (20, 10)])
+    def test_sma_different_periods(self, sma_of, sample_price_data, period, expected_min_valid):
         """Test SMA with different periods."""
-        sma10 = calculate_sma(sample_price_data, period=10)
-        sma20 = calculate_sma(sample_price_data, period=20)
-        sma50 = calculate_sma(sample_price_data, period=50)
+        sma = sma_of("sample", period)
+
+        assert len(sma) == len(sample_price_data)
+        assert sma.count() >= expected_min_valid
+
+    def test_sma_shorter_period_more_values(self, sma_of):
+        """Test that a shorter SMA period yields more non-NaN values."""
+        sma10 = sma_of("sample", 10)
+        sma20 = sma_of("sample", 20)
+
+        assert sma10.count() >= sma20.count()
 
-        # Shorter period should have more valid values
-        assert sma10.notna().sum() >= sma20.notna().sum()
+    def test_sma_period_longer_than_data(self, sma_of):
+        """Test SMA with a period longer than the data (edge case)."""
+        sma50 = sma_of("sample", 50)
 
         # 50-period SMA should have mostly NaN (only 30 days of data)
-        assert sma50.isna().sum() >= 20
+        assert len(sma50) - sma50.count() >= 20
 
     def test_sma_manual_calculation(self):
         """Test SMA against manual calculation."""
@@ -210,26 +178,26 @@ class TestSMA:
 class TestEMA:
     """Test cases for EMA (Exponential Moving Average) calculation."""
 
-    def test_ema_calculation_valid(self, sample_price_data):
+    def test_ema_calculation_valid(self, ema_of, sample_price_data):
         """Test EMA calculation with valid data."""
-        ema12 = calculate_ema(sample_price_data, period=12)
+        ema12 = ema_of("sample", 12)
 
         # Should return pandas Series
         assert isinstance(ema12, pd.Series)
         assert len(ema12) == len(sample_price_data)
 
-    def test_ema_reacts_faster_than_sma(self, trending_up_data):
+    def test_ema_reacts_faster_than_sma(self, sma_of, ema_of):
         """Test that EMA reacts faster to price changes than SMA."""
-        sma20 = calculate_sma(trending_up_data, period=20)
-        ema20 = calculate_ema(trending_up_data, period=20)
+        sma20 = sma_of("trending_up", 20)
+        ema20 = ema_of("trending_up", 20)
 
         # In uptrend, EMA should be higher than SMA (reacts faster)
-        valid_idx = ~(sma20.isna() | ema20.isna())
+        valid_idx = pd.concat([sma20, ema20], axis=1).notna().all(axis=1).to_numpy()
 
-        if valid_idx.sum() > 0:
+        if valid_idx.any():
             # EMA should generally be >= SMA in uptrend
-            latest_sma = sma20[valid_idx].iloc[-1]
-            latest_ema = ema20[valid_idx].iloc[-1]
+            latest_sma = sma20.to_numpy()[valid_idx][-1]
+            latest_ema = ema20.to_numpy()[valid_idx][-1]
 
             assert latest_ema >= latest_sma * 0.95  # Allow 5% variance
 
@@ -251,9 +219,9 @@ class TestVolumeRatio:
 
     def test_volume_ratio_high_volume_day(self):
         """Test volume ratio with a high volume day."""
-        df = pd.DataFrame(
-            {"volume": [1000000] * 10 + [5000000] + [1000000] * 19}  # Spike on day 11
-        )
+        volume = np.full(30, 1_000_000, dtype=np.int64)
+        volume[10] = 5_000_000  # Spike on day 11
+        df = pd.DataFrame({"volume": volume})
 
         volume_ratio = calculate_volume_ratio(df, period=10)
 
@@ -267,7 +235,7 @@ class TestVolumeRatio:
 
     def test_volume_ratio_constant_volume(self):
         """Test volume ratio with constant volume (should be ~1.0)."""
-        df = pd.DataFrame({"volume": [1000000] * 30})  # Constant volume
+        df = pd.DataFrame({"volume": np.full(30, 1_000_000, dtype=np.int64)})  # Constant volume
 
         volume_ratio = calculate_volume_ratio(df, period=20)
 
@@ -275,7 +243,7 @@ class TestVolumeRatio:
         valid_ratios = volume_ratio[~volume_ratio.isna()]
 
         if len(valid_ratios) > 0:
-            assert np.allclose(valid_ratios, 1.0, rtol=0.01)
+            assert float(np.abs(valid_ratios.to_numpy() - 1.0).max()) < 0.01
 
     def test_volume_ratio_insufficient_data(self):
         """Test volume ratio with insufficient data (edge case)."""
@@ -284,7 +252,7 @@ class TestVolumeRatio:
         volume_ratio = calculate_volume_ratio(df, period=20)
 
         # Should return series with mostly NaN
-        assert volume_ratio.isna().sum() >= 2
+        assert len(volume_ratio) - volume_ratio.count() >= 2
 
 
 class TestIndicatorEdgeCases:
@@ -9,7 +9,6 @@ from decimal import Decimal
 from datetime import datetime, date
 from unittest.mock import AsyncMock, patch
 import pandas as pd
-import numpy as np
 
 from src.main import daily_trading_loop
 from src.strategies.defensive_core import should_rebalance, calculate_rebalancing_orders
@@ -18,6 +17,49 @@ from src.core.risk_manager import filter_signals_by_risk, calculate_position_siz
 from src.models.portfolio import Portfolio, Position
 from src.models.trade import Signal
 
+# Shared Decimal/symbol constants for the comprehension-built positions and
+# signals below (Decimal is immutable, so one instance per value is enough).
+_D10 = Decimal("10")
+_D010 = Decimal("0.10")
+_D075 = Decimal("0.75")
+_D085 = Decimal("0.85")
+_D100 = Decimal("100.00")
+_D105 = Decimal("105.00")
+_D150 = Decimal("150.00")
+_D350 = Decimal("350.00")
+_STOCK_SYMS = [f"STOCK{i}" for i in range(5)]
+
+
+class _FakeAlpaca:
+    """Minimal async stand-in for AlpacaMCPClient with canned responses.
+
+    Cheaper than ``AsyncMock`` for the daily-loop tests, which never assert
+    on call arguments.
+    """
+
+    def __init__(self, account: Portfolio, positions: list[Position], bars: pd.DataFrame):
+        self._account = account
+        self._positions = positions
+        self._bars = bars
+
+    async def get_account(self) -> Portfolio:
+        return self._account
+
+    async def get_positions(self) -> list[Position]:
+        return self._positions
+
+    async def get_bars(self, *args, **kwargs) -> pd.DataFrame:
+        return self._bars
+
+    async def get_latest_quote(self, *args, **kwargs) -> None:
+        return None
+
+    async def submit_market_order(self, *args, **kwargs) -> str:
+        return "order_123"
+
+    async def close_position(self, *args, **kwargs) -> bool:
+        return True
+
 
 @pytest.mark.integration
 class TestDefensiveRebalancingFlow:
@@ -34,10 +76,7 @@ class TestDefensiveRebalancingFlow:
                 symbol="VTI",
                 quantity=Decimal("10"),
                 avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("200.00"),
-                market_value=Decimal("2000.00"),  # 20% (target 25%)
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
+                current_price=Decimal("200.00"),  # Market value 20% (target 25%)
             ),
         ]
 
@@ -79,20 +118,11 @@ class TestMomentumTradingFlow:
     """Integration tests for momentum trading workflow."""
 
     @pytest.mark.asyncio
-    async def test_full_momentum_signal_to_order(self, sample_portfolio, mock_alpaca_client):
+    async def test_full_momentum_signal_to_order(
+        self, sample_portfolio, mock_alpaca_client, bullish_bars
+    ):
         """Test complete momentum flow: scan → filter → size → order."""
-        # Setup: Mock market data with bullish signals
-        bullish_bars = pd.DataFrame(
-            {
-                "timestamp": pd.date_range(start="2024-01-01", periods=30, freq="D"),
-                "open": np.linspace(100, 120, 30),
-                "high": np.linspace(101, 121, 30),
-                "low": np.linspace(99, 119, 30),
-                "close": np.linspace(100, 120, 30),  # Uptrend
-                "volume": [2000000] * 29 + [3000000],  # Volume surge
-            }
-        )
-
+        # Setup: Mock market data with bullish signals (uptrend + volume surge)
         mock_alpaca_client.get_bars.return_value = bullish_bars
 
         # 1. Scan for signals
@@ -109,51 +139,46 @@ class TestMomentumTradingFlow:
                 # Verify position size is reasonable
                 assert qty > 0
                 position_value = qty * signal.entry_price
-                assert position_value <= sample_portfolio.portfolio_value * Decimal("0.10")
+                assert position_value <= sample_portfolio.portfolio_value * _D010
 
     @pytest.mark.asyncio
-    async def test_momentum_exit_conditions_flow(self, mock_alpaca_client, momentum_positions):
+    @pytest.mark.parametrize(
+        "position,expected_reason",
+        [
+            # Big profit: +20% (take-profit at +15%)
+            (
+                Position(
+                    symbol="NVDA",
+                    quantity=Decimal("5"),
+                    avg_entry_price=Decimal("500.00"),
+                    current_price=Decimal("600.00"),
+                ),
+                "take_profit",
+            ),
+            # Loss: -10% (stop-loss at -5%)
+            (
+                Position(
+                    symbol="TSLA",
+                    quantity=Decimal("10"),
+                    avg_entry_price=Decimal("200.00"),
+                    current_price=Decimal("180.00"),
+                ),
+                "stop_loss",
+            ),
+        ],
+        ids=["take_profit", "stop_loss"],
+    )
+    async def test_momentum_exit_conditions_flow(
+        self, mock_alpaca_client, position, expected_reason
+    ):
         """Test momentum exit flow: position → check → close."""
-        # Test position with big profit (should trigger take-profit)
-        profitable_position = Position(
-            symbol="NVDA",
-            quantity=Decimal("5"),
-            avg_entry_price=Decimal("500.00"),
-            current_price=Decimal("600.00"),  # +20% (take-profit at +15%)
-            market_value=Decimal("3000.00"),
-            unrealized_pnl=Decimal("500.00"),
-            unrealized_pnl_pct=Decimal("0.20"),
-        )
-
-        mock_alpaca_client.get_latest_quote.return_value = {"price": 600.00}
-        mock_alpaca_client.get_bars.return_value = pd.DataFrame()
-
-        # Check exit conditions
-        should_exit, reason = await check_exit_conditions(profitable_position, mock_alpaca_client)
-
-        assert should_exit is True
-        assert reason == "take_profit"
-
-    @pytest.mark.asyncio
-    async def test_momentum_stop_loss_triggered(self, mock_alpaca_client):
-        """Test stop-loss exit flow."""
-        losing_position = Position(
-            symbol="TSLA",
-            quantity=Decimal("10"),
-            avg_entry_price=Decimal("200.00"),
-            current_price=Decimal("180.00"),  # -10% (stop-loss at -5%)
-            market_value=Decimal("1800.00"),
-            unrealized_pnl=Decimal("-200.00"),
-            unrealized_pnl_pct=Decimal("-0.10"),
-        )
-
-        mock_alpaca_client.get_latest_quote.return_value = {"price": 180.00}
+        mock_alpaca_client.get_latest_quote.return_value = {"price": float(position.current_price)}
         mock_alpaca_client.get_bars.return_value = pd.DataFrame()
 
-        should_exit, reason = await check_exit_conditions(losing_position, mock_alpaca_client)
+        should_exit, reason = await check_exit_conditions(position, mock_alpaca_client)
 
         assert should_exit is True
-        assert reason == "stop_loss"
+        assert reason == expected_reason
 
 
 @pytest.mark.integration
@@ -165,15 +190,12 @@ class TestRiskManagementFlow:
         # Create 5 positions (at max)
         max_positions = [
             Position(
-                symbol=f"STOCK{i}",
-                quantity=Decimal("10"),
-                avg_entry_price=Decimal("100.00"),
-                current_price=Decimal("105.00"),
-                market_value=Decimal("1050.00"),
-                unrealized_pnl=Decimal("50.00"),
-                unrealized_pnl_pct=Decimal("0.05"),
+                symbol=symbol,
+                quantity=_D10,
+                avg_entry_price=_D100,
+                current_price=_D105,
             )
-            for i in range(5)
+            for symbol in _STOCK_SYMS
         ]
 
         # Try to add more signals
@@ -181,14 +203,14 @@ class TestRiskManagementFlow:
             Signal(
                 ticker="AAPL",
                 action="BUY",
-                entry_price=Decimal("150.00"),
-                confidence=Decimal("0.85"),
+                entry_price=_D150,
+                confidence=_D085,
                 strategy="momentum",
             ),
             Signal(
                 ticker="MSFT",
                 action="BUY",
-                entry_price=Decimal("350.00"),
+                entry_price=_D350,
                 confidence=Decimal("0.90"),
                 strategy="momentum",
             ),
@@ -205,15 +227,15 @@ class TestRiskManagementFlow:
             Signal(
                 ticker="AAPL",
                 action="BUY",
-                entry_price=Decimal("150.00"),
-                confidence=Decimal("0.85"),
+                entry_price=_D150,
+                confidence=_D085,
                 strategy="momentum",
             ),
             Signal(
                 ticker="MSFT",
                 action="BUY",
-                entry_price=Decimal("350.00"),
-                confidence=Decimal("0.75"),
+                entry_price=_D350,
+                confidence=_D075,
                 strategy="momentum",
             ),
         ]
@@ -226,7 +248,7 @@ class TestRiskManagementFlow:
             capital_used = qty * signal.entry_price
 
             # Each position should not exceed 10% of portfolio
-            assert capital_used <= sample_portfolio.portfolio_value * Decimal("0.10")
+            assert capital_used <= sample_portfolio.portfolio_value * _D010
 
             total_capital_used += capital_used
 
@@ -246,29 +268,22 @@ class TestDailyTradingLoop:
             patch("src.main.SupabaseClient.get_instance") as MockSupabase,
         ):
 
-            # Setup mocks
-            mock_alpaca = AsyncMock()
-            MockAlpaca.return_value = mock_alpaca
+            # Setup mocks: portfolio state, no positions, no market data (no
+            # signals); order submission returns "order_123"
+            MockAlpaca.return_value = _FakeAlpaca(
+                account=Portfolio(
+                    portfolio_value=Decimal("10000.00"),
+                    cash=Decimal("5000.00"),
+                    buying_power=Decimal("5000.00"),
+                    equity=Decimal("5000.00"),
+                ),
+                positions=[],
+                bars=pd.DataFrame(),
+            )
 
             mock_supabase = AsyncMock()
             MockSupabase.return_value = mock_supabase
 
-            # Mock portfolio state
-            mock_alpaca.get_account.return_value = Portfolio(
-                portfolio_value=Decimal("10000.00"),
-                cash=Decimal("5000.00"),
-                buying_power=Decimal("5000.00"),
-                equity=Decimal("5000.00"),
-            )
-
-            mock_alpaca.get_positions.return_value = []
-
-            # Mock market data (no signals)
-            mock_alpaca.get_bars.return_value = pd.DataFrame()
-
-            # Mock order submission
-            mock_alpaca.submit_market_order.return_value = "order_123"
-
             # Execute daily loop
             result = await daily_trading_loop()
 
@@ -303,36 +318,30 @@ class TestDailyTradingLoop:
             patch("src.main.SupabaseClient.get_instance") as MockSupabase,
         ):
 
-            mock_alpaca = AsyncMock()
-            MockAlpaca.return_value = mock_alpaca
+            MockAlpaca.return_value = _FakeAlpaca(
+                # Portfolio with no changes needed
+                account=Portfolio(
+                    portfolio_value=Decimal("10000.00"),
+                    cash=Decimal("5000.00"),
+                    buying_power=Decimal("5000.00"),
+                    equity=Decimal("5000.00"),
+                ),
+                # Positions at target (no rebalancing)
+                positions=[
+                    Position(
+                        symbol="VTI",
+                        quantity=Decimal("12.5"),
+                        avg_entry_price=Decimal("200.00"),
+                        current_price=Decimal("200.00"),
+                    ),
+                ],
+                # No momentum signals
+                bars=pd.DataFrame(),
+            )
 
             mock_supabase = AsyncMock()
             MockSupabase.return_value = mock_supabase
 
-            # Portfolio with no changes needed
-            mock_alpaca.get_account.return_value = Portfolio(
-                portfolio_value=Decimal("10000.00"),
-                cash=Decimal("5000.00"),
-                buying_power=Decimal("5000.00"),
-                equity=Decimal("5000.00"),
-            )
-
-            # Positions at target (no rebalancing)
-            mock_alpaca.get_positions.return_value = [
-                Position(
-                    symbol="VTI",
-                    quantity=Decimal("12.5"),
-                    avg_entry_price=Decimal("200.00"),
-                    current_price=Decimal("200.00"),
-                    market_value=Decimal("2500.00"),
-                    unrealized_pnl=Decimal("0.00"),
-                    unrealized_pnl_pct=Decimal("0.00"),
-                ),
-            ]
-
-            # No momentum signals
-            mock_alpaca.get_bars.return_value = pd.DataFrame()
-
             result = await daily_trading_loop()
 
             # Should complete successfully with no trades
@@ -352,13 +361,13 @@ class TestCrossStrategyInteractions:
         # Should still be able to add 5 momentum positions
         signals = [
             Signal(
-                ticker=f"STOCK{i}",
+                ticker=symbol,
                 action="BUY",
-                entry_price=Decimal("100.00"),
-                confidence=Decimal("0.75"),
+                entry_price=_D100,
+                confidence=_D075,
                 strategy="momentum",
             )
-            for i in range(5)
+            for symbol in _STOCK_SYMS
         ]
 
         # Filter with defensive positions present
@@ -396,7 +405,7 @@ class TestPerformanceAnalysisFlow:
     async def test_parameter_adjustment_based_on_performance(self, mock_supabase_client):
         """Test that poor performance triggers parameter adjustment."""
         from src.core.performance_analyzer import adjust_parameters_if_needed
-        from src.strategies.momentum_trading import STRATEGY_PARAMS
+        from src.strategies.momentum_trading import get_current_parameters
 
         # Mock poor performance (< 55% win rate)
         mock_supabase_client.get_strategy_performance.return_value = [
@@ -407,7 +416,7 @@ class TestPerformanceAnalysisFlow:
             {"date": "2024-01-05", "win_rate": 0.49, "total_pnl": -60.00},
         ]
 
-        original_rsi_min = STRATEGY_PARAMS["rsi_min"]
+        original_rsi_lower = get_current_parameters()["rsi_lower"]
 
         with patch("src.core.performance_analyzer.SupabaseClient.get_instance") as mock:
             mock.return_value = mock_supabase_client
@@ -452,8 +461,8 @@ class TestPerformanceAnalysisFlow:
 class TestEndToEndScenarios:
     """End-to-end scenario tests (marked as slow)."""
 
-    @pytest.mark.asyncio
-    async def test_full_trading_day_scenario(self):
+    @pytest.mark.skip(reason="placeholder - implement E2E scenario")
+    def test_full_trading_day_scenario(self):
         """Test complete trading day from open to close."""
         # This would be a comprehensive test simulating:
         # 1. Market open
@@ -468,8 +477,8 @@ class TestEndToEndScenarios:
         # Placeholder for comprehensive E2E test
         pass
 
-    @pytest.mark.asyncio
-    async def test_month_end_rebalancing_scenario(self):
+    @pytest.mark.skip(reason="placeholder - implement E2E scenario")
+    def test_month_end_rebalancing_scenario(self):
         """Test month-end defensive core rebalancing."""
         # Placeholder for month-end rebalancing test
         pass
@@ -4,14 +4,17 @@ Tests for alpaca_client.py and data_client.py.
 Validates API wrappers, rate limiting, and data caching.
 """
 
+import asyncio
 import pytest
 import time
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
+import numpy as np
 import pandas as pd
 
-from src.mcp_clients.alpaca_client import AlpacaMCPClient
+from src.mcp_clients.alpaca_client import AlpacaMCPClient, Bars
 from src.mcp_clients.data_client import (
     RateLimiter,
     ALPACA_LIMITER,
@@ -20,51 +23,54 @@ from src.mcp_clients.data_client import (
 )
 from src.models.portfolio import Portfolio, Position
 
+_DATES_30D = pd.date_range(start="2024-01-01", periods=30, freq="D")
+
 
 class TestRateLimiter:
     """Test cases for rate limiter implementation."""
 
-    def test_rate_limiter_within_limit(self):
+    async def test_rate_limiter_within_limit(self):
         """Test rate limiter allows calls within limit."""
-        limiter = RateLimiter(max_calls=5, period=1.0)
+        limiter = RateLimiter(max_calls=5, period_seconds=1.0)
 
-        # Make 5 calls (should all succeed)
+        # Make 5 calls (should all succeed without waiting)
+        start_time = time.time()
         for i in range(5):
-            limiter.wait_if_needed()
+            await limiter.acquire()
+        elapsed = time.time() - start_time
 
-        # All calls should complete quickly (no waiting)
-        assert True  # If we get here, no blocking occurred
+        assert elapsed < 0.1
 
-    def test_rate_limiter_exceeds_limit(self):
+    async def test_rate_limiter_exceeds_limit(self):
         """Test rate limiter blocks when limit exceeded."""
-        limiter = RateLimiter(max_calls=3, period=1.0)
+        limiter = RateLimiter(max_calls=3, period_seconds=0.5)
 
         # Make 3 calls quickly
         for i in range(3):
-            limiter.wait_if_needed()
+            await limiter.acquire()
 
         # 4th call should block
         start_time = time.time()
-        limiter.wait_if_needed()
+        await limiter.acquire()
         elapsed = time.time() - start_time
 
-        # Should have waited some time (at least 0.5 seconds)
-        assert elapsed > 0.3
+        # Should have waited for the first call to leave the window
+        assert elapsed > 0.4
 
-    def test_rate_limiter_resets_after_period(self):
+    async def test_rate_limiter_resets_after_period(self):
         """Test rate limiter resets after time period."""
-        limiter = RateLimiter(max_calls=2, period=0.5)
+        limiter = RateLimiter(max_calls=2, period_seconds=0.5)
 
         # Make 2 calls
-        limiter.wait_if_needed()
-        limiter.wait_if_needed()
+        await limiter.acquire()
+        await limiter.acquire()
 
         # Wait for period to expire
         time.sleep(0.6)
 
         # Next call should not block
         start_time = time.time()
-        limiter.wait_if_needed()
+        await limiter.acquire()
         elapsed = time.time() - start_time
 
         # Should not have waited long
@@ -72,26 +78,41 @@ class TestRateLimiter:
 
     def test_rate_limiter_zero_max_calls(self):
         """Test rate limiter with 0 max calls (edge case)."""
-        limiter = RateLimiter(max_calls=0, period=1.0)
+        # A limiter that admits no calls would block forever
+        with pytest.raises(ValueError):
+            RateLimiter(max_calls=0, period_seconds=1.0)
+
+    async def test_rate_limiter_concurrent_safety(self):
+        """Test concurrent callers each reserve their own slot."""
+        limiter = RateLimiter(max_calls=10, period_seconds=0.5)
 
-        # Every call should block
+        # 12 concurrent calls: 10 admitted at once, 2 wait for the next window
         start_time = time.time()
-        limiter.wait_if_needed()
+        await asyncio.gather(*(limiter.acquire() for _ in range(12)))
         elapsed = time.time() - start_time
 
-        # Should have waited
-        assert elapsed > 0.5
+        assert elapsed > 0.4
+        assert len(limiter.calls) == limiter.max_calls
 
-    def test_rate_limiter_concurrent_safety(self):
-        """Test rate limiter is thread-safe (basic check)."""
-        limiter = RateLimiter(max_calls=10, period=1.0)
+    async def test_rate_limiter_rolling_window(self):
+        """Test no window of period_seconds ever admits more than max_calls."""
+        now = [0.0]
 
-        # Make multiple calls rapidly
-        for i in range(10):
-            limiter.wait_if_needed()
+        async def fake_sleep(seconds):
+            now[0] += seconds
 
-        # Should complete without errors
-        assert len(limiter.calls) <= 10
+        limiter = RateLimiter(max_calls=5, period_seconds=60, timer=lambda: now[0])
+        admitted = []
+
+        with patch("src.mcp_clients.data_client.asyncio.sleep", side_effect=fake_sleep):
+            for i in range(23):
+                await limiter.acquire()
+                admitted.append(now[0])
+                now[0] += 1.0 if i % 4 == 0 else 0.0  # Irregular arrivals
+
+        for start in admitted:
+            in_window = sum(start <= t < start + 60 for t in admitted)
+            assert in_window <= 5
 
 
 class TestAPIRateLimiters:
@@ -138,6 +159,15 @@ class TestAlpacaMCPClient:
         assert hasattr(mock_alpaca_client, "get_account")
         assert hasattr(mock_alpaca_client, "get_positions")
 
+    def test_data_client_pool_fits_batch_concurrency(self, mock_alpaca_client):
+        """Test the bars session keeps enough pooled connections for a batch."""
+        from src.mcp_clients.alpaca_client import BARS_BATCH_CONCURRENCY
+
+        session = mock_alpaca_client.data_client._session
+        adapter = session.get_adapter("https://data.alpaca.markets")
+
+        assert adapter._pool_maxsize >= BARS_BATCH_CONCURRENCY
+
     @pytest.mark.asyncio
     async def test_get_account_returns_portfolio(self, mock_alpaca_client):
         """Test get_account returns Portfolio object."""
@@ -165,9 +195,6 @@ class TestAlpacaMCPClient:
                     quantity=Decimal("10"),
                     avg_entry_price=Decimal("150.00"),
                     current_price=Decimal("155.00"),
-                    market_value=Decimal("1550.00"),
-                    unrealized_pnl=Decimal("50.00"),
-                    unrealized_pnl_pct=Decimal("0.0333"),
                 )
             ]
 
@@ -236,35 +263,41 @@ class TestAlpacaMCPClient:
     @pytest.mark.asyncio
     async def test_get_bars_valid(self, mock_alpaca_client):
         """Test fetching historical bars."""
-        mock_bars = pd.DataFrame(
-            {
-                "timestamp": pd.date_range(start="2024-01-01", periods=30, freq="D"),
-                "open": [100.0] * 30,
-                "high": [105.0] * 30,
-                "low": [95.0] * 30,
-                "close": [102.0] * 30,
-                "volume": [1000000] * 30,
-            }
-        )
-
-        with patch.object(mock_alpaca_client, "get_bars", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_bars
+        rows = [
+            SimpleNamespace(
+                timestamp=ts.to_pydatetime().replace(tzinfo=timezone.utc),
+                open=100.0,
+                high=105.0,
+                low=95.0,
+                close=102.0,
+                volume=1000000,
+            )
+            for ts in _DATES_30D
+        ]
 
+        data_client = mock_alpaca_client.data_client
+        with patch.object(data_client, "get_stock_bars", return_value={"AAPL": rows}):
             bars = await mock_alpaca_client.get_bars("AAPL", days=30)
 
-            assert isinstance(bars, pd.DataFrame)
-            assert len(bars) == 30
-            assert "close" in bars.columns
+        assert isinstance(bars, Bars)
+        assert len(bars.close) == 30
+        assert bars.close.dtype == np.float64
+        assert not bars.empty
+
+        df = bars.to_pandas()
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 30
+        assert "close" in df.columns
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2024-01-01", tz="UTC")
 
     @pytest.mark.asyncio
     async def test_get_bars_empty(self, mock_alpaca_client):
         """Test fetching bars with no data (edge case)."""
-        with patch.object(mock_alpaca_client, "get_bars", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = pd.DataFrame()
-
+        with patch.object(mock_alpaca_client.data_client, "get_stock_bars", return_value={}):
             bars = await mock_alpaca_client.get_bars("INVALID", days=30)
 
-            assert bars.empty
+        assert bars.empty
+        assert bars.to_pandas().empty
 
     @pytest.mark.asyncio
     async def test_get_latest_quote_valid(self, mock_alpaca_client):
@@ -296,50 +329,259 @@ class TestAlpacaMCPClient:
 
             assert "API Error" in str(exc_info.value)
 
+    async def test_get_bars_batch_keeps_symbol_order(self, mock_alpaca_client):
+        """Test batch bar fetch maps every symbol to its own result."""
+        closes = {"AAPL": 102.0, "MSFT": 410.0, "EMPTY": None}
+        error = Exception("no data")
+
+        async def fake_get_bars(symbol, days=30, timeframe="1Day"):
+            if symbol == "FAIL":
+                raise error
+            if closes[symbol] is None:
+                return Bars.from_bars([])
+            return Bars.from_bars(
+                [
+                    SimpleNamespace(
+                        timestamp=ts.to_pydatetime().replace(tzinfo=timezone.utc),
+                        open=closes[symbol],
+                        high=closes[symbol],
+                        low=closes[symbol],
+                        close=closes[symbol],
+                        volume=1000000,
+                    )
+                    for ts in _DATES_30D
+                ]
+            )
+
+        with patch.object(mock_alpaca_client, "get_bars", side_effect=fake_get_bars):
+            result = await mock_alpaca_client.get_bars_batch(
+                ["AAPL", "FAIL", "MSFT", "EMPTY"], days=30
+            )
+
+        assert list(result) == ["AAPL", "FAIL", "MSFT", "EMPTY"]
+        assert isinstance(result["AAPL"], Bars)
+        assert result["AAPL"].close[0] == 102.0
+        assert result["MSFT"].close[0] == 410.0
+        assert result["EMPTY"].empty
+        assert result["FAIL"] is error
+
 
 class TestDataClientCaching:
     """Test cases for data caching functionality."""
 
     def test_cache_stores_data(self):
         """Test that cache stores and retrieves data correctly."""
-        from src.mcp_clients.data_client import _cache
+        from src.mcp_clients.data_client import DataClient
 
-        # Clear cache first
-        _cache.clear()
+        client = DataClient()
 
         # Store data
         test_key = "AAPL_bars_30d"
         test_data = pd.DataFrame({"close": [100, 101, 102]})
 
-        _cache[test_key] = {
-            "data": test_data,
-            "timestamp": time.time(),
-        }
+        client._cache[test_key] = test_data
 
         # Retrieve data
-        assert test_key in _cache
-        assert isinstance(_cache[test_key]["data"], pd.DataFrame)
+        assert test_key in client._cache
+        assert isinstance(client._cache[test_key], pd.DataFrame)
+
+    def test_cache_is_per_client(self):
+        """Test that clearing one client's cache leaves other clients' caches alone."""
+        from src.mcp_clients.data_client import DataClient
+
+        first, second = DataClient(), DataClient()
+        first._cache["AAPL_bars_30d"] = [1]
+        second._cache["AAPL_bars_30d"] = [2]
+
+        first.clear_cache()
+
+        assert "AAPL_bars_30d" not in first._cache
+        assert second._cache["AAPL_bars_30d"] == [2]
 
     def test_cache_expiration(self):
         """Test that cache entries expire after timeout."""
-        from src.mcp_clients.data_client import _cache, CACHE_TIMEOUT
+        from src.mcp_clients.data_client import TTLCache, CACHE_TIMEOUT
 
-        _cache.clear()
+        now = [1000.0]
+        cache = TTLCache(maxsize=10, ttl=CACHE_TIMEOUT, timer=lambda: now[0])
 
-        # Store data with old timestamp
         test_key = "NVDA_bars_30d"
-        test_data = pd.DataFrame({"close": [500, 510, 520]})
+        cache[test_key] = pd.DataFrame({"close": [500, 510, 520]})
+        assert test_key in cache
+
+        # Advance the clock past the timeout
+        now[0] += CACHE_TIMEOUT + 10
+
+        assert test_key not in cache
+        assert cache.get(test_key) is None
+        with pytest.raises(KeyError):
+            cache[test_key]
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that cache size stays bounded."""
+        from src.mcp_clients.data_client import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache["AAPL"] = 1
+        cache["MSFT"] = 2
+        cache["AAPL"]  # Touch AAPL so MSFT is least recently used
+        cache["NVDA"] = 3
+
+        assert len(cache) == 2
+        assert "MSFT" not in cache
+        assert cache.get("AAPL") == 1
+
+    def test_cache_readers_safe_during_threaded_writes(self):
+        """Test listing entries while executor threads write doesn't raise."""
+        import threading
+
+        from src.mcp_clients.data_client import TTLCache
+
+        cache = TTLCache(maxsize=64, ttl=60)
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                cache[f"KEY{i % 128}"] = i
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(2000):
+                cache.keys()
+                cache.values()
+                list(cache)
+                len(cache)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert len(cache) <= 64
+
+    async def test_stale_bars_served_while_refreshing(self):
+        """Test that an expired entry keeps being served while one refresh runs."""
+        from src.mcp_clients.data_client import DataClient
+
+        client = DataClient()
+        client.clear_cache()
+        stale = [{"close": 100.0}]
+        fresh = [{"close": 101.0}]
+        client._cache.set("alpaca_AAPL_30_1D", stale, ttl=-1)  # Already expired
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_fetch(symbol, days, timeframe, cache_key):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            client._cache.set(cache_key, fresh)
+            return fresh
+
+        with patch.object(client, "_fetch_bars_alpaca", side_effect=slow_fetch):
+            first = await client.get_bars_cached("AAPL", 30)
+            await asyncio.sleep(0)  # Background refresh starts and blocks on the fetch
+            second = await client.get_bars_cached("AAPL", 30)
+
+            # Readers during the refresh still get the stale value immediately
+            assert first is stale
+            assert second is stale
+            assert len(client._refreshing) == 1
+
+            release.set()
+            await asyncio.gather(*client._refreshing.values())
+
+        assert calls == 1
+        assert await client.get_bars_cached("AAPL", 30) is fresh
+
+        client.clear_cache()
+
+    async def test_plain_read_keeps_stale_bars(self):
+        """Test a get_bars_alpaca call during a refresh doesn't evict the stale entry."""
+        from src.mcp_clients.data_client import DataClient
+
+        client = DataClient()
+        client.clear_cache()
+        stale = [{"close": 100.0}]
+        client._cache.set("alpaca_AAPL_30_1D", stale, ttl=-1)
+        release = asyncio.Event()
+
+        async def slow_fetch(symbol, days, timeframe, cache_key):
+            await release.wait()
+            return stale
+
+        with patch.object(client, "_fetch_bars_alpaca", side_effect=slow_fetch):
+            assert await client.get_bars_cached("AAPL", 30) is stale
+            plain_read = asyncio.create_task(client.get_bars_alpaca("AAPL", 30))
+            await asyncio.sleep(0)  # Plain read misses and joins the in-flight fetch
+
+            # Stale bars are still served without waiting
+            assert await client.get_bars_cached("AAPL", 30) is stale
+
+            release.set()
+            await plain_read
+            await asyncio.gather(*client._refreshing.values())
+
+        client.clear_cache()
+
+    async def test_failed_refresh_keeps_stale_bars(self):
+        """Test that a failed background refresh leaves the stale entry in place."""
+        from src.mcp_clients.data_client import DataClient
+
+        client = DataClient()
+        client.clear_cache()
+        stale = [{"close": 100.0}]
+        client._cache.set("alpaca_AAPL_30_1D", stale, ttl=-1)
+
+        fetch = AsyncMock(side_effect=Exception("API Error"))
+        with patch.object(client, "_fetch_bars_alpaca", fetch):
+            assert await client.get_bars_cached("AAPL", 30) is stale
+            await asyncio.gather(*client._refreshing.values())
+
+            assert await client.get_bars_cached("AAPL", 30) is stale
+
+        client.clear_cache()
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test that concurrent cache misses for one key make a single API call."""
+        from src.mcp_clients.data_client import DataClient
+
+        client = DataClient()
+        client.clear_cache()
+        calls = 0
+
+        async def slow_fetch(*args):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return [{"close": 100.0}]
+
+        with patch.object(client, "_fetch_bars_alpaca", side_effect=slow_fetch):
+            results = await asyncio.gather(*(client.get_bars_alpaca("AAPL", 30) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert not client._inflight
+
+    async def test_alpha_vantage_bars_served_from_cache(self):
+        """Test cached Alpha Vantage bars skip the API call and rate-limit delay."""
+        from src.clients import alpha_vantage_client
+        from src.clients.alpha_vantage_client import AlphaVantageClient
+
+        client = AlphaVantageClient()
+        client.clear_cache()
+        bars = pd.DataFrame({"close": [100.0, 101.0]})
+        alpha_vantage_client._bars_cache["AAPL_60"] = bars
+
+        with patch.object(alpha_vantage_client.aiohttp, "ClientSession") as session:
+            result = await client.get_bars("AAPL", days=60)
 
-        _cache[test_key] = {
-            "data": test_data,
-            "timestamp": time.time() - CACHE_TIMEOUT - 10,  # Expired
-        }
+        session.assert_not_called()
+        assert result.equals(bars)
+        assert result is not bars  # Callers get a copy they may modify
 
-        # Check if we handle expired cache
-        cached_entry = _cache.get(test_key)
-        if cached_entry:
-            age = time.time() - cached_entry["timestamp"]
-            assert age > CACHE_TIMEOUT
+        client.clear_cache()
 
     def test_cache_key_format(self):
         """Test cache key formatting is consistent."""
@@ -420,7 +662,7 @@ class TestErrorScenarios:
         client = AlpacaMCPClient()
 
         with patch.object(client, "get_bars", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = pd.DataFrame()  # Empty data for invalid symbol
+            mock_get.return_value = Bars.from_bars([])  # Empty data for invalid symbol
 
             bars = await client.get_bars("INVALID_SYMBOL", days=30)
 
@@ -1,14 +1,16 @@
 """Unit tests for Pydantic models.
 
-Tests for portfolio.py, trade.py, and performance.py models.
+Tests for portfolio.py, trade.py, performance.py, and market.py models.
 Validates data validation, serialization, and edge cases.
 """
 
 import pytest
+import sys
 from decimal import Decimal
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pydantic import ValidationError
 
+from src.models.market import PortfolioHistory
 from src.models.portfolio import Portfolio, Position
 from src.models.trade import Signal, Trade
 from src.models.performance import (
@@ -67,15 +69,32 @@ class TestPositionModel:
             quantity=Decimal("10"),
             avg_entry_price=Decimal("150.00"),
             current_price=Decimal("155.00"),
-            market_value=Decimal("1550.00"),
-            unrealized_pnl=Decimal("50.00"),
-            unrealized_pnl_pct=Decimal("0.0333"),
         )
 
         assert position.symbol == "AAPL"
         assert position.quantity == Decimal("10")
         assert position.unrealized_pnl == Decimal("50.00")
 
+    def test_position_derived_values_computed(self):
+        """Test market value and P&L follow quantity and prices."""
+        position = Position(
+            symbol="AAPL",
+            quantity=Decimal("10"),
+            avg_entry_price=Decimal("150.00"),
+            current_price=Decimal("165.00"),
+        )
+
+        assert position.market_value == Decimal("1650.00")
+        assert position.unrealized_pnl_pct == Decimal("0.1")
+
+        # Price updates (as in the backtest engine) carry through
+        position.current_price = Decimal("135.00")
+        assert position.unrealized_pnl == Decimal("-150.00")
+
+        dumped = position.model_dump()
+        assert dumped["market_value"] == Decimal("1350.00")
+        assert dumped["unrealized_pnl_pct"] == Decimal("-0.1")
+
     def test_position_negative_quantity_invalid(self):
         """Test that negative quantity is rejected."""
         with pytest.raises(ValidationError):
@@ -84,9 +103,6 @@ class TestPositionModel:
                 quantity=Decimal("-10"),  # Invalid: negative
                 avg_entry_price=Decimal("150.00"),
                 current_price=Decimal("155.00"),
-                market_value=Decimal("1550.00"),
-                unrealized_pnl=Decimal("50.00"),
-                unrealized_pnl_pct=Decimal("0.0333"),
             )
 
     def test_position_zero_price_invalid(self):
@@ -97,9 +113,6 @@ class TestPositionModel:
                 quantity=Decimal("10"),
                 avg_entry_price=Decimal("0.00"),  # Invalid: must be > 0
                 current_price=Decimal("155.00"),
-                market_value=Decimal("1550.00"),
-                unrealized_pnl=Decimal("50.00"),
-                unrealized_pnl_pct=Decimal("0.0333"),
             )
 
 
@@ -157,6 +170,32 @@ class TestSignalModel:
                 strategy="momentum",
             )
 
+    def test_signal_validate_many_matches_constructor(self):
+        """Test batch validation builds the same signals as the constructor."""
+        rows = [
+            {
+                "ticker": f"T{i}",
+                "action": "BUY",
+                "entry_price": Decimal(100 + i),
+                "confidence": Decimal("0.75"),
+                "strategy": "momentum",
+            }
+            for i in range(1000)
+        ]
+
+        assert Signal.model_validate_many(rows) == [Signal(**row) for row in rows]
+
+    def test_signal_validate_many_rejects_invalid_row(self):
+        """Test batch validation raises on an invalid row."""
+        base = {"action": "BUY", "strategy": "momentum"}
+        rows = [
+            {**base, "ticker": "AAPL", "entry_price": "150", "confidence": "0.8"},
+            {**base, "ticker": "MSFT", "entry_price": "350", "confidence": "1.5"},  # Invalid
+        ]
+
+        with pytest.raises(ValidationError):
+            Signal.model_validate_many(rows)
+
 
 class TestTradeModel:
     """Test cases for Trade model."""
@@ -269,6 +308,8 @@ class TestPerformanceModels:
         assert report.total_trades == 25
         assert len(report.best_performers) == 3
         assert "NVDA" in report.best_performers
+        assert report.best_performers == ("NVDA", "META", "TSLA")
+        assert report.best_performers[0] is sys.intern("NVDA")
 
     def test_weekly_report_empty_performers(self):
         """Test weekly report with empty performer lists (edge case)."""
@@ -283,3 +324,77 @@ class TestPerformanceModels:
 
         assert report.total_trades == 0
         assert len(report.best_performers) == 0
+
+    def test_performance_records_are_frozen(self, sample_strategy_metrics):
+        """Test performance records reject mutation and unknown fields."""
+        with pytest.raises(ValidationError):
+            sample_strategy_metrics.total_trades = 6
+
+        with pytest.raises(ValidationError):
+            StrategyMetrics(
+                strategy="momentum",
+                date=date.today(),
+                total_trades=5,
+                win_rate=Decimal("0.60"),
+                total_pnl=Decimal("100.00"),
+                totl_pnl=Decimal("100.00"),  # Typo
+            )
+
+
+def _history(equity: list[str]) -> PortfolioHistory:
+    """Build a daily PortfolioHistory from equity strings."""
+    start = datetime(2024, 1, 1)
+    return PortfolioHistory(
+        timestamps=[start + timedelta(days=i) for i in range(len(equity))],
+        equity=[Decimal(v) for v in equity],
+        base_value=Decimal(equity[0]),
+        timeframe="1D",
+    )
+
+
+class TestPortfolioHistoryAnalytics:
+    """Test cases for PortfolioHistory risk metrics."""
+
+    def test_sharpe_ratio_known_value(self):
+        """Test Sharpe Ratio against a hand-computed series."""
+        history = _history(["100", "110", "99", "108.9"])
+
+        # Returns: +10%, -10%, +10% -> mean 0.0333.., sample std 0.11547..
+        expected = (0.1 / 3 - 0.04 / 252) / 0.11547005383792516 * 252**0.5
+
+        assert float(history.calculate_sharpe_ratio()) == pytest.approx(expected)
+
+    def test_sharpe_ratio_flat_equity_is_zero(self):
+        """Test that zero volatility yields a zero Sharpe Ratio (edge case)."""
+        history = _history(["100", "100", "100", "100"])
+
+        assert history.calculate_sharpe_ratio() == Decimal("0")
+
+    def test_max_drawdown_peak_precedes_trough(self):
+        """Test drawdown dates: peak is the high before the trough, not a later high."""
+        history = _history(["100", "120", "90", "130", "125"])
+
+        max_dd, peak_date, trough_date = history.calculate_max_drawdown()
+
+        assert float(max_dd) == pytest.approx(0.25)
+        assert peak_date == history.timestamps[1]
+        assert trough_date == history.timestamps[2]
+
+    def test_max_drawdown_monotonic_rise(self):
+        """Test that a steadily rising curve has no drawdown (edge case)."""
+        history = _history(["100", "101", "102", "103"])
+
+        max_dd, peak_date, trough_date = history.calculate_max_drawdown()
+
+        assert max_dd == Decimal("0")
+        assert peak_date == history.timestamps[-1]
+        assert trough_date is None
+
+    def test_calmar_ratio_uses_max_drawdown(self):
+        """Test Calmar Ratio = annualized return / max drawdown."""
+        history = _history(["100", "120", "90", "130", "125"])
+
+        expected = 0.25 * (252 / 5) / 0.25
+
+        assert float(history.calculate_calmar_ratio()) == pytest.approx(expected)
+
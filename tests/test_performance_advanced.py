@@ -1,77 +1,91 @@
 """Test Advanced Analytics (Sharpe/Drawdown)."""
 
-import asyncio
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
 
 from src.models.performance import DailyPerformance
-from src.core.performance_analyzer import analyze_daily_performance
+from src.core.performance_analyzer import analyze_daily_performance, summarize_pnl
+
+# Ten days of alternating +100 / -50 daily P&L
+_DAILY_PNLS = np.where(np.arange(10) % 2 == 0, 100.0, -50.0)
+_HISTORY = tuple(
+    {"date": f"2023-01-{i+1:02d}", "daily_pnl": pnl} for i, pnl in enumerate(_DAILY_PNLS.tolist())
+)
+
 
+def _max_drawdown_ref(pnls):
+    """Plain-loop max drawdown of the cumulative-P&L curve (reference for the NumPy path)."""
+    cumulative = 0.0
+    peak = -float("inf")
+    max_dd = 0.0
+    for pnl in pnls:
+        cumulative += pnl
+        peak = max(peak, cumulative)
+        if peak > 0:
+            max_dd = max(max_dd, (peak - cumulative) / peak)
+    return max_dd
+
+@pytest.mark.asyncio
 async def test_advanced_analytics():
-    print("Testing Advanced Analytics...")
-    
+    """Test daily analysis logs Sharpe ratio and max drawdown from history."""
     # Mock Supabase
     with patch("src.core.performance_analyzer.SupabaseClient") as MockSupabase:
-        # Make get_instance return a mock that is already resolved
         mock_instance = MagicMock()
-        future = asyncio.Future()
-        future.set_result(mock_instance)
-        MockSupabase.get_instance.return_value = future
+        MockSupabase.get_instance = AsyncMock(return_value=mock_instance)
 
         # Mock static methods
-        future_log = asyncio.Future()
-        future_log.set_result(None)
-        MockSupabase.log_daily_performance.return_value = future_log
-        
-        future_strat = asyncio.Future()
-        future_strat.set_result(None)
-        MockSupabase.log_strategy_metrics.return_value = future_strat
-
-        # Mock adjust_parameters_if_needed (it's called internally, but we might need to mock supabase calls inside it)
-        # Actually, adjust_parameters_if_needed calls get_strategy_performance on the instance
-        future_perf = asyncio.Future()
-        future_perf.set_result([])
-        mock_instance.get_strategy_performance.return_value = future_perf
-        
-        # Mock today's trades
-        # select().eq().execute()
-        future_trades = asyncio.Future()
-        future_trades.set_result(MagicMock(data=[
+        MockSupabase.log_daily_performance = AsyncMock(return_value=None)
+        MockSupabase.log_strategy_metrics = AsyncMock(return_value=None)
+
+        # adjust_parameters_if_needed is called internally and reads recent performance
+        mock_instance.get_strategy_performance = AsyncMock(return_value=[])
+
+        # Both queries start from table(...).select("*")
+        select = mock_instance.table.return_value.select.return_value
+
+        # Mock today's trades: .eq("date", today).execute()
+        trades = SimpleNamespace(data=[
             {"pnl": 100.0, "strategy": "momentum"},
             {"pnl": -50.0, "strategy": "momentum"}
-        ]))
-        mock_instance.table.return_value.select.return_value.eq.return_value.execute.return_value = future_trades
-        
-        # Mock historical performance (last 10 days)
-        history = []
-        for i in range(10):
-            history.append({
-                "date": f"2023-01-{i+1:02d}",
-                "daily_pnl": 100.0 if i % 2 == 0 else -50.0
-            })
-        
-        future_history = asyncio.Future()
-        future_history.set_result(MagicMock(data=history))
-        mock_instance.table.return_value.select.return_value.order.return_value.limit.return_value.execute.return_value = future_history
-        
+        ])
+        select.eq.return_value.execute = AsyncMock(return_value=trades)
+
+        # Mock historical performance (last 10 days): .order(...).limit(30).execute()
+        history = SimpleNamespace(data=_HISTORY)
+        select.order.return_value.limit.return_value.execute = AsyncMock(return_value=history)
+
         # Run analysis
         await analyze_daily_performance()
         
         # Verify log_daily_performance was called with Sharpe/DD
-        call_args = MockSupabase.log_daily_performance.call_args
-        if call_args:
-            perf = call_args[0][0]
-            print(f"✅ DailyPerformance saved:")
-            print(f"   Sharpe Ratio: {perf.sharpe_ratio}")
-            print(f"   Max Drawdown: {perf.max_drawdown}")
-            
-            if perf.sharpe_ratio is not None and perf.max_drawdown is not None:
-                print("✅ Advanced metrics calculated successfully")
-            else:
-                print("❌ Advanced metrics missing")
-        else:
-            print("❌ log_daily_performance not called")
-
-if __name__ == "__main__":
-    asyncio.run(test_advanced_analytics())
+        MockSupabase.log_daily_performance.assert_awaited_once()
+        perf = MockSupabase.log_daily_performance.call_args[0][0]
+
+        assert perf.sharpe_ratio is not None
+        assert perf.max_drawdown is not None
+
+        # Oldest to newest the curve peaks at 50 then falls back to 0
+        assert perf.max_drawdown == Decimal("1.0")
+        daily_pnls = [d["daily_pnl"] for d in reversed(_HISTORY)] + [float(perf.daily_pnl)]
+        assert abs(float(perf.max_drawdown) - _max_drawdown_ref(daily_pnls)) < 1e-9
+
+def test_summarize_pnl():
+    """Test win/loss counts and averages, with None P&L counted as zero."""
+    trades = [{"pnl": 100.0}, {"pnl": 50.0}, {"pnl": -30.0}, {"pnl": None}, {}]
+    summary = summarize_pnl(trades)
+
+    assert summary.total_trades == 5
+    assert summary.winning_trades == 2
+    assert summary.losing_trades == 1
+    assert summary.total_pnl == 120.0
+    assert summary.avg_win == 75.0
+    assert summary.avg_loss == -30.0
+
+    empty = summarize_pnl([])
+    assert empty.total_trades == 0
+    assert empty.avg_win == 0.0 and empty.avg_loss == 0.0
@@ -21,8 +21,13 @@ from src.core.risk_manager import (
 from src.models.trade import Signal
 from src.models.portfolio import Portfolio, Position
 
+# Shared values for the generated max_positions rows
+_D10 = Decimal("10")
+_D100 = Decimal("100.00")
+_D105 = Decimal("105.00")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_portfolio():
     """Create sample portfolio for testing."""
     return Portfolio(
@@ -33,7 +38,7 @@ def sample_portfolio():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_signal():
     """Create sample trading signal for testing."""
     return Signal(
@@ -47,7 +52,7 @@ def sample_signal():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_positions():
     """Create sample position list for testing."""
     return [
@@ -56,22 +61,30 @@ def sample_positions():
             quantity=Decimal("20"),
             avg_entry_price=Decimal("200.00"),
             current_price=Decimal("205.00"),
-            market_value=Decimal("4100.00"),
-            unrealized_pnl=Decimal("100.00"),
-            unrealized_pnl_pct=Decimal("0.025"),
         ),
         Position(
             symbol="NVDA",
             quantity=Decimal("5"),
             avg_entry_price=Decimal("500.00"),
             current_price=Decimal("520.00"),
-            market_value=Decimal("2600.00"),
-            unrealized_pnl=Decimal("100.00"),
-            unrealized_pnl_pct=Decimal("0.04"),
         ),
     ]
 
 
+@pytest.fixture(scope="module")
+def max_positions():
+    """Create MAX_POSITIONS momentum positions (position limit reached)."""
+    return tuple(
+        Position(
+            symbol=f"STOCK{i}",
+            quantity=_D10,
+            avg_entry_price=_D100,
+            current_price=_D105,
+        )
+        for i in range(MAX_POSITIONS)
+    )
+
+
 class TestFilterSignalsByRisk:
     """Test cases for signal filtering by risk limits."""
 
@@ -100,22 +113,8 @@ class TestFilterSignalsByRisk:
         # Both signals should pass
         assert len(filtered) == 2
 
-    def test_filter_signals_at_max_positions(self, sample_portfolio):
+    def test_filter_signals_at_max_positions(self, sample_portfolio, max_positions):
         """Test filtering when at max position limit."""
-        # Create 5 momentum positions (max limit)
-        max_positions = [
-            Position(
-                symbol=f"STOCK{i}",
-                quantity=Decimal("10"),
-                avg_entry_price=Decimal("100.00"),
-                current_price=Decimal("105.00"),
-                market_value=Decimal("1050.00"),
-                unrealized_pnl=Decimal("50.00"),
-                unrealized_pnl_pct=Decimal("0.05"),
-            )
-            for i in range(MAX_POSITIONS)
-        ]
-
         signals = [
             Signal(
                 ticker="AAPL",
@@ -173,27 +172,18 @@ class TestFilterSignalsByRisk:
                 quantity=Decimal("50"),
                 avg_entry_price=Decimal("200.00"),
                 current_price=Decimal("205.00"),
-                market_value=Decimal("10250.00"),
-                unrealized_pnl=Decimal("250.00"),
-                unrealized_pnl_pct=Decimal("0.025"),
             ),
             Position(
                 symbol="VGK",
                 quantity=Decimal("30"),
                 avg_entry_price=Decimal("50.00"),
                 current_price=Decimal("52.00"),
-                market_value=Decimal("1560.00"),
-                unrealized_pnl=Decimal("60.00"),
-                unrealized_pnl_pct=Decimal("0.04"),
             ),
             Position(
                 symbol="AAPL",
                 quantity=Decimal("10"),
                 avg_entry_price=Decimal("150.00"),
                 current_price=Decimal("155.00"),
-                market_value=Decimal("1550.00"),
-                unrealized_pnl=Decimal("50.00"),
-                unrealized_pnl_pct=Decimal("0.033"),
             ),
         ]
 
@@ -229,14 +219,15 @@ class TestCalculatePositionSize:
 
         assert position_value <= max_value
 
-    def test_position_size_respects_buying_power(self, sample_signal):
+    def test_position_size_respects_buying_power(self, sample_signal, sample_portfolio):
         """Test position size respects available buying power."""
         # Portfolio with limited buying power
-        portfolio = Portfolio(
-            portfolio_value=Decimal("10000.00"),
-            cash=Decimal("500.00"),
-            buying_power=Decimal("500.00"),  # Only $500 available
-            equity=Decimal("9500.00"),
+        portfolio = sample_portfolio.model_copy(
+            update={
+                "cash": Decimal("500.00"),
+                "buying_power": Decimal("500.00"),  # Only $500 available
+                "equity": Decimal("9500.00"),
+            }
         )
 
         qty = calculate_position_size(sample_signal, portfolio)
@@ -280,124 +271,70 @@ class TestCalculatePositionSize:
 class TestDailyLossLimit:
     """Test cases for daily loss limit (circuit breaker)."""
 
-    def test_daily_loss_within_limit(self, sample_portfolio):
-        """Test that normal losses don't trigger circuit breaker."""
-        daily_pnl = Decimal("-100.00")  # -1% loss
-
-        triggered = check_daily_loss_limit(daily_pnl, sample_portfolio.portfolio_value)
-
-        # Should not trigger (limit is -3%)
-        assert triggered is False
-
-    def test_daily_loss_at_limit(self, sample_portfolio):
-        """Test circuit breaker at exact limit."""
-        daily_pnl = Decimal("-300.00")  # Exactly -3%
-
-        triggered = check_daily_loss_limit(daily_pnl, sample_portfolio.portfolio_value)
-
-        # Should trigger at -3%
-        assert triggered is True
-
-    def test_daily_loss_exceeds_limit(self, sample_portfolio):
-        """Test circuit breaker when exceeding limit."""
-        daily_pnl = Decimal("-500.00")  # -5% loss
-
-        triggered = check_daily_loss_limit(daily_pnl, sample_portfolio.portfolio_value)
-
-        # Should trigger (exceeds -3% limit)
-        assert triggered is True
-
-    def test_daily_profit_no_trigger(self, sample_portfolio):
-        """Test that profits don't trigger circuit breaker."""
-        daily_pnl = Decimal("500.00")  # +5% profit
-
+    @pytest.mark.parametrize(
+        "daily_pnl, expected",
+        [
+            (Decimal("-100.00"), False),  # -1% loss, within the -3% limit
+            (Decimal("-300.00"), True),  # Exactly -3%
+            (Decimal("-500.00"), True),  # -5%, exceeds limit
+            (Decimal("500.00"), False),  # Profits never trigger
+        ],
+        ids=["within_limit", "at_limit", "exceeds_limit", "profit"],
+    )
+    def test_daily_loss_limit(self, sample_portfolio, daily_pnl, expected):
+        """Test circuit breaker triggers at or beyond the -3% daily loss limit."""
         triggered = check_daily_loss_limit(daily_pnl, sample_portfolio.portfolio_value)
 
-        # Should not trigger on profits
-        assert triggered is False
+        assert triggered is expected
 
 
 class TestValidateSignalRisk:
     """Test cases for signal risk validation."""
 
-    def test_validate_signal_valid(self, sample_signal, sample_portfolio):
-        """Test validation of valid signal."""
-        is_valid, reason = validate_signal_risk(sample_signal, sample_portfolio)
-
-        assert is_valid is True
-        assert "passes all risk checks" in reason
-
-    def test_validate_signal_negative_price(self, sample_portfolio):
-        """Test validation rejects negative entry price."""
-        invalid_signal = Signal(
-            ticker="AAPL",
-            action="BUY",
-            entry_price=Decimal("-150.00"),  # Invalid: negative
-            confidence=Decimal("0.75"),
-            strategy="momentum",
-        )
-
-        is_valid, reason = validate_signal_risk(invalid_signal, sample_portfolio)
-
-        assert is_valid is False
-        assert "Invalid entry price" in reason
-
-    def test_validate_signal_invalid_stop_loss(self, sample_portfolio):
-        """Test validation rejects stop-loss above entry."""
-        invalid_signal = Signal(
-            ticker="AAPL",
-            action="BUY",
-            entry_price=Decimal("150.00"),
-            stop_loss=Decimal("160.00"),  # Invalid: above entry
-            confidence=Decimal("0.75"),
-            strategy="momentum",
-        )
-
-        is_valid, reason = validate_signal_risk(invalid_signal, sample_portfolio)
-
-        assert is_valid is False
-        assert "Stop-loss must be below" in reason
-
-    def test_validate_signal_invalid_take_profit(self, sample_portfolio):
-        """Test validation rejects take-profit below entry."""
-        invalid_signal = Signal(
-            ticker="AAPL",
-            action="BUY",
-            entry_price=Decimal("150.00"),
-            take_profit=Decimal("140.00"),  # Invalid: below entry
-            confidence=Decimal("0.75"),
-            strategy="momentum",
-        )
-
-        is_valid, reason = validate_signal_risk(invalid_signal, sample_portfolio)
-
-        assert is_valid is False
-        assert "Take-profit must be above" in reason
-
-    def test_validate_signal_poor_risk_reward(self, sample_portfolio):
-        """Test validation rejects poor risk/reward ratio."""
-        poor_signal = Signal(
-            ticker="AAPL",
-            action="BUY",
-            entry_price=Decimal("150.00"),
-            stop_loss=Decimal("140.00"),  # -10 risk
-            take_profit=Decimal("155.00"),  # +5 reward (R:R = 0.5, need 2.0)
-            confidence=Decimal("0.75"),
-            strategy="momentum",
-        )
-
-        is_valid, reason = validate_signal_risk(poor_signal, sample_portfolio)
-
-        assert is_valid is False
-        assert "Risk/reward ratio too low" in reason
-
-    def test_validate_signal_insufficient_buying_power(self):
+    @pytest.mark.parametrize(
+        "signal_kwargs, expect_valid, reason_substr",
+        [
+            (
+                {"stop_loss": Decimal("142.50"), "take_profit": Decimal("172.50")},
+                True,
+                "passes all risk checks",
+            ),
+            ({"entry_price": Decimal("-150.00")}, False, "Invalid entry price"),
+            ({"stop_loss": Decimal("160.00")}, False, "Stop-loss must be below"),
+            ({"take_profit": Decimal("140.00")}, False, "Take-profit must be above"),
+            (
+                # -10 risk, +5 reward (R:R = 0.5, need 2.0)
+                {"stop_loss": Decimal("140.00"), "take_profit": Decimal("155.00")},
+                False,
+                "Risk/reward ratio too low",
+            ),
+        ],
+        ids=["valid", "negative_price", "stop_above_entry", "target_below_entry", "poor_rr"],
+    )
+    def test_validate_signal(self, sample_portfolio, signal_kwargs, expect_valid, reason_substr):
+        """Test signal validation outcome and reason for each risk check."""
+        fields = {
+            "ticker": "AAPL",
+            "action": "BUY",
+            "entry_price": Decimal("150.00"),
+            "confidence": Decimal("0.75"),
+            "strategy": "momentum",
+        }
+        signal = Signal(**(fields | signal_kwargs))
+
+        is_valid, reason = validate_signal_risk(signal, sample_portfolio)
+
+        assert is_valid is expect_valid
+        assert reason_substr in reason
+
+    def test_validate_signal_insufficient_buying_power(self, sample_portfolio):
         """Test validation rejects signal with insufficient buying power."""
-        broke_portfolio = Portfolio(
-            portfolio_value=Decimal("10000.00"),
-            cash=Decimal("10.00"),  # Only $10 available
-            buying_power=Decimal("10.00"),
-            equity=Decimal("9990.00"),
+        broke_portfolio = sample_portfolio.model_copy(
+            update={
+                "cash": Decimal("10.00"),  # Only $10 available
+                "buying_power": Decimal("10.00"),
+                "equity": Decimal("9990.00"),
+            }
         )
 
         signal = Signal(
@@ -451,6 +388,4 @@ class TestPortfolioRiskMetrics:
         metrics = calculate_portfolio_risk_metrics(sample_positions, portfolio_value)
 
         # Largest position is VTI at $4100
-        expected_largest_pct = Decimal("4100.00") / portfolio_value
-
-        assert metrics["largest_position_pct"] == expected_largest_pct
+        assert metrics["largest_position_pct"] == Decimal("4100.00") / portfolio_value
@@ -5,42 +5,59 @@ from datetime import datetime
 from src.news.aggregator import NewsArticle
 from src.llm.sentiment_engine import SentimentEngine
 
-async def main():
-    engine = SentimentEngine()
-    ticker = "AAPL"
-    
-    # Mock articles
-    articles = [
+# Max analyze_news calls in flight at once
+MAX_CONCURRENT_ANALYSES = 8
+
+
+def mock_articles(ticker: str, now: datetime) -> list[NewsArticle]:
+    """Build two bullish mock articles for a ticker."""
+    return [
         NewsArticle(
-            title="Apple Reports Record Earnings",
-            summary="Apple smashed expectations with record iPhone sales.",
+            title=f"{ticker} Reports Record Earnings",
+            summary=f"{ticker} smashed expectations with record sales.",
             source="Bloomberg",
-            url="http://example.com/1",
-            published_at=datetime.now(),
+            url=f"http://example.com/{ticker}/1",
+            published_at=now,
             ticker=ticker
         ),
         NewsArticle(
-            title="Analysts Upgrade Apple Target",
-            summary="Morgan Stanley raises price target to $300.",
+            title=f"Analysts Upgrade {ticker} Target",
+            summary="Morgan Stanley raises price target by 20%.",
             source="Reuters",
-            url="http://example.com/2",
-            published_at=datetime.now(),
+            url=f"http://example.com/{ticker}/2",
+            published_at=now,
             ticker=ticker
         )
     ]
-    
-    print(f"Analyzing {len(articles)} articles for {ticker}...")
-    prognosis = await engine.analyze_news(ticker, articles)
-    
-    if prognosis:
-        print("\n=== Prognosis ===")
-        print(f"Action: {prognosis.action}")
-        print(f"Score: {prognosis.sentiment_score}")
-        print(f"Confidence: {prognosis.confidence}")
-        print(f"Impact: {prognosis.impact}")
-        print(f"Reasoning: {prognosis.reasoning}")
-    else:
-        print("Analysis failed.")
+
+async def main(tickers: tuple[str, ...] = ("AAPL",)):
+    engine = SentimentEngine()
+
+    # Mock articles (all published "now")
+    now = datetime.now()
+    articles_by_ticker = {ticker: mock_articles(ticker, now) for ticker in tickers}
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+    async def analyze(ticker: str):
+        async with semaphore:
+            return await engine.analyze_news(ticker, articles_by_ticker[ticker])
+
+    print(f"Analyzing news for {len(tickers)} ticker(s): {', '.join(tickers)}...")
+    results = await asyncio.gather(*(analyze(t) for t in tickers), return_exceptions=True)
+
+    for ticker, prognosis in zip(tickers, results):
+        print(f"\n=== {ticker} Prognosis ===")
+        if isinstance(prognosis, Exception):
+            print(f"Analysis failed: {prognosis}")
+        elif prognosis:
+            print(f"Action: {prognosis.action}")
+            print(f"Score: {prognosis.sentiment_score}")
+            print(f"Confidence: {prognosis.confidence}")
+            print(f"Impact: {prognosis.impact}")
+            print(f"Reasoning: {prognosis.reasoning}")
+        else:
+            print("Analysis failed.")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -23,12 +23,55 @@ from src.strategies.defensive_core import (
 from src.strategies.momentum_trading import (
     scan_for_signals,
     check_exit_conditions,
+    check_exit_conditions_batch,
     update_strategy_parameters,
     get_current_parameters,
-    STRATEGY_PARAMS,
+    get_dynamic_watchlist,
 )
 from src.models.portfolio import Portfolio, Position
 from src.models.trade import Signal
+from src.mcp_clients.alpaca_client import Bars
+
+_DATES_90D = np.arange("2024-01-01", "2024-03-31", dtype="datetime64[D]").astype("datetime64[ns]")
+_NO_BARS = Bars.from_bars([])
+
+
+def _yf_history(bars: Bars) -> pd.DataFrame:
+    """Shape Bars like yfinance's Ticker.history() output."""
+    history = bars.to_pandas().set_index("timestamp")
+    history.columns = [c.capitalize() for c in history.columns]
+    return history
+
+
+def _patch_scan_sources(history):
+    """Patch scan_for_signals' parameter store and yfinance fetch.
+
+    Args:
+        history: DataFrame returned for every ticker, or an exception to raise
+
+    Returns:
+        Context manager applying both patches
+    """
+    from contextlib import ExitStack
+
+    from src.strategies import momentum_trading
+    from src.strategies.momentum_trading import DEFAULT_STRATEGY_PARAMS
+
+    params_manager = MagicMock()
+    params_manager.get_parameters = AsyncMock(return_value=dict(DEFAULT_STRATEGY_PARAMS))
+
+    # Fresh copy per ticker: _scan_ticker renames the columns in place
+    def fetch(ticker):
+        if isinstance(history, Exception):
+            raise history
+        return history.copy()
+
+    stack = ExitStack()
+    stack.enter_context(
+        patch.object(momentum_trading, "get_strategy_parameters", return_value=params_manager)
+    )
+    stack.enter_context(patch.object(momentum_trading, "_fetch_daily_history", side_effect=fetch))
+    return stack
 
 
 @pytest.fixture
@@ -48,30 +91,21 @@ def defensive_positions():
     return [
         Position(
             symbol="VTI",
-            quantity=Decimal("12"),
-            avg_entry_price=Decimal("200.00"),
-            current_price=Decimal("208.33"),
-            market_value=Decimal("2500.00"),  # 25% of $10k portfolio
-            unrealized_pnl=Decimal("100.00"),
-            unrealized_pnl_pct=Decimal("0.0417"),
+            quantity=Decimal("12.5"),
+            avg_entry_price=Decimal("192.00"),
+            current_price=Decimal("200.00"),  # Market value 25% of $10k portfolio
         ),
         Position(
             symbol="VGK",
             quantity=Decimal("30"),
             avg_entry_price=Decimal("48.00"),
-            current_price=Decimal("50.00"),
-            market_value=Decimal("1500.00"),  # 15% of portfolio
-            unrealized_pnl=Decimal("60.00"),
-            unrealized_pnl_pct=Decimal("0.0417"),
+            current_price=Decimal("50.00"),  # Market value 15% of portfolio
         ),
         Position(
             symbol="GLD",
             quantity=Decimal("5"),
             avg_entry_price=Decimal("190.00"),
-            current_price=Decimal("200.00"),
-            market_value=Decimal("1000.00"),  # 10% of portfolio
-            unrealized_pnl=Decimal("50.00"),
-            unrealized_pnl_pct=Decimal("0.0526"),
+            current_price=Decimal("200.00"),  # Market value 10% of portfolio
         ),
     ]
 
@@ -97,6 +131,19 @@ class TestDefensiveCoreRebalancing:
         # Should not trigger (allocations are at target)
         assert should_rebal is False
 
+    @pytest.mark.asyncio
+    async def test_should_rebalance_mid_month_skips_calendar(
+        self, defensive_positions, sample_portfolio
+    ):
+        """Test mid-month checks don't request the market calendar."""
+        from src.strategies import defensive_core
+
+        get_adapter = AsyncMock()
+        with patch.object(defensive_core, "get_market_data_adapter", get_adapter):
+            await should_rebalance(date(2024, 3, 15), defensive_positions, sample_portfolio)
+
+        get_adapter.assert_not_awaited()
+
     def test_should_rebalance_on_drift(self, sample_portfolio):
         """Test rebalancing triggered by portfolio drift > 5%."""
         # VTI drifted to 20% (target is 25%, drift = 5%)
@@ -105,19 +152,13 @@ class TestDefensiveCoreRebalancing:
                 symbol="VTI",
                 quantity=Decimal("10"),
                 avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("200.00"),
-                market_value=Decimal("2000.00"),  # 20% (target 25%, drift 5%)
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
+                current_price=Decimal("200.00"),  # Market value 20% (target 25%, drift 5%)
             ),
             Position(
                 symbol="VGK",
                 quantity=Decimal("30"),
                 avg_entry_price=Decimal("50.00"),
                 current_price=Decimal("50.00"),
-                market_value=Decimal("1500.00"),
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
             ),
         ]
 
@@ -134,12 +175,9 @@ class TestDefensiveCoreRebalancing:
         incomplete_positions = [
             Position(
                 symbol="VTI",
-                quantity=Decimal("12"),
-                avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("208.33"),
-                market_value=Decimal("2500.00"),
-                unrealized_pnl=Decimal("100.00"),
-                unrealized_pnl_pct=Decimal("0.0417"),
+                quantity=Decimal("12.5"),
+                avg_entry_price=Decimal("192.00"),
+                current_price=Decimal("200.00"),
             ),
         ]
 
@@ -169,10 +207,7 @@ class TestCalculateRebalancingOrders:
                 symbol="VTI",
                 quantity=Decimal("7.5"),
                 avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("200.00"),
-                market_value=Decimal("1500.00"),  # 15% (need 25%)
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
+                current_price=Decimal("200.00"),  # Market value 15% (need 25%)
             ),
         ]
 
@@ -192,10 +227,7 @@ class TestCalculateRebalancingOrders:
                 symbol="VTI",
                 quantity=Decimal("17.5"),
                 avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("200.00"),
-                market_value=Decimal("3500.00"),  # 35% (target 25%)
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
+                current_price=Decimal("200.00"),  # Market value 35% (target 25%)
             ),
         ]
 
@@ -215,10 +247,7 @@ class TestCalculateRebalancingOrders:
                 symbol="VTI",
                 quantity=Decimal("12.25"),
                 avg_entry_price=Decimal("200.00"),
-                current_price=Decimal("200.00"),
-                market_value=Decimal("2450.00"),  # $50 under target
-                unrealized_pnl=Decimal("0.00"),
-                unrealized_pnl_pct=Decimal("0.00"),
+                current_price=Decimal("200.00"),  # Market value $50 under target
             ),
         ]
 
@@ -239,6 +268,7 @@ class TestDefensiveCoreHelpers:
         assert "VGK" in symbols
         assert "GLD" in symbols
         assert len(symbols) == 3
+        assert get_defensive_symbols() is symbols  # Cached, not rebuilt
 
     def test_calculate_defensive_exposure(self, defensive_positions):
         """Test calculating total defensive exposure."""
@@ -279,6 +309,7 @@ class TestDefensiveCoreHelpers:
             # Restore original values
             TARGET_ALLOCATIONS.clear()
             TARGET_ALLOCATIONS.update(original)
+            get_defensive_symbols.cache_clear()
 
 
 class TestMomentumTrading:
@@ -287,36 +318,30 @@ class TestMomentumTrading:
     @pytest.mark.asyncio
     async def test_scan_for_signals_with_valid_data(self):
         """Test momentum signal scanning with valid market data."""
-        # Mock Alpaca client
-        mock_alpaca = AsyncMock()
-
-        # Create sample bars data with bullish indicators
-        bars_df = pd.DataFrame(
-            {
-                "timestamp": pd.date_range(start="2024-01-01", periods=30, freq="D"),
-                "open": np.linspace(100, 120, 30),
-                "high": np.linspace(101, 121, 30),
-                "low": np.linspace(99, 119, 30),
-                "close": np.linspace(100, 120, 30),  # Uptrend
-                "volume": [2000000] * 29 + [3000000],  # High volume on last day
-            }
+        # Choppy uptrend: RSI ~66, MACD histogram > 0, SMA20 > SMA50
+        close = 100 + 0.3 * np.arange(90) + np.tile([0.0, 1.5, 0.5], 30)
+        bars = Bars(
+            timestamp=_DATES_90D,
+            open=close,
+            high=close + 1,
+            low=close - 1,
+            close=close,
+            volume=np.array([2000000.0] * 89 + [3000000.0]),  # High volume on last day
         )
 
-        mock_alpaca.get_bars = AsyncMock(return_value=bars_df)
-
-        # Scan for signals
-        signals = await scan_for_signals(mock_alpaca)
+        with _patch_scan_sources(_yf_history(bars)):
+            signals = await scan_for_signals(AsyncMock())
 
-        # Should return list (may be empty if indicators don't align)
-        assert isinstance(signals, list)
+        # Every watchlist ticker sees the same bullish history
+        assert [s.ticker for s in signals] == get_dynamic_watchlist()
+        assert signals[0].action == "BUY"
+        assert signals[0].entry_price == Decimal(str(close[-1]))
 
     @pytest.mark.asyncio
     async def test_scan_for_signals_empty_data(self):
         """Test signal scanning with no market data (edge case)."""
-        mock_alpaca = AsyncMock()
-        mock_alpaca.get_bars = AsyncMock(return_value=pd.DataFrame())
-
-        signals = await scan_for_signals(mock_alpaca)
+        with _patch_scan_sources(_yf_history(_NO_BARS)):
+            signals = await scan_for_signals(AsyncMock())
 
         # Should return empty list
         assert signals == []
@@ -324,14 +349,35 @@ class TestMomentumTrading:
     @pytest.mark.asyncio
     async def test_scan_for_signals_api_error(self):
         """Test signal scanning handles API errors gracefully."""
-        mock_alpaca = AsyncMock()
-        mock_alpaca.get_bars = AsyncMock(side_effect=Exception("API Error"))
-
-        signals = await scan_for_signals(mock_alpaca)
+        with _patch_scan_sources(Exception("API Error")):
+            signals = await scan_for_signals(AsyncMock())
 
         # Should return empty list (errors are caught and logged)
         assert signals == []
 
+    @pytest.mark.asyncio
+    async def test_scan_for_signals_skips_failed_tickers(self):
+        """Test concurrent scan logs per-ticker fetch errors and keeps going."""
+        from src.strategies import momentum_trading
+        from src.strategies.momentum_trading import DEFAULT_STRATEGY_PARAMS
+
+        params_manager = MagicMock()
+        params_manager.get_parameters = AsyncMock(return_value=dict(DEFAULT_STRATEGY_PARAMS))
+        fetched = []
+
+        def failing_fetch(ticker):
+            fetched.append(ticker)
+            raise Exception("API Error")
+
+        with (
+            patch.object(momentum_trading, "get_strategy_parameters", return_value=params_manager),
+            patch.object(momentum_trading, "_fetch_daily_history", side_effect=failing_fetch),
+        ):
+            signals = await scan_for_signals(AsyncMock())
+
+        assert signals == []
+        assert sorted(fetched) == sorted(momentum_trading.get_dynamic_watchlist())
+
     @pytest.mark.asyncio
     async def test_check_exit_conditions_stop_loss(self):
         """Test exit condition: stop-loss triggered."""
@@ -343,14 +389,11 @@ class TestMomentumTrading:
             quantity=Decimal("10"),
             avg_entry_price=Decimal("150.00"),
             current_price=Decimal("135.00"),  # -10% loss
-            market_value=Decimal("1350.00"),
-            unrealized_pnl=Decimal("-150.00"),
-            unrealized_pnl_pct=Decimal("-0.10"),
         )
 
         # Mock current quote
         mock_alpaca.get_latest_quote = AsyncMock(return_value={"price": 135.00})
-        mock_alpaca.get_bars = AsyncMock(return_value=pd.DataFrame())
+        mock_alpaca.get_bars = AsyncMock(return_value=_NO_BARS)
 
         should_exit, reason = await check_exit_conditions(position, mock_alpaca)
 
@@ -369,13 +412,10 @@ class TestMomentumTrading:
             quantity=Decimal("5"),
             avg_entry_price=Decimal("500.00"),
             current_price=Decimal("600.00"),  # +20% profit
-            market_value=Decimal("3000.00"),
-            unrealized_pnl=Decimal("500.00"),
-            unrealized_pnl_pct=Decimal("0.20"),
         )
 
         mock_alpaca.get_latest_quote = AsyncMock(return_value={"price": 600.00})
-        mock_alpaca.get_bars = AsyncMock(return_value=pd.DataFrame())
+        mock_alpaca.get_bars = AsyncMock(return_value=_NO_BARS)
 
         should_exit, reason = await check_exit_conditions(position, mock_alpaca)
 
@@ -394,13 +434,10 @@ class TestMomentumTrading:
             quantity=Decimal("10"),
             avg_entry_price=Decimal("350.00"),
             current_price=Decimal("367.50"),  # +5% profit
-            market_value=Decimal("3675.00"),
-            unrealized_pnl=Decimal("175.00"),
-            unrealized_pnl_pct=Decimal("0.05"),
         )
 
         mock_alpaca.get_latest_quote = AsyncMock(return_value={"price": 367.50})
-        mock_alpaca.get_bars = AsyncMock(return_value=pd.DataFrame())
+        mock_alpaca.get_bars = AsyncMock(return_value=_NO_BARS)
 
         should_exit, reason = await check_exit_conditions(position, mock_alpaca)
 
@@ -408,6 +445,122 @@ class TestMomentumTrading:
         assert should_exit is False
         assert reason is None
 
+    @pytest.mark.asyncio
+    async def test_check_exit_conditions_technical_exit(self):
+        """Test exit condition: MACD histogram turns negative on a sell-off."""
+        from src.strategies import momentum_trading
+
+        mock_alpaca = AsyncMock()
+        position = Position(
+            symbol="MSFT",
+            quantity=Decimal("10"),
+            avg_entry_price=Decimal("350.00"),
+            current_price=Decimal("351.00"),  # Inside stop-loss/take-profit band
+        )
+        mock_alpaca.get_latest_quote = AsyncMock(return_value={"price": 351.00})
+
+        # Accelerating decline: MACD falls faster than its signal line
+        av_client = MagicMock()
+        av_client.get_bars = AsyncMock(
+            return_value=pd.DataFrame({"close": 400.0 - 0.02 * np.arange(60) ** 2})
+        )
+
+        with patch.object(momentum_trading, "AlphaVantageClient", return_value=av_client):
+            should_exit, reason = await check_exit_conditions(position, mock_alpaca)
+
+        assert should_exit is True
+        assert reason == "technical_exit"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("entry", "price", "expected"),
+        [
+            ("12.00", 11.64, (True, "stop_loss")),  # Exactly -3%
+            ("10.50", 11.34, (True, "take_profit")),  # Exactly +8%
+        ],
+        ids=["stop_loss_at_threshold", "take_profit_at_threshold"],
+    )
+    async def test_check_exit_conditions_batch_exact_thresholds(self, entry, price, expected):
+        """Test exits fire at exactly the stop-loss/take-profit percentage."""
+        update_strategy_parameters({"stop_loss_pct": 0.03, "take_profit_pct": 0.08})
+        position = Position(
+            symbol="AAPL",
+            quantity=Decimal("10"),
+            avg_entry_price=Decimal(entry),
+            current_price=Decimal(entry),
+        )
+        mock_alpaca = AsyncMock()
+        mock_alpaca.get_latest_quote = AsyncMock(return_value={"price": price})
+
+        assert await check_exit_conditions_batch([position], mock_alpaca) == [expected]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "quote",
+        [{"price": 0.0}, None, {"price": None}, {"price": "n/a"}],
+        ids=["zero_price", "none_quote", "none_price", "non_numeric_price"],
+    )
+    async def test_check_exit_conditions_batch_invalid_quote(self, quote):
+        """Test an invalid quote skips that position without stopping the batch."""
+        positions = [
+            Position(
+                symbol=symbol,
+                quantity=Decimal("10"),
+                avg_entry_price=Decimal("150.00"),
+                current_price=Decimal("150.00"),
+            )
+            for symbol in ("BAD", "AAPL")
+        ]
+        quotes = {"BAD": quote, "AAPL": {"price": 135.00}}
+
+        mock_alpaca = AsyncMock()
+        mock_alpaca.get_latest_quote = AsyncMock(side_effect=lambda symbol: quotes[symbol])
+
+        results = await check_exit_conditions_batch(positions, mock_alpaca)
+
+        assert results == [(False, None), (True, "stop_loss")]
+
+    @pytest.mark.asyncio
+    async def test_check_exit_conditions_batch(self):
+        """Test batched exit check classifies each position independently."""
+        from src.strategies import momentum_trading
+
+        prices = {"AAPL": 135.00, "NVDA": 600.00, "MSFT": 351.00}
+        entries = {"AAPL": "150.00", "NVDA": "500.00", "MSFT": "350.00", "AMD": "100.00"}
+        positions = [
+            Position(
+                symbol=symbol,
+                quantity=Decimal("10"),
+                avg_entry_price=Decimal(entry),
+                current_price=Decimal(entry),
+            )
+            for symbol, entry in entries.items()
+        ]
+
+        async def get_latest_quote(symbol):
+            if symbol not in prices:
+                raise Exception("Quote unavailable")
+            return {"price": prices[symbol]}
+
+        mock_alpaca = AsyncMock()
+        mock_alpaca.get_latest_quote = AsyncMock(side_effect=get_latest_quote)
+
+        # Choppy slow uptrend (RSI ~52, MACD histogram > 0): no technical exit
+        closes = 350.0 + np.tile([0.0, 2.0, 1.0], 20) + 0.05 * np.arange(60)
+        av_client = MagicMock()
+        av_client.get_bars = AsyncMock(return_value=pd.DataFrame({"close": closes}))
+
+        with patch.object(momentum_trading, "AlphaVantageClient", return_value=av_client):
+            results = await check_exit_conditions_batch(positions, mock_alpaca)
+
+        assert results == [
+            (True, "stop_loss"),
+            (True, "take_profit"),
+            (False, None),
+            (False, None),  # Failed quote never exits
+        ]
+        av_client.get_bars.assert_awaited_once_with("MSFT", days=60)
+
 
 class TestMomentumParameters:
     """Test cases for momentum strategy parameter management."""
@@ -417,57 +570,62 @@ class TestMomentumParameters:
         params = get_current_parameters()
 
         # Should include all required parameters
-        assert "rsi_min" in params
-        assert "rsi_max" in params
+        assert "rsi_lower" in params
+        assert "rsi_upper" in params
         assert "stop_loss_pct" in params
         assert "take_profit_pct" in params
 
     def test_update_strategy_parameters(self):
         """Test updating strategy parameters."""
-        original_rsi_min = STRATEGY_PARAMS["rsi_min"]
-
-        try:
-            # Update parameters
-            new_params = {"rsi_min": 55, "rsi_max": 65}
-            update_strategy_parameters(new_params)
+        # Update parameters (reset_strategy_params restores them afterwards)
+        update_strategy_parameters({"rsi_lower": 55, "rsi_upper": 65})
 
-            # Should be updated
-            assert STRATEGY_PARAMS["rsi_min"] == 55
-            assert STRATEGY_PARAMS["rsi_max"] == 65
-
-        finally:
-            # Restore original
-            STRATEGY_PARAMS["rsi_min"] = original_rsi_min
+        # Should be updated
+        params = get_current_parameters()
+        assert params["rsi_lower"] == 55
+        assert params["rsi_upper"] == 65
 
     def test_update_strategy_parameters_ignores_invalid(self):
         """Test that invalid parameter names are ignored."""
-        original_params = STRATEGY_PARAMS.copy()
+        original_params = get_current_parameters()
 
-        try:
-            # Try to update with invalid key
-            new_params = {"invalid_key": 999}
-            update_strategy_parameters(new_params)
+        # Try to update with invalid key
+        update_strategy_parameters({"invalid_key": 999})
 
-            # Should not add invalid key
-            assert "invalid_key" not in STRATEGY_PARAMS
+        # Should not add invalid key or change anything else
+        assert get_current_parameters() == original_params
 
-        finally:
-            # Restore original
-            STRATEGY_PARAMS.clear()
-            STRATEGY_PARAMS.update(original_params)
+    def test_update_strategy_parameters_accepts_old_names(self):
+        """Test that the pre-rename adjustment keys still update parameters."""
+        update_strategy_parameters({"rsi_min": 55, "rsi_max": 65, "min_volume_ratio": 1.2})
 
-    def test_parameter_changes_affect_signal_generation(self):
-        """Test that parameter changes affect signal logic."""
-        original_params = STRATEGY_PARAMS.copy()
+        params = get_current_parameters()
+        assert params["rsi_lower"] == 55
+        assert params["rsi_upper"] == 65
+        assert params["volume_ratio"] == 1.2
+        assert "rsi_min" not in params
 
-        try:
-            # Change RSI range to very narrow (unlikely to find signals)
-            update_strategy_parameters({"rsi_min": 59, "rsi_max": 61})
+    def test_update_strategy_parameters_skips_unchanged(self):
+        """Test that re-applying current values logs no parameter updates."""
+        from src.strategies import momentum_trading
 
-            assert STRATEGY_PARAMS["rsi_min"] == 59
-            assert STRATEGY_PARAMS["rsi_max"] == 61
+        with patch.object(momentum_trading.logger, "info") as log_info:
+            update_strategy_parameters(get_current_parameters())
 
-        finally:
-            # Restore original
-            STRATEGY_PARAMS.clear()
-            STRATEGY_PARAMS.update(original_params)
+        log_info.assert_not_called()
+
+    def test_get_current_parameters_returns_copy(self):
+        """Test that mutating the returned dict does not change the parameters."""
+        params = get_current_parameters()
+        params["rsi_lower"] = 0
+
+        assert get_current_parameters()["rsi_lower"] != 0
+
+    def test_parameter_changes_affect_signal_generation(self):
+        """Test that parameter changes affect signal logic."""
+        # Change RSI range to very narrow (unlikely to find signals)
+        update_strategy_parameters({"rsi_lower": 59, "rsi_upper": 61})
+
+        params = get_current_parameters()
+        assert params["rsi_lower"] == 59
+        assert params["rsi_upper"] == 61
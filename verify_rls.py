@@ -6,7 +6,7 @@ Verify that Row Level Security (RLS) is properly configured on all tables.
 import os
 import asyncio
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import AsyncClient, acreate_client
 
 # Load environment variables
 load_dotenv()
@@ -24,7 +24,7 @@ async def verify_rls():
     print("🔐 Verifying RLS Configuration")
     print("="*80)
 
-    supabase: Client = create_client(url, key)
+    supabase: AsyncClient = await acreate_client(url, key)
 
     # Tables to check
     tables = [
@@ -39,27 +39,31 @@ async def verify_rls():
 
     print(f"\n📋 Checking {len(tables)} tables...\n")
 
-    # Try to query each table to verify access still works
+    # Read RLS state for all tables from the catalog in one round-trip
+    # (database/migrations/add_check_rls_status_rpc.sql)
+    try:
+        response = await supabase.rpc("check_rls_status", {"tables": tables}).execute()
+    except Exception as e:
+        print(f"❌ Error: check_rls_status RPC failed: {str(e)[:50]}...")
+        print("   Run database/migrations/add_check_rls_status_rpc.sql first")
+        return False
+
+    status = {row["table_name"]: row for row in response.data}
+
     all_ok = True
 
     for table in tables:
-        try:
-            # Try to fetch one row (limit 1)
-            result = supabase.table(table).select("*").limit(1).execute()
-
-            if result:
-                print(f"✅ {table:25} - RLS enabled, access working")
-            else:
-                print(f"⚠️  {table:25} - RLS might be blocking access")
-
-        except Exception as e:
-            error_msg = str(e)
-            if "row-level security" in error_msg.lower() or "policy" in error_msg.lower():
-                print(f"🔒 {table:25} - RLS is active (access restricted)")
-                # This is actually good - means RLS is working
-            else:
-                print(f"❌ {table:25} - Error: {error_msg[:50]}...")
-                all_ok = False
+        row = status.get(table)
+        if row is None:
+            print(f"❌ {table:25} - Table not found")
+            all_ok = False
+        elif not row["rls_enabled"]:
+            print(f"❌ {table:25} - RLS disabled")
+            all_ok = False
+        elif row["policy_count"] == 0:
+            print(f"🔒 {table:25} - RLS enabled, no policies (service role only)")
+        else:
+            print(f"✅ {table:25} - RLS enabled, {row['policy_count']} policies")
 
     print("\n" + "="*80)
 